@@ -0,0 +1,414 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Almacenamientos intercambiables para Clinica.
+
+AlmacenamientoJSON es el comportamiento de siempre: la clínica entera en
+memoria y configs.json reescrito al guardar. AlmacenamientoSQLite deja los
+datos en una base sqlite3 con índices y responde en SQL las consultas que con
+JSON recorren listas: paciente por ID o DNI, turnos por estado e ingresos
+cobrados por obra social y por especialidad. En memoria quedan solo los
+turnos abiertos y los objetos ya consultados.
+"""
+
+import argparse
+import itertools
+import json
+import sqlite3
+
+from cubo import DIMENSIONES
+from paciente import Paciente
+from snapshot_binario import IndicePerezoso
+from turno import Turno
+
+
+class AlmacenamientoJSON:
+    """
+    Guarda la clínica completa en un archivo JSON.
+    """
+
+    def __init__(self, archivo_config):
+        self.archivo_config = archivo_config
+
+    def cargar(self, clinica):
+        clinica.leer_configuracion(self.archivo_config, incremental=True)
+
+    def registrar(self, op, datos, seq=None):
+        # El archivo se reescribe entero al guardar; entre guardados está el journal
+        pass
+
+    def marcar_journal(self, seq, recaudacion):
+        # El snapshot ya guarda su journal_seq
+        pass
+
+    def guardar(self, clinica):
+        clinica.guardar_datos(self.archivo_config)
+
+    def cerrar(self):
+        pass
+
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS configuracion (
+    clave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pacientes (
+    orden INTEGER PRIMARY KEY,
+    id INTEGER NOT NULL UNIQUE,
+    nombre TEXT,
+    apellido TEXT,
+    dni TEXT NOT NULL,
+    edad INTEGER,
+    obra_social TEXT,
+    fecha_registro TEXT
+);
+CREATE INDEX IF NOT EXISTS pacientes_dni ON pacientes (dni);
+CREATE TABLE IF NOT EXISTS turnos (
+    orden INTEGER PRIMARY KEY,
+    id INTEGER NOT NULL UNIQUE,
+    id_paciente INTEGER NOT NULL,
+    especialidad TEXT,
+    monto_a_pagar,
+    estado TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS turnos_estado ON turnos (estado);
+CREATE INDEX IF NOT EXISTS turnos_id_paciente ON turnos (id_paciente);
+"""
+# monto_a_pagar va sin tipo para que SQLite devuelva int o float tal como se guardó
+
+_COLUMNAS_PACIENTE = "id, nombre, apellido, dni, edad, obra_social, fecha_registro"
+_COLUMNAS_TURNO = "id, id_paciente, especialidad, monto_a_pagar, estado"
+
+
+class AlmacenamientoSQLite:
+    """
+    Guarda la clínica en una base SQLite. Las escrituras se acumulan en una
+    transacción que se confirma al terminar la operación que supera `lote`
+    cambios y en cada guardar.
+    """
+
+    def __init__(self, ruta, lote=256):
+        """
+        Args:
+            ruta (str): Ruta de la base. Se crea con el esquema si no existe.
+            lote (int): Cantidad de escrituras por transacción.
+        """
+        self.ruta = ruta
+        self.lote = lote
+        self._conexion = sqlite3.connect(ruta)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        # lower() de SQLite solo cambia ASCII; se usa el de Python como en Clinica
+        self._conexion.create_function("minusculas", 1, lambda texto: texto.lower() if texto else "",
+                                       deterministic=True)
+        self._conexion.executescript(_ESQUEMA)
+        self._pendientes = 0
+        self._recaudacion = 0.0
+        self._journal_seq = 0
+        # Un objeto por ID para que todas las vistas compartan el mismo paciente o turno
+        self._pacientes = {}
+        self._turnos = {}
+
+    # Escritura
+
+    def _escribir(self, sql, parametros=()):
+        # Se confirma en registrar: un alta no queda confirmada sin el seq que la incluye
+        self._conexion.execute(sql, parametros)
+        self._pendientes += 1
+
+    def sincronizar(self):
+        """
+        Confirma la transacción en curso.
+        """
+        self._conexion.commit()
+        self._pendientes = 0
+
+    def insertar_paciente(self, paciente):
+        self._pacientes[paciente.id] = paciente
+        self._escribir(f"INSERT INTO pacientes ({_COLUMNAS_PACIENTE}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                       self._fila_paciente(paciente))
+
+    def borrar_paciente(self, paciente):
+        self._pacientes.pop(paciente.id, None)
+        self._escribir("DELETE FROM pacientes WHERE id = ?", (paciente.id,))
+
+    def insertar_turno(self, turno):
+        self._turnos[turno.id] = turno
+        self._escribir(f"INSERT INTO turnos ({_COLUMNAS_TURNO}) VALUES (?, ?, ?, ?, ?)", self._fila_turno(turno))
+
+    def borrar_turno(self, turno):
+        self._turnos.pop(turno.id, None)
+        self._escribir("DELETE FROM turnos WHERE id = ?", (turno.id,))
+
+    def registrar(self, op, datos, seq=None):
+        """
+        Recibe las mutaciones de Clinica. Las altas y bajas ya llegaron por
+        las colecciones; acá se guardan los cambios de estado y la recaudación.
+
+        Args:
+            op (str): Operación, como en el journal.
+            datos (dict): Datos del evento.
+            seq (int): Seq del evento si el journal está abierto.
+        """
+        if op == 'estado':
+            self._escribir("UPDATE turnos SET estado = ? WHERE id = ?", (datos['estado'], datos['id']))
+        elif op == 'cobro':
+            self._recaudacion += datos['monto']
+        elif op == 'recaudacion':
+            self._recaudacion = datos['total']
+        if seq is not None:
+            self.marcar_journal(seq, self._recaudacion)
+        if self._pendientes >= self.lote:
+            self.sincronizar()
+
+    def marcar_journal(self, seq, recaudacion):
+        """
+        Anota en la transacción en curso el último evento del journal incluido
+        en la base, para que al reabrir se reproduzcan solo los siguientes.
+        La recaudación va con él porque los cobros anteriores no se reproducen.
+        """
+        self._journal_seq = seq
+        self._recaudacion = recaudacion
+        self._guardar_configuracion({"journal_seq": seq, "recaudacion": recaudacion})
+
+    def guardar(self, clinica):
+        self._recaudacion = clinica.recaudacion
+        self._guardar_configuracion({
+            "especialidades": clinica.especialidades,
+            "obras_sociales": clinica.obras_sociales_validas,
+            "tarifas": clinica.tarifas,
+            "recaudacion": clinica.recaudacion,
+            "journal_seq": self._journal_seq,
+            "contador_turnos": Turno.contador_id,
+            "cubo_ingresos": [[*clave, monto, cantidad] for clave, (monto, cantidad)
+                              in clinica.consultar_ingresos(DIMENSIONES).items()],
+        })
+        self.sincronizar()
+
+    def _guardar_configuracion(self, valores):
+        self._conexion.executemany("INSERT OR REPLACE INTO configuracion (clave, valor) VALUES (?, ?)",
+                                   [(clave, json.dumps(valor)) for clave, valor in valores.items()])
+
+    def importar(self, clinica):
+        """
+        Vuelca una clínica cargada en memoria (por ejemplo desde configs.json)
+        en una sola transacción.
+        """
+        with self._conexion:
+            self._conexion.execute("DELETE FROM pacientes")
+            self._conexion.execute("DELETE FROM turnos")
+            self._conexion.executemany(
+                f"INSERT INTO pacientes ({_COLUMNAS_PACIENTE}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                map(self._fila_paciente, clinica.lista_pacientes))
+            self._conexion.executemany(f"INSERT INTO turnos ({_COLUMNAS_TURNO}) VALUES (?, ?, ?, ?, ?)",
+                                       map(self._fila_turno, clinica.lista_turnos))
+            self.guardar(clinica)
+
+    @staticmethod
+    def _fila_paciente(paciente):
+        return (paciente.id, paciente.nombre, paciente.apellido, str(paciente.dni), paciente.edad,
+                paciente.obra_social, paciente.fecha_registro)
+
+    @staticmethod
+    def _fila_turno(turno):
+        return (turno.id, turno.id_paciente, turno.especialidad, turno.monto_a_pagar, turno.estado)
+
+    # Lectura
+
+    def _paciente(self, fila):
+        paciente = self._pacientes.get(fila[0])
+        if paciente is None:
+            id_paciente, nombre, apellido, dni, edad, obra_social, fecha_registro = fila
+            paciente = Paciente.restaurar(id_paciente, nombre, apellido, dni, edad, obra_social, 0)
+            paciente.fecha_registro = fecha_registro
+            self._pacientes[id_paciente] = paciente
+        return paciente
+
+    def _turno(self, fila):
+        turno = self._turnos.get(fila[0])
+        if turno is None:
+            turno = self._turnos[fila[0]] = Turno.restaurar(*fila)
+        return turno
+
+    def paciente_por_id(self, id_paciente):
+        if id_paciente in self._pacientes:
+            return self._pacientes[id_paciente]
+        fila = self._conexion.execute(f"SELECT {_COLUMNAS_PACIENTE} FROM pacientes WHERE id = ?",
+                                      (id_paciente,)).fetchone()
+        return None if fila is None else self._paciente(fila)
+
+    def paciente_por_dni(self, dni):
+        fila = self._conexion.execute(f"SELECT {_COLUMNAS_PACIENTE} FROM pacientes WHERE dni = ? LIMIT 1",
+                                      (str(dni),)).fetchone()
+        return None if fila is None else self._paciente(fila)
+
+    def turno_por_id(self, id_turno):
+        if id_turno in self._turnos:
+            return self._turnos[id_turno]
+        fila = self._conexion.execute(f"SELECT {_COLUMNAS_TURNO} FROM turnos WHERE id = ?", (id_turno,)).fetchone()
+        return None if fila is None else self._turno(fila)
+
+    def turnos_por_estado(self, estado):
+        """
+        Devuelve los turnos en un estado en orden de alta, usando el índice por estado.
+        """
+        cursor = self._conexion.execute(f"SELECT {_COLUMNAS_TURNO} FROM turnos WHERE estado = ? ORDER BY orden",
+                                        (estado,))
+        return [self._turno(fila) for fila in cursor]
+
+    def ingresos_por_obra_social(self):
+        """
+        Suma los turnos pagados por obra social del paciente, en minúsculas.
+
+        Returns:
+            list: Pares (obra_social, total) en el orden del primer cobro.
+        """
+        return self._conexion.execute(
+            "SELECT minusculas(p.obra_social), SUM(t.monto_a_pagar) FROM turnos t "
+            "LEFT JOIN pacientes p ON p.id = t.id_paciente WHERE t.estado = ? "
+            "GROUP BY minusculas(p.obra_social) ORDER BY MIN(t.orden)", (Turno.PAGADO,)).fetchall()
+
+    def ingresos_por_especialidad(self):
+        return self._conexion.execute(
+            "SELECT especialidad, SUM(monto_a_pagar) FROM turnos WHERE estado = ? "
+            "GROUP BY especialidad ORDER BY MIN(orden)", (Turno.PAGADO,)).fetchall()
+
+    def contar(self, tabla, estado=None):
+        if estado is None:
+            return self._conexion.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+        return self._conexion.execute(f"SELECT COUNT(*) FROM {tabla} WHERE estado = ?", (estado,)).fetchone()[0]
+
+    def recorrer(self, tabla, estado=None, tamanio_lote=1000):
+        """
+        Recorre una tabla en orden de alta de a `tamanio_lote` filas.
+        """
+        columnas, construir = ((_COLUMNAS_PACIENTE, self._paciente) if tabla == "pacientes"
+                               else (_COLUMNAS_TURNO, self._turno))
+        filtro, parametros = ("WHERE estado = ? AND orden > ?", [estado]) if estado else ("WHERE orden > ?", [])
+        ultimo = 0
+        while True:
+            filas = self._conexion.execute(
+                f"SELECT orden, {columnas} FROM {tabla} {filtro} ORDER BY orden LIMIT ?",
+                (*parametros, ultimo, tamanio_lote)).fetchall()
+            if not filas:
+                return
+            for fila in filas:
+                yield construir(fila[1:])
+            ultimo = filas[-1][0]
+
+    def _configuracion(self):
+        return {clave: json.loads(valor)
+                for clave, valor in self._conexion.execute("SELECT clave, valor FROM configuracion")}
+
+    def cargar(self, clinica):
+        configuracion = self._configuracion()
+        self._recaudacion = configuracion.get("recaudacion", 0.0)
+        self._journal_seq = configuracion.get("journal_seq", 0)
+        max_id_paciente, = self._conexion.execute("SELECT MAX(id) FROM pacientes").fetchone()
+        max_id_turno, = self._conexion.execute("SELECT MAX(id) FROM turnos").fetchone()
+        clinica.montar_respaldo(
+            {
+                "especialidades": configuracion.get("especialidades", []),
+                "obras_sociales": configuracion.get("obras_sociales", []),
+                "tarifas": configuracion.get("tarifas"),
+                "journal_seq": self._journal_seq,
+                "cubo_ingresos": configuracion.get("cubo_ingresos", []),
+                "ingresos_por_obra_social": self.ingresos_por_obra_social(),
+                "ingresos_por_especialidad": self.ingresos_por_especialidad(),
+                "max_id_paciente": max_id_paciente or 0,
+                "max_id_turno": max(-1 if max_id_turno is None else max_id_turno,
+                                    configuracion.get("contador_turnos", 0) - 1),
+            },
+            TablaSQL(self, "pacientes"),
+            IndicePerezoso(self.paciente_por_id),
+            IndicePerezoso(self.paciente_por_dni),
+            TablaSQL(self, "turnos"),
+            IndicePerezoso(self.turno_por_id),
+            itertools.chain(self.turnos_por_estado(Turno.ACTIVO), self.turnos_por_estado(Turno.FINALIZADO)),
+            TablaSQL(self, "turnos", Turno.PAGADO))
+        clinica.recaudacion = self._recaudacion
+
+    def cerrar(self):
+        self._guardar_configuracion({"recaudacion": self._recaudacion, "journal_seq": self._journal_seq})
+        self.sincronizar()
+        self._conexion.close()
+
+
+class TablaSQL:
+    """
+    Vista de una tabla con la interfaz de lista que usa Clinica. Agregar y
+    quitar escriben en la base; la vista filtrada por estado no escribe,
+    porque la fila ya cambia de estado con el evento correspondiente.
+    """
+
+    def __init__(self, almacenamiento, tabla, estado=None):
+        self._almacenamiento = almacenamiento
+        self._tabla = tabla
+        self._estado = estado
+
+    def __len__(self):
+        return self._almacenamiento.contar(self._tabla, self._estado)
+
+    def __iter__(self):
+        return self._almacenamiento.recorrer(self._tabla, self._estado)
+
+    def append(self, objeto):
+        if self._estado is not None:
+            return
+        if self._tabla == "pacientes":
+            self._almacenamiento.insertar_paciente(objeto)
+        else:
+            self._almacenamiento.insertar_turno(objeto)
+
+    def remove(self, objeto):
+        if self._estado is not None:
+            return
+        if self._tabla == "pacientes":
+            self._almacenamiento.borrar_paciente(objeto)
+        else:
+            self._almacenamiento.borrar_turno(objeto)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copia una clínica entre configs.json y una base SQLite.")
+    parser.add_argument("sentido", choices=("a-sqlite", "a-json"))
+    parser.add_argument("origen")
+    parser.add_argument("destino")
+    args = parser.parse_args()
+
+    from clinica import Clinica
+    clinica = Clinica("Conversión")
+    if args.sentido == "a-sqlite":
+        clinica.leer_configuracion(args.origen, incremental=True)
+        almacenamiento = AlmacenamientoSQLite(args.destino)
+        almacenamiento.importar(clinica)
+        almacenamiento.cerrar()
+    else:
+        clinica.abrir_almacenamiento(AlmacenamientoSQLite(args.origen))
+        clinica.guardar_datos(args.destino)
+        clinica.cerrar_almacenamiento()
+
+
+if __name__ == "__main__":
+    main()
@@ -21,20 +21,91 @@
 # SOFTWARE.
 
 from library_utn import UTN_messenger
-from clinica import Clinica
-from paciente import Paciente
-from turno import Turno
+from errores import ConfiguracionInvalida, ErrorClinica
+import metricas
+from servicio import ServicioClinica
+from tablas import Columna, Tabla
 from validaciones import Validaciones
 
+TABLA_METRICAS = Tabla((Columna("Operación", 28), Columna("Llamadas", 8), Columna("Registros", 10),
+                        Columna("p50 (ms)", 10), Columna("p99 (ms)", 10)))
+
+
+def pedir_datos_paciente(obras_sociales_validas):
+    """
+    Pide por consola los datos de un paciente hasta que sean válidos.
+
+    Returns:
+        tuple: (nombre, apellido, dni, edad, obra_social)
+    """
+    nombre = input("Nombre: ")
+    apellido = input("Apellido: ")
+    while not Validaciones.validar_nombre_apellido(nombre.strip(), apellido.strip()):
+        nombre = input("Error: Nombre o apellido no válidos. Deben contener solo caracteres alfabéticos y no exceder los 30 caracteres.")
+        apellido = input("Error: Nombre o apellido no válidos. Deben contener solo caracteres alfabéticos y no exceder los 30 caracteres.")
+        pass
+    dni = input("DNI: ")
+    edad = input("Edad: ")
+    while not Validaciones.validar_edad(edad):
+        edad = input("Edad: ")
+        pass
+    obra_social = input("Obra social:(Swiss Medical, Apres, PAMI, Particular)")
+        
+    while not Validaciones.validar_obra_social(obra_social.strip(), edad, obras_sociales_validas):
+        obra_social = input("Error: Obra social no válida.")
+        pass
+    return nombre, apellido, dni, edad, obra_social
+
+
+def mostrar_metricas():
+    """
+    Muestra las métricas de las operaciones y permite exportarlas a un archivo.
+    """
+    if not metricas.esta_activo():
+        print("Las métricas están desactivadas. ¿Activarlas? (1.Si / 2.No)")
+        if Validaciones.ingresar_numero() == 1:
+            metricas.activar()
+            print("Métricas activadas.")
+        return
+
+    resumen = metricas.resumen()
+    TABLA_METRICAS.escribir((nombre, datos['llamadas'], datos['registros'], f"{datos['p50'] * 1000:.3f}",
+                             f"{datos['p99'] * 1000:.3f}") for nombre, datos in resumen.items())
+
+    print("Exportar ( 1.JSON / 2.Prometheus / 3.No exportar): ")
+    opcion = Validaciones.ingresar_numero()
+    if opcion in (1, 2):
+        ruta = "metricas.json" if opcion == 1 else "metricas.prom"
+        metricas.exportar(ruta, "json" if opcion == 1 else "prometheus")
+        print(f"Métricas guardadas en {ruta}")
+
+
+def informar_error_de_guardado(servicio):
+    """
+    Muestra el error del último guardado en segundo plano, si falló.
+    """
+    error = servicio.tomar_error_de_guardado()
+    if error is not None:
+        print(f"Error al guardar en segundo plano: {error}. Los datos siguen en el journal.")
+
 
 def main_app():
     """
     Aplicacion principal del Segundo Parcial de Laboratorio 1
     """
-    clinica = Clinica("Clínica Ejemplo")
-    clinica.cargar_configuracion("configs.json")
+    servicio = ServicioClinica("Clínica Ejemplo")
+    clinica = servicio.clinica
+    try:
+        servicio.cargar("configs.json")
+    except FileNotFoundError:
+        print("El archivo configs.json no se encontró.")
+    except ConfiguracionInvalida as error:
+        print(error)
+    servicio.abrir_journal("configs.journal")
+    servicio.iniciar_autoguardado("configs.json", 300)
     
     while True:
+        informar_error_de_guardado(servicio)
         print("╔════════════════════════════════╗")
         print("║         Menú de opciones:      ║")
         print("╠════════════════════════════════╣")
@@ -47,56 +118,97 @@ def main_app():
         print("║ 7. Cerrar caja                 ║")
         print("║ 8. Mostrar informe             ║")
         print("║ 9. Salir                       ║")
+        print("║ 10. Métricas                   ║")
+        print("║ 11. Buscar paciente            ║")
         print("╚════════════════════════════════╝")
         
         selected_option = Validaciones.ingresar_numero()
             
-        match selected_option:
-            case 1: # Alta paciente
-                clinica.agregar_paciente()
-                pass
-            case 2: # Alta turno
-                id_paciente = int(input("ID del paciente : "))
-                especialidad = input("Especialidad(medico clinico, odontologia, psicologia, traumatologia): ")
-
-                if Validaciones.validar_especialidad(especialidad, clinica.especialidades):
-                    paciente = next((p for p in clinica.lista_pacientes if p.id == id_paciente), None)
-                    if paciente:
-                        monto_a_pagar = Validaciones.calcular_monto_a_pagar(paciente.edad, paciente.obra_social)
-                        turno = Turno(id_paciente, especialidad, monto_a_pagar, "Activo")
-                        clinica.agregar_turno(turno)
-                    else:
+        try:
+            match selected_option:
+                case 1: # Alta paciente
+                    paciente = servicio.alta_paciente(*pedir_datos_paciente(clinica.obras_sociales_validas))
+                    print(f"Paciente {paciente.nombre} {paciente.apellido} agregado con éxito.")
+                    pass
+                case 2: # Alta turno
+                    try:
+                        id_paciente = int(input("ID del paciente : "))
+                    except ValueError:
                         print("Paciente no encontrado.")
-                else:
-                    print("Especialidad no válida.")
-                pass
-            case 3: # Ordenar turnos
-                print("Ordenar por ( 1.Obra Social ASC / 2.Monto DESC): ")
-                criterio = Validaciones.ingresar_numero()
-                while criterio!= 1 and criterio != 2 :
-                    print("Numero invalido, ingrese una opcion valida.")
+                        continue
+                    especialidad = input("Especialidad(medico clinico, odontologia, psicologia, traumatologia): ")
+                    turno = servicio.alta_turno(id_paciente, especialidad)
+                    print(f"Turno para paciente con ID {turno.id_paciente} agregado con éxito.")
+                    pass
+                case 3: # Ordenar turnos
+                    print("Ordenar por ( 1.Obra Social ASC / 2.Monto DESC): ")
                     criterio = Validaciones.ingresar_numero()
-                clinica.ordenar_turnos(criterio)
-                pass
-            case 4: # Mostrar pacientes en espera
-                clinica.mostrar_pacientes_en_espera()
-                pass
-            case 5: # Atender pacientes
-                clinica.atender_pacientes()
-                pass
-            case 6: # Cobrar atenciones
-                clinica.cobrar_atenciones()
-                pass
-            case 7: # Cerrar caja
-                clinica.cerrar_caja("configs.json")
-                pass
-            case 8: # Mostrar informe
-                clinica.mostrar_informe()
-                pass
-            case 9: # Salir
-                print("Saliendo del programa.")
-                break
-            case _:
-                print('Opción inválida. Por favor, seleccione una opción válida.', 'Error')
-                pass
-            
\ No newline at end of file
+                    while criterio!= 1 and criterio != 2 :
+                        print("Numero invalido, ingrese una opcion valida.")
+                        criterio = Validaciones.ingresar_numero()
+                    titulo = "Turnos por Obra Social" if criterio == 1 else "Turnos por Monto"
+                    clinica.mostrar_turnos(servicio.turnos_ordenados(criterio), titulo)
+                    pass
+                case 4: # Mostrar pacientes en espera
+                    paginador = clinica.mostrar_pacientes_en_espera()
+                    while paginador is not None:
+                        print("( 1.Siguiente / 2.Anterior / 3.Exportar / 4.Volver): ")
+                        opcion = Validaciones.ingresar_numero()
+                        if opcion == 1 and not paginador.siguiente() or opcion == 2 and not paginador.anterior():
+                            print("No hay más páginas.")
+                        elif opcion in (1, 2):
+                            paginador = clinica.mostrar_pacientes_en_espera(paginador)
+                        elif opcion == 3:
+                            clinica.exportar_en_espera("pacientes_en_espera.txt")
+                            print("Lista de espera guardada en pacientes_en_espera.txt")
+                        else:
+                            break
+                    pass
+                case 5: # Atender pacientes
+                    atendidos = servicio.atender()
+                    if not atendidos:
+                        print("No hay pacientes en espera.")
+                    for t in atendidos:
+                        print(f"Paciente con turno ID: {t.id} ha sido atendido.")
+                    pass
+                case 6: # Cobrar atenciones
+                    cobro = servicio.cobrar()
+                    if not cobro.turnos:
+                        print("No hay turnos para cobrar.")
+                    for t in cobro.turnos:
+                        print(f"Se ha cobrado el turno ID: {t.id} por un monto de {t.monto_a_pagar}")
+                    pass
+                case 7: # Cerrar caja
+                    guardado = servicio.cerrar_caja("configs.json", "historico")
+                    print(f"Total recaudado: {guardado.recaudacion}")
+                    print("Caja cerrada. Los datos se guardan en segundo plano.")
+                    pass
+                case 8: # Mostrar informe
+                    clinica.mostrar_informe()
+                    pass
+                case 9: # Salir
+                    servicio.cerrar_journal()
+                    informar_error_de_guardado(servicio)
+                    print("Saliendo del programa.")
+                    break
+                case 10: # Métricas
+                    mostrar_metricas()
+                    pass
+                case 11: # Buscar paciente
+                    texto = input("Nombre y/o apellido (alcanza con el comienzo): ")
+                    encontrados = servicio.buscar_pacientes(texto)
+                    if not encontrados:
+                        # Sin coincidencias exactas se ofrecen los nombres parecidos
+                        encontrados = [c.paciente for c in servicio.pacientes_similares(texto)]
+                    if not encontrados:
+                        print("No se encontraron pacientes.")
+                    for p in encontrados:
+                        print(f"ID: {p.id} - {p.nombre} {p.apellido} - DNI: {p.dni} - {p.obra_social}")
+                    pass
+                case _:
+                    print('Opción inválida. Por favor, seleccione una opción válida.', 'Error')
+                    pass
+        except ErrorClinica as error:
+            print(f"Error: {error}")
+        except OSError as error:
+            print(f"Error al escribir los archivos: {error}")
@@ -0,0 +1,36 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Benchmarks de la clínica. Se ejecutan desde la carpeta Labo1_SP_Python, por ejemplo:
+
+    python -m benchmarks.bench_carga --pacientes 100000 --turnos 500000
+"""
+
+
+import os
+import sys
+
+# Los módulos de la clínica se importan como módulos sueltos (from clinica import Clinica)
+CARPETA_FUENTES = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if CARPETA_FUENTES not in sys.path:
+    sys.path.insert(0, CARPETA_FUENTES)
@@ -0,0 +1,115 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Mide la búsqueda de pacientes sobre un registro grande con nombres variados
+(sílabas al azar, no las pocas listas de generador.py): costo de armar el
+índice en la primera consulta, latencia de las búsquedas por prefijo y
+aproximadas, altas intercaladas con consultas y el reporte de duplicados.
+
+    python -m benchmarks.bench_busqueda --pacientes 1000000
+"""
+
+import argparse
+import random
+import time
+
+from clinica import Clinica
+from metricas import Histograma
+from paciente import Paciente
+
+_SILABAS = ["ma", "ri", "jo", "se", "lu", "ca", "na", "to", "fer", "gon", "za", "lez", "ro", "dri", "guez",
+            "pe", "rez", "mar", "tin", "al", "va", "do", "be", "nic", "sol", "gar", "cia", "le", "on", "mi"]
+
+
+def _palabra(azar):
+    return "".join(azar.choice(_SILABAS) for _ in range(azar.randint(2, 4)))
+
+
+def _con_error(azar, palabra):
+    """Cambia, borra o duplica una letra."""
+    posicion = azar.randrange(len(palabra))
+    cambio = azar.choice(("cambiar", "borrar", "duplicar"))
+    if cambio == "cambiar":
+        return palabra[:posicion] + azar.choice("aeiourstln") + palabra[posicion + 1:]
+    if cambio == "borrar":
+        return palabra[:posicion] + palabra[posicion + 1:]
+    return palabra[:posicion] + palabra[posicion] + palabra[posicion:]
+
+
+def _medir(histograma, funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    histograma.registrar(time.perf_counter() - inicio)
+    return resultado
+
+
+def _mostrar(nombre, histograma, encontrados):
+    print(f"{nombre:<22} n={histograma.cantidad:<6} p50={histograma.percentil(0.5) * 1000:7.3f} ms  "
+          f"p99={histograma.percentil(0.99) * 1000:7.3f} ms  resultados promedio {encontrados / histograma.cantidad:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pacientes", type=int, default=1_000_000)
+    parser.add_argument("--nombres", type=int, default=20_000, help="Nombres y apellidos distintos.")
+    parser.add_argument("--consultas", type=int, default=2_000)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    azar = random.Random(args.semilla)
+    nombres = [_palabra(azar) for _ in range(args.nombres)]
+    apellidos = [_palabra(azar) for _ in range(args.nombres)]
+    clinica = Clinica("Búsqueda")
+    clinica.lista_pacientes = []
+    inicio = time.perf_counter()
+    for i in range(args.pacientes):
+        clinica.agregar_paciente(Paciente(azar.choice(nombres), azar.choice(apellidos), str(30_000_000 + i),
+                                          azar.randint(18, 59), "particular"))
+    print(f"{args.pacientes} altas: {time.perf_counter() - inicio:.2f} s")
+
+    inicio = time.perf_counter()
+    clinica.buscar_pacientes("a")
+    print(f"Índice armado en la primera consulta: {time.perf_counter() - inicio:.2f} s")
+
+    pacientes = clinica.lista_pacientes
+    prefijo, aproximada, con_altas = Histograma(), Histograma(), Histograma()
+    encontrados = [0, 0, 0]
+    for _ in range(args.consultas):
+        paciente = azar.choice(pacientes)
+        texto = f"{paciente.nombre[:azar.randint(2, 5)]} {paciente.apellido[:azar.randint(2, 5)]}"
+        encontrados[0] += len(_medir(prefijo, clinica.buscar_pacientes, texto, 20))
+        texto = f"{_con_error(azar, paciente.nombre)} {_con_error(azar, paciente.apellido)}"
+        encontrados[1] += len(_medir(aproximada, clinica.pacientes_similares, texto, 0.5, 20))
+        nuevo = clinica.agregar_paciente(Paciente(_palabra(azar), _palabra(azar), str(90_000_000 + _),
+                                                  30, "particular"))
+        encontrados[2] += len(_medir(con_altas, clinica.buscar_pacientes, f"{nuevo.nombre} {nuevo.apellido}", 20))
+    _mostrar("prefijo", prefijo, encontrados[0])
+    _mostrar("aproximada", aproximada, encontrados[1])
+    _mostrar("alta + prefijo", con_altas, encontrados[2])
+
+    inicio = time.perf_counter()
+    grupos = clinica.candidatos_duplicados()
+    print(f"Reporte de duplicados: {len(grupos)} grupos en {time.perf_counter() - inicio:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
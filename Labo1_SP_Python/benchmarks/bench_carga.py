@@ -0,0 +1,76 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Compara el pico de memoria (RSS) de cargar_configuracion con json.load y con
+el lector incremental, cada uno en un proceso nuevo.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks import CARPETA_FUENTES
+from benchmarks.generador import generar_configuracion
+
+_SCRIPT_CARGA = """
+import resource, sys
+sys.path.insert(0, {carpeta!r})
+from clinica import Clinica
+base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+clinica = Clinica("Benchmark")
+clinica.cargar_configuracion({archivo!r}, incremental={incremental})
+print(base, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, len(clinica.lista_pacientes), len(clinica.lista_turnos))
+"""
+
+
+def medir_carga(archivo, incremental):
+    """
+    Carga el archivo en un proceso nuevo y devuelve el pico de RSS en KB,
+    descontando el del intérprete con los módulos ya importados.
+    """
+    script = _SCRIPT_CARGA.format(carpeta=CARPETA_FUENTES, archivo=archivo, incremental=incremental)
+    salida = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    base, pico, pacientes, turnos = map(int, salida.stdout.split())
+    return pico - base, pacientes, turnos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pacientes", type=int, default=100_000)
+    parser.add_argument("--turnos", type=int, default=500_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        archivo = os.path.join(carpeta, "configs.json")
+        generar_configuracion(archivo, args.pacientes, args.turnos)
+        tamanio_mb = os.path.getsize(archivo) / 2**20
+        print(f"Archivo sintético: {args.pacientes} pacientes, {args.turnos} turnos, {tamanio_mb:.1f} MB")
+        for nombre, incremental in (("json.load", False), ("incremental", True)):
+            pico_kb, pacientes, turnos = medir_carga(archivo, incremental)
+            print(f"{nombre:<12} pico RSS: {pico_kb / 1024:8.1f} MB ({pacientes} pacientes, {turnos} turnos)")
+
+
+if __name__ == "__main__":
+    main()
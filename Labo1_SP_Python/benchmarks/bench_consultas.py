@@ -0,0 +1,119 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Compara consultas ad hoc sobre los turnos resueltas con una comprensión de
+lista sobre lista_turnos (con la obra social buscada paciente por paciente)
+contra Clinica.consultar_turnos y contar_turnos, que usan los bitmaps de
+consultas.py. También mide el armado del índice en la primera consulta y el
+costo de mantenerlo cuando hay altas y cambios de estado entre consultas.
+
+    python -m benchmarks.bench_consultas --pacientes 100000 --turnos 1000000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.generador import ESPECIALIDADES, generar_configuracion
+from clinica import Clinica
+from metricas import Histograma
+from turno import Turno
+
+# La mitad de los turnos todavía abiertos, para que los filtros por estado no sean triviales
+DISTRIBUCION_ESTADOS = {"Activo": 0.3, "Finalizado": 0.2, "Pagado": 0.5}
+
+CONSULTAS = (
+    ("activos de traumatologia > 3000", dict(estado=Turno.ACTIVO, especialidad="traumatologia", monto_desde=3000.01)),
+    ("pagados de pami", dict(estado=Turno.PAGADO, obra_social="pami")),
+    ("finalizados apres odontologia", dict(estado=Turno.FINALIZADO, obra_social="apres", especialidad="odontologia")),
+    ("monto entre 2000 y 2500", dict(monto_desde=2000, monto_hasta=2500)),
+)
+
+
+def _comprension(clinica, estado=None, especialidad=None, obra_social=None, monto_desde=None, monto_hasta=None):
+    return [t for t in clinica.lista_turnos
+            if (estado is None or t.estado == estado)
+            and (especialidad is None or t.especialidad == especialidad)
+            and (obra_social is None or clinica.obtener_obra_social_paciente(t.id_paciente) == obra_social)
+            and (monto_desde is None or t.monto_a_pagar >= monto_desde)
+            and (monto_hasta is None or t.monto_a_pagar <= monto_hasta)]
+
+
+def _medir(funcion, repeticiones):
+    histograma = Histograma()
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        histograma.registrar(time.perf_counter() - inicio)
+    return histograma.percentil(0.5), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pacientes", type=int, default=100_000)
+    parser.add_argument("--turnos", type=int, default=1_000_000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        archivo = os.path.join(carpeta, "configs.json")
+        generar_configuracion(archivo, args.pacientes, args.turnos, distribucion_estados=DISTRIBUCION_ESTADOS,
+                              semilla=args.semilla)
+        clinica = Clinica("Consultas")
+        clinica.cargar_configuracion(archivo)
+    print(f"Clínica sintética: {args.pacientes} pacientes, {args.turnos} turnos")
+
+    inicio = time.perf_counter()
+    clinica.contar_turnos()
+    print(f"Índice armado en la primera consulta: {time.perf_counter() - inicio:.2f} s")
+
+    print(f"{'consulta':<34}{'resultados':>11}{'comprensión':>14}{'consultar':>12}{'contar':>12}")
+    for nombre, filtros in CONSULTAS:
+        lento, esperado = _medir(lambda: _comprension(clinica, **filtros), args.repeticiones)
+        rapido, obtenido = _medir(lambda: list(clinica.consultar_turnos(**filtros)), args.repeticiones)
+        cuenta, cantidad = _medir(lambda: clinica.contar_turnos(**filtros), args.repeticiones)
+        if obtenido != esperado or cantidad != len(esperado):
+            raise AssertionError(f"La consulta '{nombre}' no coincide con la comprensión de lista")
+        print(f"{nombre:<34}{len(esperado):>11}{lento * 1000:>11.1f} ms{rapido * 1000:>9.1f} ms"
+              f"{cuenta * 1000:>9.3f} ms")
+
+    # Altas y cambios de estado entre consultas: la fusión se paga en la consulta siguiente
+    azar = random.Random(args.semilla)
+    ids_pacientes = [p.id for p in clinica.lista_pacientes]
+    histograma = Histograma()
+    for _ in range(200):
+        for _ in range(10):
+            clinica.agregar_turno(Turno(azar.choice(ids_pacientes), azar.choice(ESPECIALIDADES), 1000, Turno.ACTIVO))
+        clinica.atender_pacientes(5)
+        inicio = time.perf_counter()
+        clinica.contar_turnos(estado=Turno.ACTIVO, especialidad="traumatologia")
+        histograma.registrar(time.perf_counter() - inicio)
+    print(f"Consulta después de 10 altas y 5 atenciones: p50={histograma.percentil(0.5) * 1000:.2f} ms  "
+          f"p99={histograma.percentil(0.99) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Compara el guardado sincrónico del snapshot con el guardado en segundo plano
+sobre una clínica grande: cuánto bloquea a la operación que lo pide y cuánto
+se alargan las altas que llegan mientras el otro hilo escribe el archivo.
+
+    python -m benchmarks.bench_guardado --pacientes 100000 --turnos 500000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.generador import ESPECIALIDADES, generar_configuracion
+from clinica import Clinica
+from metricas import Histograma
+from servicio import ServicioClinica
+
+
+def _altas(servicio, azar, ids_pacientes, histograma, mientras):
+    """
+    Da de alta turnos mientras `mientras()` sea verdadero y registra la latencia de cada uno.
+    """
+    while mientras():
+        inicio = time.perf_counter()
+        servicio.alta_turno(azar.choice(ids_pacientes), azar.choice(ESPECIALIDADES))
+        histograma.registrar(time.perf_counter() - inicio)
+
+
+def _mostrar(nombre, histograma):
+    print(f"{nombre:<26} n={histograma.cantidad:<6} p50={histograma.percentil(0.5) * 1000:7.3f} ms  "
+          f"p99={histograma.percentil(0.99) * 1000:7.3f} ms  máx={histograma.percentil(1.0) * 1000:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pacientes", type=int, default=100_000)
+    parser.add_argument("--turnos", type=int, default=500_000)
+    parser.add_argument("--altas", type=int, default=5_000, help="Altas de referencia sin guardado en curso.")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    azar = random.Random(args.semilla)
+    with tempfile.TemporaryDirectory() as carpeta:
+        archivo = os.path.join(carpeta, "configs.json")
+        generar_configuracion(archivo, args.pacientes, args.turnos, semilla=args.semilla)
+        servicio = ServicioClinica(clinica=Clinica("Guardado"))
+        servicio.cargar(archivo)
+        servicio.abrir_journal(os.path.join(carpeta, "configs.journal"))
+        ids_pacientes = [p.id for p in servicio.clinica.lista_pacientes]
+        print(f"Archivo sintético: {args.pacientes} pacientes, {args.turnos} turnos, "
+              f"{os.path.getsize(archivo) / 2**20:.1f} MB")
+
+        inicio = time.perf_counter()
+        servicio.clinica.guardar_datos(archivo)
+        print(f"Guardado sincrónico: la operación queda bloqueada {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+        inicio = time.perf_counter()
+        guardado = servicio.clinica.guardar_en_segundo_plano(archivo)
+        devuelto = time.perf_counter() - inicio
+        guardado.esperar()
+        print(f"Guardado en segundo plano: devuelve en {devuelto * 1000:.0f} ms, "
+              f"escritura completa en {guardado.segundos * 1000:.0f} ms")
+
+        ociosa = Histograma()
+        restantes = iter(range(args.altas))
+        _altas(servicio, azar, ids_pacientes, ociosa, lambda: next(restantes, None) is not None)
+        durante = Histograma()
+        guardado = servicio.clinica.guardar_en_segundo_plano(archivo)
+        _altas(servicio, azar, ids_pacientes, durante, lambda: not guardado.terminado())
+        guardado.esperar()
+        _mostrar("alta_turno sin guardado", ociosa)
+        _mostrar("alta_turno durante guardado", durante)
+        servicio.cerrar_journal()
+
+
+if __name__ == "__main__":
+    main()
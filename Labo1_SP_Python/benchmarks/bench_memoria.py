@@ -0,0 +1,124 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Mide los bytes por registro de Paciente y Turno con el layout compacto
+(__slots__, textos compartidos, enteros y timestamp) frente al layout
+anterior con __dict__ y textos propios en cada instancia.
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from datetime import datetime
+
+from paciente import Paciente
+from turno import Turno
+
+_OBRAS_SOCIALES = ["swiss medical", "apres", "pami", "particular"]
+_ESPECIALIDADES = ["medico clinico", "odontologia", "psicologia", "traumatologia"]
+_ESTADOS = ["Activo", "Finalizado", "Pagado"]
+
+
+class _PacienteConDict:
+    """Réplica del layout anterior de Paciente."""
+
+    def __init__(self, nombre, apellido, dni, edad, obra_social):
+        self.id = 0
+        self.nombre = nombre
+        self.apellido = apellido
+        self.dni = dni
+        self.edad = edad
+        self.obra_social = obra_social
+        self.fecha_registro = datetime.now(tz=None).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class _TurnoConDict:
+    """Réplica del layout anterior de Turno."""
+
+    def __init__(self, id_paciente, especialidad, monto_a_pagar, estado):
+        self.id = 0
+        self.id_paciente = id_paciente
+        self.especialidad = especialidad
+        self.monto_a_pagar = monto_a_pagar
+        self.estado = estado
+
+
+def _dato_paciente(i):
+    # json.loads devuelve textos nuevos en cada registro, igual que al cargar configs.json
+    return json.loads(json.dumps({"nombre": f"nombre{i % 5000}", "apellido": f"apellido{i % 7000}",
+                                  "dni": str(20000000 + i), "edad": str(18 + i % 72),
+                                  "obra_social": _OBRAS_SOCIALES[i % 4]}))
+
+
+def _dato_turno(i):
+    return json.loads(json.dumps({"id_paciente": i % 1000 + 1, "especialidad": _ESPECIALIDADES[i % 4],
+                                  "monto_a_pagar": 4000, "estado": _ESTADOS[i % 3]}))
+
+
+def crear_paciente(clase, i):
+    dato = _dato_paciente(i)
+    paciente = clase(dato["nombre"], dato["apellido"], dato["dni"], dato["edad"], dato["obra_social"])
+    return paciente
+
+
+def crear_turno(clase, i):
+    dato = _dato_turno(i)
+    return clase(dato["id_paciente"], dato["especialidad"], dato["monto_a_pagar"], dato["estado"])
+
+
+def bytes_por_registro(fabrica, clase, cantidad):
+    """
+    Construye `cantidad` registros y devuelve los bytes retenidos por registro,
+    incluido el puntero en la lista que los contiene.
+    """
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    registros = [fabrica(clase, i) for i in range(cantidad)]
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del registros
+    return (despues - antes) / cantidad
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pacientes", type=int, default=1_000_000)
+    parser.add_argument("--turnos", type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    filas = [
+        ("Paciente", args.pacientes, crear_paciente, _PacienteConDict, Paciente),
+        ("Turno", args.turnos, crear_turno, _TurnoConDict, Turno),
+    ]
+    print(f"{'Registro':<10} {'Cantidad':>10} {'__dict__ (B)':>14} {'compacto (B)':>14} {'ahorro':>8}")
+    for nombre, cantidad, fabrica, anterior, compacta in filas:
+        bytes_anterior = bytes_por_registro(fabrica, anterior, cantidad)
+        bytes_compacto = bytes_por_registro(fabrica, compacta, cantidad)
+        ahorro = 1 - bytes_compacto / bytes_anterior
+        print(f"{nombre:<10} {cantidad:>10} {bytes_anterior:>14.1f} {bytes_compacto:>14.1f} {ahorro:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
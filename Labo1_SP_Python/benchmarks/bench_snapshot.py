@@ -0,0 +1,98 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Compara el tiempo de arranque de la clínica (abrir el archivo y responder la
+primera consulta) entre configs.json, con json.load o con el lector
+incremental, y el snapshot binario. Cada medición corre en un proceso nuevo.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks import CARPETA_FUENTES
+from benchmarks.generador import generar_configuracion
+
+# La mayoría de los turnos de un archivo grande ya están cobrados
+DISTRIBUCION_ESTADOS = {"Activo": 0.01, "Finalizado": 0.01, "Pagado": 0.98}
+
+_SCRIPT_ARRANQUE = """
+import resource, sys, time
+sys.path.insert(0, {carpeta!r})
+from clinica import Clinica
+base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+inicio = time.perf_counter()
+clinica = Clinica("Benchmark")
+if {modo!r} == "binario":
+    clinica.abrir_snapshot_binario({archivo!r})
+else:
+    clinica.leer_configuracion({archivo!r}, incremental={modo!r} == "incremental")
+abierto = time.perf_counter()
+clinica.obtener_paciente_por_dni({dni!r})
+sum(1 for _ in clinica.turnos_en_espera())
+consulta = time.perf_counter()
+print(abierto - inicio, consulta - inicio, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base)
+"""
+
+
+def medir_arranque(archivo, modo, dni):
+    """
+    Devuelve (segundos hasta abrir, segundos hasta la primera consulta, pico de RSS en KB).
+    """
+    script = _SCRIPT_ARRANQUE.format(carpeta=CARPETA_FUENTES, archivo=archivo, modo=modo, dni=dni)
+    salida = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    abrir, consulta, pico = salida.stdout.split()
+    return float(abrir), float(consulta), int(pico)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pacientes", type=int, default=100_000)
+    parser.add_argument("--turnos", type=int, default=500_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        archivo = os.path.join(carpeta, "configs.json")
+        binario = os.path.join(carpeta, "configs.clb")
+        generar_configuracion(archivo, args.pacientes, args.turnos, distribucion_estados=DISTRIBUCION_ESTADOS)
+        # En otro proceso para que el pico de RSS de la conversión no se herede en las mediciones
+        subprocess.run([sys.executable, os.path.join(CARPETA_FUENTES, "snapshot_binario.py"), "a-binario",
+                        archivo, binario], check=True)
+        print(f"Archivo sintético: {args.pacientes} pacientes, {args.turnos} turnos, "
+              f"JSON {os.path.getsize(archivo) / 2**20:.1f} MB, binario {os.path.getsize(binario) / 2**20:.1f} MB")
+        dni = None
+        with open(archivo) as file:
+            for linea in file:
+                if '"dni"' in linea:
+                    dni = linea.split('"dni": "')[1].split('"')[0]
+                    break
+        for modo, ruta in (("json.load", archivo), ("incremental", archivo), ("binario", binario)):
+            abrir, consulta, pico_kb = medir_arranque(ruta, modo, dni)
+            print(f"{modo:<12} abrir: {abrir * 1000:9.1f} ms  primera consulta: {consulta * 1000:9.1f} ms"
+                  f"  pico RSS: {pico_kb / 1024:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
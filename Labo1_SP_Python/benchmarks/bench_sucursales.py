@@ -0,0 +1,74 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Mide el informe consolidado de muchas sucursales con distinta cantidad de
+procesos y reporta la aceleración respecto de un solo proceso.
+
+    python -m benchmarks.bench_sucursales --sucursales 32 --procesos 1 2 4 8
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.generador import generar_configuracion
+from sucursales import CoordinadorSucursales
+
+
+def generar_sucursales(carpeta, cantidad, pacientes, turnos):
+    """
+    Genera `cantidad` configs.json con semillas distintas y devuelve sus rutas.
+    """
+    archivos = []
+    for i in range(cantidad):
+        archivo = os.path.join(carpeta, f"sucursal_{i:02d}.json")
+        generar_configuracion(archivo, pacientes, turnos, semilla=i)
+        archivos.append(archivo)
+    return archivos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sucursales", type=int, default=32)
+    parser.add_argument("--pacientes", type=int, default=5_000)
+    parser.add_argument("--turnos", type=int, default=25_000)
+    parser.add_argument("--procesos", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        archivos = generar_sucursales(carpeta, args.sucursales, args.pacientes, args.turnos)
+        print(f"{args.sucursales} sucursales de {args.pacientes} pacientes y {args.turnos} turnos "
+              f"({os.cpu_count()} CPUs)")
+        base = None
+        for procesos in args.procesos:
+            inicio = time.perf_counter()
+            resumen = CoordinadorSucursales(archivos, procesos).resumen_global()
+            segundos = time.perf_counter() - inicio
+            base = base or segundos
+            print(f"{procesos:>3} procesos: {segundos:7.2f} s  aceleración x{base / segundos:4.2f}  "
+                  f"({resumen.turnos} turnos, menos ingresos: {resumen.informe.obra_social_menos_ingresos})")
+
+
+if __name__ == "__main__":
+    main()
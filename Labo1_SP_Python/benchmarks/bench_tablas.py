@@ -0,0 +1,110 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Mide mostrar la lista de espera con muchos turnos activos: la tabla completa
+con un print por fila (como antes de tablas.py) contra la primera página con
+un único write, la página siguiente y la exportación de la cola entera a un
+archivo. La salida estándar se redirige a un archivo con buffer de línea,
+como una terminal, y también se informa el pico de memoria de cada variante.
+
+    python -m benchmarks.bench_tablas --en-espera 100000
+"""
+
+import argparse
+import contextlib
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.generador import generar_configuracion
+from clinica import TABLA_TURNOS, Clinica
+
+
+def _tabla_por_filas(clinica):
+    """
+    Versión anterior de mostrar_pacientes_en_espera: copia la cola y hace un print por fila.
+    """
+    turnos = list(clinica.turnos_en_espera())
+    print("\n=== Pacientes en Espera ===\n")
+    print("\n" + TABLA_TURNOS.lineas(()).__next__())
+    for turno in turnos:
+        paciente = clinica.obtener_paciente_por_id(turno.id_paciente)
+        print(f"║ {turno.id:<4} ║ {paciente.nombre:<20} ║ {paciente.obra_social:<20} ║ {turno.especialidad:<20} ║ "
+              f"${turno.monto_a_pagar:<20.2f} ║ {turno.estado:<20} ║")
+
+
+def _medir(funcion, salida):
+    """
+    Devuelve (segundos, pico de memoria en MB) de correr `funcion` con la
+    salida estándar en `salida`. El pico se mide en una segunda corrida,
+    porque tracemalloc hace más lenta cada asignación.
+    """
+    resultados = []
+    for con_tracemalloc in (False, True):
+        # Que la basura de la medición anterior no dispare una recolección en esta
+        gc.collect()
+        if con_tracemalloc:
+            tracemalloc.start()
+        # Abrir trunca la salida de la medición anterior: queda fuera del tiempo medido
+        with open(salida, 'w', buffering=1, encoding='utf-8') as file, contextlib.redirect_stdout(file):
+            inicio = time.perf_counter()
+            funcion()
+            resultados.append(time.perf_counter() - inicio)
+    pico = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return resultados[0], pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pacientes", type=int, default=20_000)
+    parser.add_argument("--en-espera", type=int, default=100_000, help="Turnos activos en la cola.")
+    parser.add_argument("--tamanio-pagina", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        archivo = os.path.join(carpeta, "configs.json")
+        generar_configuracion(archivo, args.pacientes, args.en_espera, distribucion_estados={"Activo": 1.0})
+        clinica = Clinica("Tablas")
+        clinica.cargar_configuracion(archivo)
+        salida = os.path.join(carpeta, "salida.txt")
+        print(f"{clinica.cantidad_en_espera()} turnos en espera")
+
+        paginador = clinica.paginar_en_espera(args.tamanio_pagina)
+        paginador.inicio = (paginador.cantidad_paginas() // 2) * paginador.tamanio
+        variantes = (
+            ("tabla completa, print por fila", lambda: _tabla_por_filas(clinica)),
+            ("primera página", lambda: clinica.mostrar_pacientes_en_espera(clinica.paginar_en_espera(
+                args.tamanio_pagina))),
+            ("página del medio de la cola", lambda: clinica.mostrar_pacientes_en_espera(paginador)),
+            ("exportar la cola entera", lambda: clinica.exportar_en_espera(os.path.join(carpeta, "espera.txt"))),
+        )
+        for nombre, funcion in variantes:
+            segundos, pico = _medir(funcion, salida)
+            print(f"{nombre:<32} {segundos * 1000:10.2f} ms   pico de memoria {pico:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
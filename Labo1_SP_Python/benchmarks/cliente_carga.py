@@ -0,0 +1,148 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Cliente de carga para servidor.py: abre muchas conexiones concurrentes que
+mezclan altas de pacientes y turnos con lecturas, y reporta pedidos por
+segundo y latencias. Si no se indica --puerto levanta un servidor local en
+otro proceso sobre un dataset sintético.
+
+    python -m benchmarks.cliente_carga --clientes 200 --pedidos 50
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import CARPETA_FUENTES
+from benchmarks.generador import generar_configuracion
+from metricas import Histograma
+from servidor import ClienteClinica
+
+_ESPECIALIDADES = ("medico clinico", "odontologia", "psicologia", "traumatologia")
+
+
+async def _cliente(numero, host, puerto, pedidos, latencias, errores):
+    cliente = ClienteClinica(host, puerto)
+    await cliente.conectar()
+    id_paciente = None
+    try:
+        for i in range(pedidos):
+            if i == 0:
+                op, argumentos = "alta_paciente", {"nombre": "Carga", "apellido": "Cliente", "dni": f"9{numero:07d}",
+                                                   "edad": 30, "obra_social": "particular"}
+            elif i % 5 == 1 and id_paciente is not None:
+                op, argumentos = "alta_turno", {"id_paciente": id_paciente,
+                                                "especialidad": _ESPECIALIDADES[i % len(_ESPECIALIDADES)]}
+            elif i % 5 == 2:
+                op, argumentos = "informe", {}
+            elif i % 5 == 3 and id_paciente is not None:
+                op, argumentos = "paciente", {"id_paciente": id_paciente}
+            else:
+                op, argumentos = "colas", {}
+            inicio = time.perf_counter()
+            respuesta = await cliente.pedir(op, **argumentos)
+            latencias[op].registrar(time.perf_counter() - inicio)
+            if not respuesta["ok"]:
+                errores.append(respuesta)
+            elif op == "alta_paciente":
+                id_paciente = respuesta["resultado"]["id"]
+    finally:
+        await cliente.cerrar()
+
+
+async def generar_carga(host, puerto, clientes, pedidos):
+    """
+    Corre `clientes` conexiones concurrentes de `pedidos` pedidos cada una.
+
+    Returns:
+        tuple: (segundos, {op: Histograma}, lista de respuestas con error).
+    """
+    latencias = {op: Histograma() for op in ("alta_paciente", "alta_turno", "informe", "paciente", "colas")}
+    errores = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(_cliente(n, host, puerto, pedidos, latencias, errores) for n in range(clientes)))
+    return time.perf_counter() - inicio, latencias, errores
+
+
+def _puerto_libre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _levantar_servidor(carpeta, pacientes, turnos):
+    archivo = os.path.join(carpeta, "configs.json")
+    generar_configuracion(archivo, pacientes, turnos)
+    puerto = _puerto_libre()
+    proceso = subprocess.Popen([sys.executable, os.path.join(CARPETA_FUENTES, "servidor.py"), "--config", archivo,
+                                "--journal", os.path.join(carpeta, "configs.journal"), "--puerto", str(puerto)],
+                               stdout=subprocess.DEVNULL)
+    for _ in range(200):
+        try:
+            socket.create_connection(("127.0.0.1", puerto), timeout=0.1).close()
+            return proceso, puerto
+        except OSError:
+            time.sleep(0.05)
+    proceso.kill()
+    raise RuntimeError("El servidor no arrancó.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=None, help="Servidor ya levantado; si no, se levanta uno.")
+    parser.add_argument("--clientes", type=int, default=200)
+    parser.add_argument("--pedidos", type=int, default=50)
+    parser.add_argument("--pacientes", type=int, default=10_000)
+    parser.add_argument("--turnos", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        proceso, puerto = (None, args.puerto) if args.puerto else _levantar_servidor(carpeta, args.pacientes,
+                                                                                     args.turnos)
+        try:
+            segundos, latencias, errores = asyncio.run(
+                generar_carga(args.host, puerto, args.clientes, args.pedidos))
+        finally:
+            if proceso:
+                proceso.terminate()
+                proceso.wait()
+
+    total = args.clientes * args.pedidos
+    print(f"{args.clientes} clientes x {args.pedidos} pedidos: {total} pedidos en {segundos:.2f} s "
+          f"({total / segundos:,.0f} pedidos/s), {len(errores)} con error")
+    for op, histograma in latencias.items():
+        if histograma.cantidad:
+            print(f"{op:<14} n={histograma.cantidad:<7} p50={histograma.percentil(0.5) * 1000:7.2f} ms  "
+                  f"p99={histograma.percentil(0.99) * 1000:7.2f} ms")
+    for respuesta in errores[:5]:
+        print("Error:", respuesta)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Compara dos archivos de resultados de benchmarks.run e informa las
+operaciones que empeoraron más que el umbral.
+
+    python -m benchmarks.comparar base.json nuevo.json --umbral 0.2
+"""
+
+import argparse
+import json
+import sys
+
+
+def _por_clave(documento):
+    return {(fila["operacion"], fila["turnos"]): fila["segundos_por_operacion"] for fila in documento["resultados"]}
+
+
+def comparar(base, nuevo, umbral):
+    """
+    Args:
+        umbral (float): Variación relativa a partir de la cual hay regresión (0.2 = 20% más lento).
+
+    Returns:
+        list: Tuplas (operacion, turnos, segundos_base, segundos_nuevo, variacion, regresion)
+            ordenadas por variación.
+    """
+    tiempos_base = _por_clave(base)
+    filas = []
+    for clave, segundos in _por_clave(nuevo).items():
+        if clave in tiempos_base and tiempos_base[clave] > 0:
+            variacion = segundos / tiempos_base[clave] - 1
+            filas.append((*clave, tiempos_base[clave], segundos, variacion, variacion > umbral))
+    return sorted(filas, key=lambda fila: fila[4], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara dos resultados de benchmarks.")
+    parser.add_argument("base")
+    parser.add_argument("nuevo")
+    parser.add_argument("--umbral", type=float, default=0.2, help="Variación a partir de la cual hay regresión")
+    args = parser.parse_args()
+
+    with open(args.base) as file:
+        base = json.load(file)
+    with open(args.nuevo) as file:
+        nuevo = json.load(file)
+
+    print(f"Base: {base.get('commit')}  Nuevo: {nuevo.get('commit')}")
+    regresiones = 0
+    for operacion, turnos, segundos_base, segundos_nuevo, variacion, regresion in comparar(base, nuevo, args.umbral):
+        marca = "REGRESION" if regresion else ""
+        regresiones += regresion
+        print(f"{turnos:>9} {operacion:<44} {segundos_base * 1000:12.4f} -> {segundos_nuevo * 1000:12.4f} ms "
+              f"{variacion:+8.1%} {marca}")
+    if regresiones:
+        print(f"{regresiones} operaciones empeoraron más de {args.umbral:.0%}")
+    sys.exit(1 if regresiones else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Prueba de estrés del modo concurrente de Clinica: muchos hilos dan de alta
+pacientes y turnos, atienden, cobran y piden informes a la vez. Al final (y
+en cada informe durante la corrida) se verifican los invariantes: IDs únicos,
+cada turno en un solo estado y los ingresos iguales a lo que había al empezar
+más la recaudación.
+
+    python -m benchmarks.estres_concurrencia --hilos 16 --operaciones 5000
+    python -m benchmarks.estres_concurrencia --sin-locks   # para ver qué se rompe sin el modo concurrente
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.generador import generar_configuracion
+from clinica import Clinica
+from errores import ErrorClinica
+from servicio import ServicioClinica
+
+_ESPECIALIDADES = ("medico clinico", "odontologia", "psicologia", "traumatologia")
+
+
+def _trabajar(numero, servicio, operaciones, ingresos_iniciales, fallas, altas, largada):
+    azar = random.Random(numero)
+    mis_pacientes = []
+    largada.wait()
+    for i in range(operaciones):
+        opcion = azar.random()
+        try:
+            if opcion < 0.25 or not mis_pacientes:
+                dni = f"8{numero:03d}{i:06d}"
+                mis_pacientes.append(servicio.alta_paciente("Estres", "Hilo", dni, 40, "particular").id)
+                altas["pacientes"][numero] += 1
+            elif opcion < 0.55:
+                servicio.alta_turno(azar.choice(mis_pacientes), azar.choice(_ESPECIALIDADES))
+                altas["turnos"][numero] += 1
+            elif opcion < 0.75:
+                servicio.atender(azar.randint(1, 3))
+            elif opcion < 0.9:
+                servicio.cobrar()
+            else:
+                instantanea = servicio.clinica.instantanea()
+                diferencia = sum(instantanea["ingresos_por_obra_social"].values()) - instantanea["recaudacion"]
+                if abs(diferencia - ingresos_iniciales) > 1e-6 * max(1.0, ingresos_iniciales):
+                    fallas.append(f"Informe inconsistente: ingresos - recaudación = {diferencia}")
+        except ErrorClinica as error:
+            fallas.append(f"{type(error).__name__}: {error}")
+        except Exception as error:  # Sin locks las estructuras internas pueden romperse de cualquier forma
+            fallas.append(f"{type(error).__name__}: {error}")
+
+
+def verificar_invariantes(clinica, ingresos_iniciales, pacientes_esperados, turnos_esperados):
+    """
+    Devuelve la lista de invariantes que no se cumplen.
+    """
+    fallas = []
+    ids_pacientes = [p.id for p in clinica.lista_pacientes]
+    ids_turnos = [t.id for t in clinica.lista_turnos]
+    if len(set(ids_pacientes)) != len(ids_pacientes):
+        fallas.append("IDs de paciente repetidos")
+    if len(set(ids_turnos)) != len(ids_turnos):
+        fallas.append("IDs de turno repetidos")
+    if len(ids_pacientes) != pacientes_esperados:
+        fallas.append(f"{len(ids_pacientes)} pacientes, se esperaban {pacientes_esperados}")
+    if len(ids_turnos) != turnos_esperados:
+        fallas.append(f"{len(ids_turnos)} turnos, se esperaban {turnos_esperados}")
+    instantanea = clinica.instantanea()
+    if instantanea["en_espera"] + instantanea["por_cobrar"] + instantanea["pagados"] != len(ids_turnos):
+        fallas.append("Hay turnos en más de un estado o en ninguno")
+    diferencia = sum(instantanea["ingresos_por_obra_social"].values()) - instantanea["recaudacion"]
+    if abs(diferencia - ingresos_iniciales) > 1e-6 * max(1.0, ingresos_iniciales):
+        fallas.append(f"Ingresos - recaudación = {diferencia}, se esperaba {ingresos_iniciales}")
+    return fallas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hilos", type=int, default=16)
+    parser.add_argument("--operaciones", type=int, default=5000, help="Operaciones por hilo.")
+    parser.add_argument("--pacientes", type=int, default=2_000)
+    parser.add_argument("--turnos", type=int, default=10_000)
+    parser.add_argument("--sin-locks", action="store_true")
+    args = parser.parse_args()
+
+    # Cambios de hilo frecuentes para que las carreras aparezcan en pocas operaciones
+    sys.setswitchinterval(1e-6)
+    with tempfile.TemporaryDirectory() as carpeta:
+        archivo = os.path.join(carpeta, "configs.json")
+        generar_configuracion(archivo, args.pacientes, args.turnos)
+        servicio = ServicioClinica(clinica=Clinica("Estrés", concurrente=not args.sin_locks))
+        servicio.cargar(archivo)
+
+    clinica = servicio.clinica
+    ingresos_iniciales = sum(clinica.ingresos_por_obra_social().values())
+    pacientes_iniciales, turnos_iniciales = len(clinica.lista_pacientes), len(clinica.lista_turnos)
+    fallas = []
+    altas = {"pacientes": [0] * args.hilos, "turnos": [0] * args.hilos}
+    # Todos arrancan juntos: si no, los primeros hilos pueden terminar antes
+    # de que se lancen los últimos y la corrida sin locks no se superpone
+    largada = threading.Barrier(args.hilos + 1)
+    hilos = [threading.Thread(target=_trabajar,
+                              args=(n, servicio, args.operaciones, ingresos_iniciales, fallas, altas, largada))
+             for n in range(args.hilos)]
+    for hilo in hilos:
+        hilo.start()
+    largada.wait()
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.join()
+    segundos = time.perf_counter() - inicio
+
+    fallas += verificar_invariantes(clinica, ingresos_iniciales, pacientes_iniciales + sum(altas["pacientes"]),
+                                    turnos_iniciales + sum(altas["turnos"]))
+    total = args.hilos * args.operaciones
+    print(f"{args.hilos} hilos x {args.operaciones} operaciones ({'sin locks' if args.sin_locks else 'concurrente'}): "
+          f"{segundos:.2f} s, {total / segundos:,.0f} ops/s")
+    if fallas:
+        print(f"{len(fallas)} invariantes rotos, por ejemplo:")
+        for falla in fallas[:10]:
+            print(" -", falla)
+        sys.exit(1)
+    if args.sin_locks:
+        # Que no se vea una carrera no prueba que no la haya
+        print("No se detectaron carreras en esta corrida; probar con más --operaciones o --hilos")
+        return
+    print("Invariantes OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Generador de configs.json sintéticos con datos realistas para benchmarks.
+
+    python -m benchmarks.generador salida.json --pacientes 10000 --turnos 50000
+"""
+
+import argparse
+import json
+import random
+
+from tarifario import Tarifario
+
+ESPECIALIDADES = ["medico clinico", "odontologia", "psicologia", "traumatologia"]
+OBRAS_SOCIALES = ["swiss medical", "apres", "pami", "particular"]
+
+# Proporción de pacientes por obra social y de turnos por estado
+MEZCLA_OBRAS_SOCIALES = {"swiss medical": 0.30, "apres": 0.25, "pami": 0.20, "particular": 0.25}
+DISTRIBUCION_ESTADOS = {"Activo": 0.10, "Finalizado": 0.05, "Pagado": 0.85}
+
+_NOMBRES = ["uriel", "leo", "rodri", "ana", "maria", "juan", "lucia", "pedro", "sofia", "martin",
+            "valentina", "diego", "camila", "jorge", "julieta", "pablo", "florencia", "nicolas"]
+_APELLIDOS = ["guillen", "messi", "gomez", "perez", "rodriguez", "fernandez", "lopez", "diaz",
+              "martinez", "sanchez", "romero", "sosa", "alvarez", "torres", "ruiz", "ramirez"]
+
+
+def _elegir(azar, distribucion):
+    return azar.choices(list(distribucion), weights=list(distribucion.values()))[0]
+
+
+def generar_paciente(azar, id_paciente, mezcla_obras_sociales=MEZCLA_OBRAS_SOCIALES):
+    """
+    Genera un paciente que cumple las reglas de Validaciones: PAMI solo a
+    partir de los 60 años y el resto de las obras sociales por debajo.
+    """
+    obra_social = _elegir(azar, mezcla_obras_sociales)
+    edad = azar.randint(60, 90) if obra_social == "pami" else azar.randint(18, 59)
+    return {"id": id_paciente, "nombre": azar.choice(_NOMBRES), "apellido": azar.choice(_APELLIDOS),
+            "dni": str(20000000 + id_paciente), "edad": str(edad), "obra_social": obra_social,
+            "fecha_registro": f"2024-{azar.randint(1, 12):02d}-{azar.randint(1, 28):02d} "
+                              f"{azar.randint(8, 19):02d}:{azar.randint(0, 59):02d}:{azar.randint(0, 59):02d}"}
+
+
+def generar_configuracion(archivo, cantidad_pacientes, cantidad_turnos, mezcla_obras_sociales=MEZCLA_OBRAS_SOCIALES,
+                          distribucion_estados=DISTRIBUCION_ESTADOS, semilla=0):
+    """
+    Escribe un configs.json sintético con el mismo formato que guardar_datos,
+    sin armar el documento completo en memoria.
+
+    Args:
+        archivo (str): Ruta del archivo a generar.
+        cantidad_pacientes (int): Cantidad de pacientes.
+        cantidad_turnos (int): Cantidad de turnos, repartidos al azar entre los pacientes.
+        mezcla_obras_sociales (dict): Proporción de pacientes por obra social.
+        distribucion_estados (dict): Proporción de turnos por estado.
+        semilla (int): Semilla para que el archivo sea reproducible.
+    """
+    azar = random.Random(semilla)
+    tarifario = Tarifario()
+    # Solo se guarda lo necesario para calcular el monto de cada turno
+    perfiles = []
+    with open(archivo, 'w') as file:
+        file.write('{\n    "lista_pacientes": [')
+        for i in range(1, cantidad_pacientes + 1):
+            paciente = generar_paciente(azar, i, mezcla_obras_sociales)
+            perfiles.append((int(paciente["edad"]), paciente["obra_social"]))
+            file.write(("," if i > 1 else "") + "\n        " + json.dumps(paciente))
+        file.write('\n    ],\n    "lista_turnos": [')
+        for i in range(cantidad_turnos if cantidad_pacientes else 0):
+            id_paciente = azar.randint(1, cantidad_pacientes)
+            turno = {"id": i, "id_paciente": id_paciente, "especialidad": azar.choice(ESPECIALIDADES),
+                     "monto_a_pagar": tarifario.calcular(*perfiles[id_paciente - 1]),
+                     "estado": _elegir(azar, distribucion_estados)}
+            file.write(("," if i else "") + "\n        " + json.dumps(turno))
+        file.write('\n    ],\n    "especialidades": ' + json.dumps(ESPECIALIDADES)
+                   + ',\n    "obras_sociales": ' + json.dumps(OBRAS_SOCIALES) + '\n}')
+
+
+def _distribucion(texto):
+    """
+    Convierte 'clave=peso,clave=peso' en un diccionario.
+    """
+    distribucion = {}
+    for parte in texto.split(","):
+        clave, peso = parte.rsplit("=", 1)
+        distribucion[clave.strip()] = float(peso)
+    return distribucion
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un configs.json sintético.")
+    parser.add_argument("archivo")
+    parser.add_argument("--pacientes", type=int, default=10_000)
+    parser.add_argument("--turnos", type=int, default=50_000)
+    parser.add_argument("--obras-sociales", type=_distribucion, default=MEZCLA_OBRAS_SOCIALES,
+                        help="Ejemplo: 'pami=0.5,particular=0.5'")
+    parser.add_argument("--estados", type=_distribucion, default=DISTRIBUCION_ESTADOS,
+                        help="Ejemplo: 'Activo=0.2,Finalizado=0.1,Pagado=0.7'")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+    generar_configuracion(args.archivo, args.pacientes, args.turnos, args.obras_sociales, args.estados, args.semilla)
+
+
+if __name__ == "__main__":
+    main()
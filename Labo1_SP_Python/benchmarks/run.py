@@ -0,0 +1,139 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Mide cada operación de la clínica sobre datasets sintéticos de distinto
+tamaño y guarda los resultados en JSON para compararlos entre commits.
+
+    python -m benchmarks.run --tamanios 1000 10000 100000 1000000 --salida resultados.json
+    python -m benchmarks.comparar base.json resultados.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks import CARPETA_FUENTES
+from benchmarks.generador import ESPECIALIDADES, generar_configuracion
+from servicio import ServicioClinica
+
+
+def _medir(funcion, repeticiones=1):
+    """
+    Ejecuta la función `repeticiones` veces y devuelve los segundos totales.
+    """
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return time.perf_counter() - inicio
+
+
+def _commit_actual():
+    try:
+        salida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=CARPETA_FUENTES,
+                                capture_output=True, text=True, check=True)
+        return salida.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def medir_tamanio(carpeta, cantidad_turnos, turnos_por_paciente, repeticiones_alta):
+    """
+    Genera un dataset con `cantidad_turnos` turnos y mide cada operación.
+
+    Returns:
+        list: Un diccionario por operación con los segundos totales y por operación.
+    """
+    cantidad_pacientes = max(1, cantidad_turnos // turnos_por_paciente)
+    archivo = os.path.join(carpeta, f"configs_{cantidad_turnos}.json")
+    generar_configuracion(archivo, cantidad_pacientes, cantidad_turnos)
+    resultados = []
+
+    def registrar(operacion, segundos, repeticiones=1):
+        resultados.append({"operacion": operacion, "turnos": cantidad_turnos, "pacientes": cantidad_pacientes,
+                           "repeticiones": repeticiones, "segundos": segundos,
+                           "segundos_por_operacion": segundos / repeticiones})
+
+    servicio = ServicioClinica("Benchmark")
+    registrar("cargar_json", _medir(lambda: servicio.cargar(archivo, incremental=False)))
+    servicio = ServicioClinica("Benchmark")
+    registrar("cargar_incremental", _medir(lambda: servicio.cargar(archivo, incremental=True)))
+    clinica = servicio.clinica
+
+    registrar("guardar_datos", _medir(lambda: clinica.guardar_datos(os.path.join(carpeta, "guardado.json"))))
+
+    dnis = iter(range(90000000, 90000000 + repeticiones_alta))
+    registrar("alta_paciente", _medir(
+        lambda: servicio.alta_paciente("nuevo", "paciente", str(next(dnis)), 30, "particular"), repeticiones_alta),
+        repeticiones_alta)
+    ids_pacientes = iter(range(1, repeticiones_alta + 1))
+    especialidades = iter(ESPECIALIDADES * (repeticiones_alta // len(ESPECIALIDADES) + 1))
+    registrar("alta_turno", _medir(
+        lambda: servicio.alta_turno(next(ids_pacientes) % cantidad_pacientes + 1, next(especialidades)),
+        repeticiones_alta), repeticiones_alta)
+
+    for criterio, nombre in ((1, "ordenar_turnos_obra_social"), (2, "ordenar_turnos_monto")):
+        registrar(nombre, _medir(lambda: sum(1 for _ in clinica.ordenar_turnos(criterio))))
+        registrar(nombre + "_vista_construida", _medir(lambda: sum(1 for _ in clinica.ordenar_turnos(criterio))))
+
+    with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+        registrar("mostrar_pacientes_en_espera", _medir(clinica.mostrar_pacientes_en_espera))
+        registrar("atender_pacientes", _medir(servicio.atender, repeticiones_alta), repeticiones_alta)
+        registrar("cobrar_atenciones", _medir(servicio.cobrar))
+        registrar("mostrar_informe", _medir(clinica.mostrar_informe, repeticiones_alta), repeticiones_alta)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de las operaciones de Clinica.")
+    parser.add_argument("--tamanios", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000],
+                        help="Cantidades de turnos a generar")
+    parser.add_argument("--turnos-por-paciente", type=int, default=5)
+    parser.add_argument("--repeticiones", type=int, default=100,
+                        help="Repeticiones de las operaciones de alta, atención e informe")
+    parser.add_argument("--salida", default="resultados_benchmark.json")
+    args = parser.parse_args()
+
+    resultados = []
+    with tempfile.TemporaryDirectory() as carpeta:
+        for cantidad in args.tamanios:
+            for fila in medir_tamanio(carpeta, cantidad, args.turnos_por_paciente, args.repeticiones):
+                resultados.append(fila)
+                print(f"{fila['turnos']:>9} turnos  {fila['operacion']:<44} "
+                      f"{fila['segundos_por_operacion'] * 1000:12.4f} ms/op")
+
+    documento = {"commit": _commit_actual(), "fecha": datetime.now().isoformat(timespec="seconds"),
+                 "python": platform.python_version(), "plataforma": platform.platform(),
+                 "resultados": resultados}
+    with open(args.salida, 'w') as file:
+        json.dump(documento, file, indent=4)
+    print(f"Resultados guardados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Simulador de eventos discretos de un día completo de la clínica.
+
+Las llegadas de pacientes salen de un proceso de Poisson con picos de mañana
+y de tarde y en ráfagas (grupos que llegan juntos), con semilla fija. Cada
+llegada pide el alta de un turno (y del paciente, si es nuevo); cada cierto
+tiempo se corre un ciclo de atender_pacientes y otro de cobrar_atenciones, y
+al final del día se atiende y cobra lo que quedó y se llama a cerrar_caja.
+
+El reloj es simulado, pero cada operación se ejecuta de verdad sobre una
+Clinica y su duración real es el tiempo de servicio: la clínica se modela como
+un único servidor FIFO, así que si las operaciones tardan más de lo que tardan
+en llegar los pedidos se forma una cola y la latencia (espera + servicio)
+crece. Se informa el throughput sostenido, los percentiles de latencia por
+operación, la profundidad de las colas en el tiempo y el crecimiento de la
+memoria; con --buscar-saturacion se busca la tasa de llegadas a partir de la
+cual la latencia se degrada respecto de una carga baja.
+
+    python -m benchmarks.simulador --tasa 2 --horas 10
+    python -m benchmarks.simulador --buscar-saturacion
+"""
+
+import argparse
+import collections
+import heapq
+import json
+import os
+import random
+import resource
+import tempfile
+import time
+
+from benchmarks.generador import ESPECIALIDADES, generar_configuracion, generar_paciente
+from clinica import Clinica
+from metricas import Histograma
+from servicio import ServicioClinica
+
+# Multiplicador de la tasa de llegadas por hora del día (8 a 18 hs): pico a media mañana y a la tarde
+PERFIL_DIARIO = (0.6, 1.4, 1.8, 1.3, 0.7, 0.5, 0.9, 1.3, 1.0, 0.5)
+
+_OPERACIONES = ("alta_paciente", "alta_turno", "atender", "cobrar", "cerrar_caja")
+
+
+class ResultadoSimulacion:
+    """
+    Resultado de una corrida: latencias y tiempos de servicio por operación
+    (Histograma, en segundos), muestras en el tiempo y totales.
+    """
+
+    def __init__(self, tasa, duracion):
+        self.tasa = tasa
+        self.duracion = duracion
+        self.latencias = {op: Histograma() for op in _OPERACIONES}
+        self.servicio = {op: Histograma() for op in _OPERACIONES}
+        # (segundo simulado, pedidos en cola, turnos en espera, turnos por cobrar, RSS en MB)
+        self.muestras = []
+        self.operaciones = 0
+        self.ocupado = 0.0
+        self.fin = 0.0
+        self.llegadas = 0
+        self.errores = collections.Counter()
+
+    @property
+    def throughput(self):
+        """Operaciones completadas por segundo simulado."""
+        return self.operaciones / self.fin if self.fin else 0.0
+
+    @property
+    def capacidad(self):
+        """Operaciones por segundo de servicio: el techo si la clínica estuviera siempre ocupada."""
+        return self.operaciones / self.ocupado if self.ocupado else 0.0
+
+    @property
+    def cola_maxima(self):
+        return max((muestra[1] for muestra in self.muestras), default=0)
+
+    def p99(self, operacion="alta_turno"):
+        return self.latencias[operacion].percentil(0.99)
+
+    def a_diccionario(self):
+        return {
+            "tasa": self.tasa,
+            "duracion": self.duracion,
+            "llegadas": self.llegadas,
+            "operaciones": self.operaciones,
+            "throughput": self.throughput,
+            "capacidad": self.capacidad,
+            "errores": dict(self.errores),
+            "operaciones_por_tipo": {
+                op: {"cantidad": h.cantidad,
+                     **{f"latencia_p{int(q * 100)}": h.percentil(q) for q in (0.5, 0.95, 0.99)},
+                     "latencia_max": h.maximo,
+                     "servicio_p50": self.servicio[op].percentil(0.5),
+                     "servicio_p99": self.servicio[op].percentil(0.99)}
+                for op, h in self.latencias.items() if h.cantidad},
+            "muestras": [dict(zip(("segundo", "cola", "en_espera", "por_cobrar", "rss_mb"), muestra))
+                         for muestra in self.muestras],
+        }
+
+
+def _rss_mb():
+    """
+    Memoria residente actual; donde no hay /proc se usa el pico de getrusage.
+    """
+    try:
+        with open("/proc/self/statm") as archivo:
+            return int(archivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def generar_llegadas(azar, tasa, duracion, perfil=PERFIL_DIARIO, rafaga=3.0):
+    """
+    Genera los instantes de llegada de un proceso de Poisson no homogéneo por
+    adelgazamiento: la tasa promedio es `tasa` llegadas por segundo y se
+    reparte en el día según `perfil`. Cada llegada trae un grupo de pacientes
+    de tamaño geométrico con media `rafaga`.
+
+    Yields:
+        float: Segundo simulado de cada paciente, en orden.
+    """
+    promedio_perfil = sum(perfil) / len(perfil)
+    tasa_maxima = tasa * max(perfil) / promedio_perfil / rafaga
+    probabilidad_fin = 1 / rafaga
+    instante = 0.0
+    while True:
+        instante += azar.expovariate(tasa_maxima)
+        if instante >= duracion:
+            return
+        franja = perfil[min(int(instante / duracion * len(perfil)), len(perfil) - 1)]
+        if azar.random() * max(perfil) > franja:
+            continue
+        yield instante
+        while azar.random() > probabilidad_fin:
+            yield instante
+
+
+def simular(tasa, duracion, pacientes_iniciales=10_000, turnos_iniciales=0, ciclo_atencion=None,
+            ciclo_cobro=None, proporcion_nuevos=0.3, rafaga=3.0, muestreo=None, semilla=0):
+    """
+    Corre un día simulado sobre una clínica nueva.
+
+    Args:
+        tasa (float): Llegadas de pacientes por segundo simulado, en promedio.
+        duracion (float): Segundos simulados del día.
+        pacientes_iniciales (int): Pacientes cargados antes de abrir.
+        turnos_iniciales (int): Turnos cargados antes de abrir (ver generador.py).
+        ciclo_atencion (float): Segundos entre ciclos de atender_pacientes; por defecto duracion / 200.
+        ciclo_cobro (float): Segundos entre ciclos de cobrar_atenciones; por defecto duracion / 40.
+        proporcion_nuevos (float): Proporción de llegadas que primero dan de alta al paciente.
+        rafaga (float): Tamaño medio de los grupos que llegan juntos.
+        muestreo (float): Segundos entre muestras de colas y memoria; por defecto duracion / 100.
+        semilla (int): Semilla de llegadas y pacientes.
+
+    Returns:
+        ResultadoSimulacion
+    """
+    ciclo_atencion = ciclo_atencion or duracion / 200
+    ciclo_cobro = ciclo_cobro or duracion / 40
+    muestreo = muestreo or duracion / 100
+    azar = random.Random(semilla)
+    resultado = ResultadoSimulacion(tasa, duracion)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        archivo = os.path.join(carpeta, "configs.json")
+        generar_configuracion(archivo, pacientes_iniciales, turnos_iniciales, semilla=semilla)
+        servicio = ServicioClinica(clinica=Clinica("Simulación"))
+        servicio.cargar(archivo)
+        ids_pacientes = [p.id for p in servicio.clinica.lista_pacientes]
+        proximo_dni = 60_000_000
+
+        def alta_paciente():
+            nonlocal proximo_dni
+            proximo_dni += 1
+            datos = generar_paciente(azar, 0)
+            paciente = servicio.alta_paciente(datos["nombre"], datos["apellido"], str(proximo_dni),
+                                              int(datos["edad"]), datos["obra_social"])
+            ids_pacientes.append(paciente.id)
+
+        def alta_turno():
+            servicio.alta_turno(azar.choice(ids_pacientes), azar.choice(ESPECIALIDADES))
+
+        def atender():
+            servicio.atender(None)
+
+        def cobrar():
+            servicio.cobrar()
+
+        def cerrar_caja():
+            while servicio.clinica.hay_turnos_pendientes():
+                servicio.atender(None)
+                servicio.cobrar()
+            servicio.cerrar_caja(archivo)
+
+        acciones = {"alta_paciente": alta_paciente, "alta_turno": alta_turno, "atender": atender,
+                    "cobrar": cobrar, "cerrar_caja": cerrar_caja}
+
+        # Eventos: (segundo, secuencia, operación); la secuencia desempata en orden de llegada
+        eventos = []
+        secuencia = 0
+
+        def programar(instante, operacion):
+            nonlocal secuencia
+            heapq.heappush(eventos, (instante, secuencia, operacion))
+            secuencia += 1
+
+        # Las muestras se programan primero para que, en el mismo instante, se tomen antes que las operaciones
+        instante = 0.0
+        while instante < duracion:
+            programar(instante, None)
+            instante += muestreo
+        for instante in generar_llegadas(azar, tasa, duracion, rafaga=rafaga):
+            resultado.llegadas += 1
+            if not ids_pacientes or azar.random() < proporcion_nuevos:
+                programar(instante, "alta_paciente")
+            programar(instante, "alta_turno")
+        for ciclo, operacion in ((ciclo_atencion, "atender"), (ciclo_cobro, "cobrar")):
+            instante = ciclo
+            while instante < duracion:
+                programar(instante, operacion)
+                instante += ciclo
+        programar(duracion, "cerrar_caja")
+
+        libre = 0.0
+        terminados = collections.deque()
+        rss_inicial = _rss_mb()
+        while eventos:
+            instante, _, operacion = heapq.heappop(eventos)
+            if operacion is None:
+                # Todos los pedidos llegados hasta `instante` ya se simularon: los que
+                # terminan después siguen en la cola del servidor
+                while terminados and terminados[0] <= instante:
+                    terminados.popleft()
+                instantanea = servicio.clinica.instantanea()
+                resultado.muestras.append((instante, len(terminados), instantanea["en_espera"],
+                                           instantanea["por_cobrar"], _rss_mb() - rss_inicial))
+                continue
+            comienzo = max(instante, libre)
+            inicio = time.perf_counter()
+            try:
+                acciones[operacion]()
+            except Exception as error:
+                resultado.errores[f"{operacion}: {type(error).__name__}"] += 1
+            servicio_segundos = time.perf_counter() - inicio
+            libre = comienzo + servicio_segundos
+            terminados.append(libre)
+            resultado.latencias[operacion].registrar(libre - instante)
+            resultado.servicio[operacion].registrar(servicio_segundos)
+            resultado.operaciones += 1
+            resultado.ocupado += servicio_segundos
+        resultado.fin = max(libre, duracion)
+        # cerrar_caja deja la escritura en segundo plano: termina antes de borrar el directorio
+        servicio.clinica.esperar_guardados()
+    return resultado
+
+
+def buscar_saturacion(llegadas=20_000, tasa_inicial=50.0, umbral=5.0, pasos=6, **opciones):
+    """
+    Busca la tasa de llegadas a partir de la cual la latencia p99 de alta_turno
+    supera `umbral` veces la medida a `tasa_inicial`, donde la clínica está
+    ociosa casi todo el tiempo. Duplica la tasa hasta encontrar una que degrade
+    y después bisecta `pasos` veces. Cada sondeo simula un día comprimido con
+    la misma cantidad de llegadas, así que todos tocan datos del mismo tamaño.
+
+    Returns:
+        tuple: (tasa en llegadas por segundo, p99 de referencia en segundos,
+            lista de (tasa, ResultadoSimulacion) de cada sondeo).
+    """
+    referencia = simular(tasa_inicial, llegadas / tasa_inicial, **opciones)
+    sondeos = [(tasa_inicial, referencia)]
+
+    def degrada(tasa):
+        resultado = simular(tasa, llegadas / tasa, **opciones)
+        sondeos.append((tasa, resultado))
+        return resultado.p99() > umbral * referencia.p99()
+
+    buena, mala = tasa_inicial, tasa_inicial * 2
+    while not degrada(mala):
+        buena, mala = mala, mala * 2
+    for _ in range(pasos):
+        media = (buena + mala) / 2
+        if degrada(media):
+            mala = media
+        else:
+            buena = media
+    return buena, referencia.p99(), sondeos
+
+
+def mostrar_resultado(resultado, filas_muestras=10):
+    print(f"Tasa {resultado.tasa:,.2f} llegadas/s durante {resultado.duracion:,.1f} s simulados: "
+          f"{resultado.llegadas} llegadas, {resultado.operaciones} operaciones")
+    print(f"Throughput sostenido {resultado.throughput:,.1f} ops/s, capacidad {resultado.capacidad:,.0f} ops/s, "
+          f"cola máxima {resultado.cola_maxima} pedidos")
+    print(f"{'Operación':<14} {'n':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'máx ms':>9} {'servicio p99':>13}")
+    for op, histograma in resultado.latencias.items():
+        if histograma.cantidad:
+            print(f"{op:<14} {histograma.cantidad:>8} "
+                  + " ".join(f"{histograma.percentil(q) * 1000:>9.3f}" for q in (0.5, 0.95, 0.99))
+                  + f" {histograma.maximo * 1000:>9.3f} {resultado.servicio[op].percentil(0.99) * 1000:>13.3f}")
+    if resultado.muestras:
+        print(f"{'Segundo':>10} {'Cola':>6} {'En espera':>10} {'Por cobrar':>11} {'ΔRSS MB':>8}")
+        salto = max(1, len(resultado.muestras) // filas_muestras)
+        for segundo, cola, en_espera, por_cobrar, rss in resultado.muestras[::salto]:
+            print(f"{segundo:>10.1f} {cola:>6} {en_espera:>10} {por_cobrar:>11} {rss:>8.1f}")
+    for error, cantidad in resultado.errores.items():
+        print(f"Error {error}: {cantidad}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasa", type=float, default=2.0, help="Llegadas de pacientes por segundo simulado.")
+    parser.add_argument("--horas", type=float, default=10.0, help="Duración del día simulado.")
+    parser.add_argument("--pacientes", type=int, default=10_000, help="Pacientes cargados al abrir.")
+    parser.add_argument("--turnos", type=int, default=0, help="Turnos cargados al abrir.")
+    parser.add_argument("--ciclo-atencion", type=float, default=None, help="Segundos entre ciclos de atención.")
+    parser.add_argument("--ciclo-cobro", type=float, default=None, help="Segundos entre ciclos de cobro.")
+    parser.add_argument("--nuevos", type=float, default=0.3, help="Proporción de pacientes nuevos.")
+    parser.add_argument("--rafaga", type=float, default=3.0, help="Tamaño medio de los grupos de llegada.")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--buscar-saturacion", action="store_true")
+    parser.add_argument("--llegadas", type=int, default=20_000, help="Llegadas por sondeo de saturación.")
+    parser.add_argument("--tasa-inicial", type=float, default=50.0, help="Tasa de referencia del sondeo.")
+    parser.add_argument("--umbral", type=float, default=5.0,
+                        help="Cuántas veces la p99 de referencia se considera degradación.")
+    parser.add_argument("--salida", default=None, help="Guarda el resultado en JSON.")
+    args = parser.parse_args()
+
+    opciones = {"pacientes_iniciales": args.pacientes, "turnos_iniciales": args.turnos,
+                "ciclo_atencion": args.ciclo_atencion, "ciclo_cobro": args.ciclo_cobro,
+                "proporcion_nuevos": args.nuevos, "rafaga": args.rafaga, "semilla": args.semilla}
+    if args.buscar_saturacion:
+        tasa, referencia, sondeos = buscar_saturacion(args.llegadas, args.tasa_inicial, args.umbral, **opciones)
+        print(f"{'Tasa/s':>12} {'Throughput/s':>13} {'p99 alta_turno ms':>18} {'x referencia':>13} {'Cola máx':>9}")
+        for tasa_sondeo, resultado in sorted(sondeos, key=lambda sondeo: sondeo[0]):
+            print(f"{tasa_sondeo:>12,.0f} {resultado.throughput:>13,.0f} {resultado.p99() * 1000:>18.3f} "
+                  f"{resultado.p99() / referencia:>13.1f} {resultado.cola_maxima:>9}")
+        print(f"La latencia se degrada por encima de ~{tasa:,.0f} llegadas/s "
+              f"(p99 de alta_turno > {args.umbral:g} veces la de {args.tasa_inicial:g} llegadas/s).")
+        documento = {"tasa_saturacion": tasa, "p99_referencia": referencia,
+                     "sondeos": [r.a_diccionario() for _, r in sondeos]}
+    else:
+        resultado = simular(args.tasa, args.horas * 3600, **opciones)
+        mostrar_resultado(resultado)
+        documento = resultado.a_diccionario()
+    if args.salida:
+        with open(args.salida, 'w') as archivo:
+            json.dump(documento, archivo, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""
+Búsqueda de pacientes por nombre y apellido.
+
+El índice trabaja sobre el vocabulario de palabras normalizadas (minúsculas,
+sin acentos), que es mucho más chico que la cantidad de pacientes: cada
+palabra tiene su lista de IDs, el vocabulario ordenado resuelve los prefijos
+con bisect y los trigramas de cada palabra resuelven las búsquedas
+aproximadas. Las altas se acumulan y se fusionan en la próxima consulta; las
+bajas no se quitan de las listas sino que se descartan al consultar, igual
+que en el planificador.
+
+    python busqueda.py configs.json --buscar "uri gui"
+    python busqueda.py configs.json --similares "urial giullen"
+    python busqueda.py configs.json --duplicados duplicados.csv
+"""
+
+import argparse
+import bisect
+import collections
+import csv
+import heapq
+import itertools
+import re
+import unicodedata
+from array import array
+from dataclasses import dataclass
+
+_PALABRA = re.compile(r"\w+")
+# Mayor que cualquier carácter de una palabra: prefijo + _ULTIMO acota el rango de bisect
+_ULTIMO = "\U0010ffff"
+# Cuántas veces más caro es verificar un candidato que pasar un ID por un set
+_COSTO_VERIFICAR = 200
+
+
+def normalizar(texto):
+    """
+    Pasa a minúsculas y quita los acentos: 'Gómez' y 'gomez' son la misma palabra.
+    """
+    texto = str(texto).lower()
+    if texto.isascii():
+        return texto
+    texto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+def palabras(texto):
+    return _PALABRA.findall(normalizar(texto))
+
+
+def palabras_paciente(paciente):
+    # Validaciones solo acepta letras en nombre y apellido, así que alcanza con separar por espacios
+    return normalizar(f"{paciente.nombre} {paciente.apellido}").split()
+
+
+def trigramas(palabra):
+    """
+    Trigramas de la palabra con dos espacios al principio y uno al final,
+    para que el comienzo de la palabra pese más que el resto.
+    """
+    relleno = f"  {palabra} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+def similitud(a, b):
+    """
+    Coeficiente de Dice entre los trigramas de dos textos, de 0 a 1.
+    """
+    trigramas_a, trigramas_b = trigramas(a), trigramas(b)
+    return 2 * len(trigramas_a & trigramas_b) / (len(trigramas_a) + len(trigramas_b))
+
+
+@dataclass(frozen=True)
+class GrupoDuplicados:
+    """
+    Pacientes que podrían ser la misma persona con distinto DNI.
+
+    nombres son los nombres completos normalizados del grupo y similitud la
+    menor entre los pares que los unieron (1.0 si todos se llaman igual).
+    """
+    nombres: tuple
+    ids: tuple
+    similitud: float
+
+
+class IndiceBusqueda:
+    def __init__(self, obtener_paciente):
+        """
+        Args:
+            obtener_paciente (callable): Devuelve el paciente de un id, o None si fue dado de baja.
+        """
+        self._obtener_paciente = obtener_paciente
+        self.reiniciar()
+
+    def reiniciar(self, fuente=None):
+        """
+        Vacía el índice.
+
+        Args:
+            fuente (iterable): Pacientes a indexar recién en la primera consulta,
+                por ejemplo una colección respaldada por un snapshot o una base.
+        """
+        # {palabra: array de IDs en orden de alta}
+        self._ids_por_palabra = {}
+        self._vocabulario = []
+        # {trigrama: set de palabras} y {palabra: cantidad de trigramas}
+        self._palabras_por_trigrama = collections.defaultdict(set)
+        self._cantidad_trigramas = {}
+        self._fuente = fuente
+        self._pendientes = []
+        self._cantidad = 0
+
+    def agregar(self, paciente):
+        """
+        Encola el paciente; se indexa en la próxima consulta, así que las
+        cargas masivas pagan solo un append por paciente.
+        """
+        self._pendientes.append(paciente)
+
+    def _fusionar(self):
+        if self._fuente is None and not self._pendientes:
+            return
+        nuevas = []
+        if self._fuente is not None:
+            # La fuente ya puede contener las altas posteriores a reiniciar()
+            ids_pendientes = {paciente.id for paciente in self._pendientes}
+            for paciente in self._fuente:
+                if paciente.id not in ids_pendientes:
+                    self._indexar(paciente, nuevas)
+            self._fuente = None
+        for paciente in self._pendientes:
+            self._indexar(paciente, nuevas)
+        self._pendientes = []
+        if nuevas:
+            # El vocabulario ya está ordenado: sort fusiona las dos corridas en tiempo lineal
+            nuevas.sort()
+            self._vocabulario.extend(nuevas)
+            self._vocabulario.sort()
+
+    def _indexar(self, paciente, nuevas):
+        for palabra in set(palabras_paciente(paciente)):
+            ids = self._ids_por_palabra.get(palabra)
+            if ids is None:
+                ids = self._ids_por_palabra[palabra] = array('I')
+                nuevas.append(palabra)
+                propios = trigramas(palabra)
+                self._cantidad_trigramas[palabra] = len(propios)
+                for trigrama in propios:
+                    self._palabras_por_trigrama[trigrama].add(palabra)
+            ids.append(paciente.id)
+        self._cantidad += 1
+
+    def _con_prefijo(self, prefijo):
+        inicio = bisect.bisect_left(self._vocabulario, prefijo)
+        return self._vocabulario[inicio:bisect.bisect_left(self._vocabulario, prefijo + _ULTIMO, inicio)]
+
+    def _similares(self, palabra, umbral):
+        """
+        Devuelve {palabra del vocabulario: similitud} con similitud >= umbral.
+        """
+        propios = trigramas(palabra)
+        comunes = collections.Counter()
+        for trigrama in propios:
+            comunes.update(self._palabras_por_trigrama.get(trigrama, ()))
+        # Dice >= umbral exige compartir al menos umbral * |propios| / (2 - umbral) trigramas:
+        # ese filtro descarta casi todo sin calcular la similitud
+        minimo = umbral * len(propios) / (2 - umbral)
+        cantidad_propios = len(propios)
+        resultado = {}
+        for candidata, cantidad in comunes.items():
+            if cantidad >= minimo:
+                valor = 2 * cantidad / (cantidad_propios + self._cantidad_trigramas[candidata])
+                if valor >= umbral:
+                    resultado[candidata] = valor
+        return resultado
+
+    def _ids_de(self, palabras_elegidas):
+        return itertools.chain.from_iterable(self._ids_por_palabra[palabra] for palabra in palabras_elegidas)
+
+    def _recorrer(self, palabras_eje, permitidos=None):
+        """
+        Recorre sin repetir los pacientes vigentes de las palabras indicadas,
+        y si se indica, solo los de IDs en `permitidos`.
+        """
+        vistos = set()
+        for palabra in palabras_eje:
+            for id_paciente in self._ids_por_palabra[palabra]:
+                if id_paciente in vistos or (permitidos is not None and id_paciente not in permitidos):
+                    continue
+                vistos.add(id_paciente)
+                paciente = self._obtener_paciente(id_paciente)
+                if paciente is not None:
+                    yield palabra, paciente
+
+    def buscar(self, texto, limite=20):
+        """
+        Busca los pacientes en los que cada palabra del texto es prefijo de su
+        nombre o su apellido: 'uri gui' encuentra a Uriel Guillen.
+
+        Hay dos estrategias y se elige la más barata según cuántos IDs tiene
+        cada prefijo: intersecar los IDs de todos los prefijos (cuesta el total
+        de IDs, a velocidad de set) o recorrer los de la palabra más selectiva
+        verificando las demás en cada candidato (cuesta los candidatos que hay
+        que mirar hasta juntar `limite`, que con prefijos que suelen aparecer
+        juntos son pocos aunque el registro sea enorme).
+
+        Returns:
+            list: Hasta `limite` pacientes, ordenados por ID.
+        """
+        buscadas = palabras(texto)
+        if not buscadas:
+            return []
+        self._fusionar()
+        rangos = [self._con_prefijo(prefijo) for prefijo in buscadas]
+        costos = [sum(len(self._ids_por_palabra[palabra]) for palabra in rango) for rango in rangos]
+        if not all(costos):
+            return []
+        eje = costos.index(min(costos))
+        # Proporción esperada de candidatos que cumplen con el resto de los prefijos, suponiéndolos independientes
+        proporcion = 1.0
+        for posicion, costo in enumerate(costos):
+            if posicion != eje:
+                proporcion *= min(1.0, costo / self._cantidad)
+        a_verificar = min(costos[eje], limite / proporcion)
+        if a_verificar * _COSTO_VERIFICAR > sum(costos):
+            ids = None
+            for posicion in sorted(range(len(rangos)), key=costos.__getitem__):
+                ids = set(self._ids_de(rangos[posicion])) if ids is None else ids.intersection(
+                    self._ids_de(rangos[posicion]))
+            encontrados = (self._obtener_paciente(id_paciente) for id_paciente in sorted(ids))
+            return list(itertools.islice(filter(None, encontrados), limite))
+        resto = buscadas[:eje] + buscadas[eje + 1:]
+        resultado = []
+        for _, paciente in self._recorrer(rangos[eje]):
+            if resto:
+                propias = palabras_paciente(paciente)
+                if not all(any(propia.startswith(prefijo) for propia in propias) for prefijo in resto):
+                    continue
+            resultado.append(paciente)
+            if len(resultado) >= limite:
+                break
+        resultado.sort(key=lambda paciente: paciente.id)
+        return resultado
+
+    def similares(self, texto, umbral=0.5, limite=20):
+        """
+        Busca pacientes con nombre y apellido parecidos al texto aunque tengan
+        errores de tipeo. El puntaje de un paciente es el promedio, por cada
+        palabra buscada, de la mejor similitud de trigramas con sus palabras.
+
+        Con varias palabras primero se intersecan los IDs de las palabras
+        parecidas a cada una, así solo se puntúan los pacientes que tienen
+        algo parecido a todas. Los candidatos se recorren desde la palabra
+        buscada con menos pacientes, de más a menos parecido, y se corta cuando
+        ningún candidato restante puede superar a los que ya se encontraron.
+
+        Returns:
+            list: Hasta `limite` tuplas (paciente, puntaje), de mayor a menor puntaje.
+        """
+        buscadas = palabras(texto)
+        if not buscadas:
+            return []
+        self._fusionar()
+        parecidas = [self._similares(palabra, umbral) for palabra in buscadas]
+        costos = [sum(len(self._ids_por_palabra[palabra]) for palabra in grupo) for grupo in parecidas]
+        if not all(costos):
+            return []
+        eje = costos.index(min(costos))
+        permitidos = None
+        for posicion in sorted(range(len(parecidas)), key=costos.__getitem__)[1:]:
+            if permitidos is None:
+                permitidos = set(self._ids_de(parecidas[eje]))
+            permitidos.intersection_update(self._ids_de(parecidas[posicion]))
+        orden = sorted(parecidas[eje], key=parecidas[eje].get, reverse=True)
+        cantidad = len(buscadas)
+        mejores = []  # heap de (puntaje, -id, paciente) con los `limite` mejores
+        for palabra, paciente in self._recorrer(orden, permitidos):
+            cota = (parecidas[eje][palabra] + cantidad - 1) / cantidad
+            if len(mejores) >= limite and mejores[0][0] >= cota:
+                break
+            propias = palabras_paciente(paciente)
+            puntajes = [max((grupo.get(propia, 0.0) for propia in propias), default=0.0) for grupo in parecidas]
+            if not all(puntajes):
+                continue
+            entrada = (sum(puntajes) / cantidad, -paciente.id, paciente)
+            if len(mejores) < limite:
+                heapq.heappush(mejores, entrada)
+            elif entrada[:2] > mejores[0][:2]:
+                heapq.heapreplace(mejores, entrada)
+        return [(paciente, puntaje) for puntaje, _, paciente in sorted(mejores, reverse=True)]
+
+
+def candidatos_duplicados(pacientes, umbral=0.7, ventana=8):
+    """
+    Agrupa los pacientes cuyos nombres completos son iguales o parecidos.
+
+    Se comparan nombres completos distintos y no pacientes: primero se agrupan
+    los que normalizados se llaman igual (sin importar el orden de nombre y
+    apellido) y después se unen los grupos cuyos nombres superan `umbral` de
+    similitud. Para no comparar todos contra todos se usa vecindario ordenado:
+    cada nombre se compara con los `ventana` siguientes en orden alfabético y
+    en orden alfabético del texto invertido, así un error de tipeo al
+    principio o al final del nombre no separa a los parecidos. El costo es
+    lineal en la cantidad de nombres distintos.
+
+    Args:
+        pacientes (iterable): Pacientes a revisar.
+        umbral (float): Similitud mínima entre dos nombres completos.
+        ventana (int): Cantidad de vecinos con los que se compara cada nombre.
+
+    Returns:
+        list: GrupoDuplicados con al menos dos pacientes, de mayor a menor similitud.
+    """
+    ids_por_nombre = collections.defaultdict(list)
+    for paciente in pacientes:
+        ids_por_nombre[" ".join(sorted(palabras_paciente(paciente)))].append(paciente.id)
+
+    padre = {nombre: nombre for nombre in ids_por_nombre}
+    minima = dict.fromkeys(ids_por_nombre, 1.0)
+
+    def raiz(nombre):
+        while padre[nombre] != nombre:
+            padre[nombre] = padre[padre[nombre]]
+            nombre = padre[nombre]
+        return nombre
+
+    for clave in (None, lambda nombre: nombre[::-1]):
+        vecinos = collections.deque(maxlen=ventana)
+        for nombre in sorted(ids_por_nombre, key=clave):
+            propios = trigramas(nombre)
+            for otro, otros in vecinos:
+                valor = 2 * len(propios & otros) / (len(propios) + len(otros))
+                if valor >= umbral:
+                    a, b = raiz(otro), raiz(nombre)
+                    if a != b:
+                        padre[b] = a
+                        minima[a] = min(minima[a], minima[b], valor)
+            vecinos.append((nombre, propios))
+
+    grupos = collections.defaultdict(list)
+    for nombre in ids_por_nombre:
+        grupos[raiz(nombre)].append(nombre)
+    resultado = []
+    for cabeza, nombres in grupos.items():
+        ids = tuple(sorted(id_paciente for nombre in nombres for id_paciente in ids_por_nombre[nombre]))
+        if len(ids) > 1:
+            resultado.append(GrupoDuplicados(tuple(nombres), ids, round(minima[cabeza], 3)))
+    resultado.sort(key=lambda grupo: (-grupo.similitud, -len(grupo.ids), grupo.ids[0]))
+    return resultado
+
+
+def exportar_duplicados_csv(grupos, ruta):
+    """
+    Escribe una fila por paciente con el número de grupo al que pertenece.
+    """
+    with open(ruta, 'w', newline='') as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(["grupo", "similitud", "id_paciente", "nombres"])
+        for numero, grupo in enumerate(grupos, 1):
+            for id_paciente in grupo.ids:
+                escritor.writerow([numero, grupo.similitud, id_paciente, " | ".join(grupo.nombres)])
+
+
+def main():
+    from clinica import Clinica
+
+    parser = argparse.ArgumentParser(description="Búsqueda de pacientes y reporte de posibles duplicados.")
+    parser.add_argument("archivo_config")
+    parser.add_argument("--buscar", help="Prefijos de nombre y apellido.")
+    parser.add_argument("--similares", help="Nombre aproximado.")
+    parser.add_argument("--duplicados", nargs="?", const="-", help="Ruta del CSV, o nada para imprimirlos.")
+    parser.add_argument("--umbral", type=float, default=None)
+    parser.add_argument("--limite", type=int, default=20)
+    args = parser.parse_args()
+
+    clinica = Clinica("Búsqueda")
+    clinica.leer_configuracion(args.archivo_config, incremental=True)
+    if args.buscar:
+        for paciente in clinica.buscar_pacientes(args.buscar, args.limite):
+            print(f"{paciente.id:>8}  {paciente.apellido}, {paciente.nombre}  DNI {paciente.dni}")
+    if args.similares:
+        umbral = 0.5 if args.umbral is None else args.umbral
+        for paciente, puntaje in clinica.pacientes_similares(args.similares, umbral, args.limite):
+            print(f"{paciente.id:>8}  {paciente.apellido}, {paciente.nombre}  DNI {paciente.dni}  ({puntaje:.2f})")
+    if args.duplicados:
+        grupos = clinica.candidatos_duplicados(0.7 if args.umbral is None else args.umbral)
+        if args.duplicados == "-":
+            for grupo in grupos:
+                print(f"{grupo.similitud:.2f}  {' | '.join(grupo.nombres)}: IDs {', '.join(map(str, grupo.ids))}")
+        else:
+            exportar_duplicados_csv(grupos, args.duplicados)
+        print(f"{len(grupos)} grupos de posibles duplicados.")
+
+
+if __name__ == "__main__":
+    main()
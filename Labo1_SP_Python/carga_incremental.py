@@ -0,0 +1,150 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import re
+
+_ESPACIOS = re.compile(r'[ \t\n\r]*')
+_RESTO_NUMERO = re.compile(r'[0-9.eE+\-]*')
+
+
+class _LectorIncremental:
+    """
+    Lector de JSON por bloques. Mantiene en memoria solo el bloque actual y
+    decodifica un valor a la vez con JSONDecoder.raw_decode.
+    """
+
+    def __init__(self, archivo, tamanio_bloque):
+        self._archivo = archivo
+        self._tamanio_bloque = tamanio_bloque
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _leer_mas(self):
+        bloque = self._archivo.read(self._tamanio_bloque)
+        if not bloque:
+            self._eof = True
+            return
+        self._buffer = self._buffer[self._pos:] + bloque
+        self._pos = 0
+
+    def _caracter(self):
+        """
+        Devuelve el próximo carácter significativo sin consumirlo.
+        """
+        while True:
+            self._pos = _ESPACIOS.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._eof:
+                raise json.JSONDecodeError("Fin de archivo inesperado", self._buffer, self._pos)
+            self._leer_mas()
+
+    def _esperar(self, caracter):
+        if self._caracter() != caracter:
+            raise json.JSONDecodeError(f"Se esperaba '{caracter}'", self._buffer, self._pos)
+        self._pos += 1
+
+    def valor(self):
+        """
+        Decodifica el próximo valor completo, leyendo más bloques si hace falta.
+        """
+        self._caracter()
+        while True:
+            try:
+                valor, fin = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._leer_mas()
+                continue
+            # Un número al final del bloque puede continuar en el bloque siguiente
+            if (not self._eof and isinstance(valor, (int, float))
+                    and _RESTO_NUMERO.fullmatch(self._buffer, fin)):
+                self._leer_mas()
+                continue
+            self._pos = fin
+            return valor
+
+    def elementos(self):
+        """
+        Recorre un arreglo JSON devolviendo sus elementos de a uno.
+        """
+        self._esperar('[')
+        if self._caracter() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self.valor()
+            caracter = self._caracter()
+            self._pos += 1
+            if caracter == ']':
+                return
+            if caracter != ',':
+                raise json.JSONDecodeError("Se esperaba ',' o ']'", self._buffer, self._pos - 1)
+
+    def pares(self, claves_en_streaming):
+        """
+        Recorre el objeto JSON raíz devolviendo pares (clave, valor). Los
+        arreglos de las claves indicadas se devuelven elemento por elemento.
+        """
+        self._esperar('{')
+        if self._caracter() == '}':
+            return
+        while True:
+            clave = self.valor()
+            self._esperar(':')
+            if clave in claves_en_streaming and self._caracter() == '[':
+                for elemento in self.elementos():
+                    yield clave, elemento
+            else:
+                yield clave, self.valor()
+            caracter = self._caracter()
+            self._pos += 1
+            if caracter == '}':
+                return
+            if caracter != ',':
+                raise json.JSONDecodeError("Se esperaba ',' o '}'", self._buffer, self._pos - 1)
+
+
+def iterar_configuracion(archivo_config, claves_en_streaming=('lista_pacientes', 'lista_turnos'),
+                         tamanio_bloque=1 << 16):
+    """
+    Lee un archivo de configuración de la clínica sin cargarlo entero en memoria.
+
+    Args:
+        archivo_config (str): Ruta del archivo JSON.
+        claves_en_streaming (tuple): Claves cuyos arreglos se recorren elemento por elemento.
+        tamanio_bloque (int): Cantidad de caracteres leídos por bloque.
+
+    Yields:
+        tuple: (clave, valor). Para las claves en streaming se devuelve un par
+        por cada elemento del arreglo.
+
+    Raises:
+        FileNotFoundError: Si el archivo no existe.
+        json.JSONDecodeError: Si el archivo no es un objeto JSON válido.
+    """
+    with open(archivo_config, 'r') as file:
+        yield from _LectorIncremental(file, tamanio_bloque).pares(claves_en_streaming)
@@ -20,215 +20,1191 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import bisect
+import functools
+import heapq
 import itertools
 import json
-import os
+import sys
+import threading
+import time
+from datetime import date
+from busqueda import IndiceBusqueda, candidatos_duplicados
+from carga_incremental import iterar_configuracion
+from consultas import IndiceTurnos
+from cubo import DIA_DESCONOCIDO, DIMENSIONES, CuboIngresos
+import historico
+from errores import CajaConPendientes, PacienteDuplicado, PacienteNoEncontrado
+from guardado import Autoguardado, Guardado, GuardadorSegundoPlano
+from journal import Journal, escribir_json_atomico
+import metricas
 from paciente import Paciente
+from planificador import LLEGADA, PlanificadorAtencion
+from snapshot_binario import IndicePerezoso, ListaRespaldada, SnapshotBinario, escribir_snapshot
+from tablas import LINEAS_POR_BLOQUE, Columna, Paginador, Tabla
 from turno import Turno
 from validaciones import Validaciones
 
+
+TABLA_TURNOS = Tabla((Columna("ID", 4), Columna("Paciente", 20), Columna("Obra Social", 20),
+                      Columna("Especialidad", 20), Columna("Monto a Pagar", 21), Columna("Estado", 20)))
+
+
+def _sincronizado(*locks):
+    """
+    En modo concurrente ejecuta el método con los locks indicados tomados.
+    Para no generar deadlocks se toman siempre en el orden pacientes,
+    turnos, journal.
+
+    Con el autoguardado activo, al terminar la operación más externa (sin
+    locks tomados por el hilo) revisa si corresponde tomar una copia.
+    """
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envoltura(self, *args, **kwargs):
+            if not self._concurrente:
+                if self._autoguardado is None:
+                    return metodo(self, *args, **kwargs)
+                self._profundidad += 1
+                try:
+                    return metodo(self, *args, **kwargs)
+                finally:
+                    self._profundidad -= 1
+                    if not self._profundidad and self._autoguardado is not None:
+                        self._autoguardado.revisar()
+            hilo = self._hilo
+            hilo.profundidad = getattr(hilo, 'profundidad', 0) + 1
+            tomados = [getattr(self, nombre) for nombre in locks]
+            for lock in tomados:
+                lock.acquire()
+            try:
+                return metodo(self, *args, **kwargs)
+            finally:
+                for lock in reversed(tomados):
+                    lock.release()
+                hilo.profundidad -= 1
+                if not hilo.profundidad and self._autoguardado is not None:
+                    self._autoguardado.revisar()
+        return envoltura
+    return decorador
+
+
 class Clinica:
-    def __init__(self, razon_social):
+    def __init__(self, razon_social, concurrente=False):
+        """
+        Args:
+            razon_social (str): Nombre de la clínica.
+            concurrente (bool): Si es True las operaciones se pueden llamar desde
+                varios hilos: el registro de pacientes y la máquina de estados de
+                los turnos tienen locks separados, así que un alta no frena un cobro.
+        """
         self.razon_social = razon_social
-        self.lista_pacientes = {}
+        self._concurrente = concurrente
+        self._lock_pacientes = threading.RLock()
+        self._lock_turnos = threading.RLock()
+        self._lock_journal = threading.Lock()
+        # Operaciones sincronizadas en curso, para autoguardar solo entre operaciones
+        self._hilo = threading.local()
+        self._profundidad = 0
+        self.lista_pacientes = []
         self.lista_turnos = {}
         self.especialidades = {}
         self.obras_sociales_validas = {}
+        self.tarifas = None
+        self._pacientes_por_id = {}
+        self._pacientes_por_dni = {}
+        self._busqueda = IndiceBusqueda(self.obtener_paciente_por_id)
+        self._politica_atencion = (LLEGADA, None)
+        self._reiniciar_turnos()
         self.recaudacion = 0.0
         self.hay_pacientes_sin_atencion = False
+        self._journal = None
+        self._journal_seq = 0
+        self._snapshot = None
+        self._almacenamiento = None
+        self._guardador = GuardadorSegundoPlano()
+        self._autoguardado = None
+        # Mutaciones registradas y cuántas había en la última copia guardada
+        self._version = 0
+        self._version_guardada = 0
     
-    def cargar_configuracion(self, archivo_config):
+    def cargar_configuracion(self, archivo_config, incremental=False):
         """
         Carga la configuración inicial de la clínica desde un archivo JSON.
 
         Args:
             archivo (str): Ruta del archivo JSON con la configuración.
+            incremental (bool): Si es True recorre el archivo elemento por elemento
+                en lugar de parsearlo entero, con memoria acotada al bloque leído.
         """
         try:
-            with open(archivo_config, 'r') as file:
-                config = json.load(file)
-                self.especialidades = config.get('especialidades', [])
-                self.obras_sociales_validas = config.get('obras_sociales', [])
-                # Cargar lista de pacientes
-            pacientes_data = config.get('lista_pacientes', [])
-            self.lista_pacientes = []
-            max_id = 0  # Variable para almacenar el máximo ID encontrado
-            
-            for paciente_data in pacientes_data:
-                paciente = Paciente(paciente_data.get('nombre'),
-                                    paciente_data.get('apellido'),
-                                    paciente_data.get('dni'),
-                                    paciente_data.get('edad'),
-                                    paciente_data.get('obra_social'))
-                self.lista_pacientes.append(paciente)
-                if paciente.id > max_id:
-                    max_id = paciente.id  # Actualizar máximo ID encontrado
-            
-            # Actualizar el contador de ID en la clase Paciente
-            Paciente.id_counter = itertools.count(max_id + 1)
-            
-            # Cargar lista de turnos
-            turnos_data = config.get('lista_turnos', [])
-            self.lista_turnos = []
-            for turno_data in turnos_data:
-                turno = Turno(turno_data.get('id_paciente'),
-                              turno_data.get('especialidad'),
-                              turno_data.get('monto_a_pagar'),
-                              turno_data.get('estado'))
-                self.lista_turnos.append(turno)
-                
+            self.leer_configuracion(archivo_config, incremental)
         except FileNotFoundError:
             print(f"El archivo {archivo_config} no se encontró.")
         except json.JSONDecodeError:
             print(f"Error al decodificar el archivo {archivo_config}.")
 
+    @metricas.medir("cargar_configuracion")
+    def leer_configuracion(self, archivo_config, incremental=False):
+        """
+        Igual que cargar_configuracion pero sin imprimir: propaga los errores.
+
+        Raises:
+            FileNotFoundError: Si el archivo no existe.
+            json.JSONDecodeError: Si el archivo no es JSON válido.
+        """
+        if incremental:
+            self._cargar_elementos(metricas.medir_iterador("json_io_cargar", iterar_configuracion(archivo_config)))
+        else:
+            with metricas.tramo("json_io_cargar"), open(archivo_config, 'r') as file:
+                config = json.load(file)
+            self._cargar_elementos(self._elementos_de(config))
+        metricas.contar("cargar_configuracion", len(self.lista_pacientes) + len(self.lista_turnos))
+
+    @staticmethod
+    def _elementos_de(config):
+        """
+        Recorre un config ya parseado con la misma forma que iterar_configuracion.
+        """
+        for clave, valor in config.items():
+            if clave in ('lista_pacientes', 'lista_turnos'):
+                for elemento in valor:
+                    yield clave, elemento
+            else:
+                yield clave, valor
+
+    def _cargar_elementos(self, elementos):
+        """
+        Construye pacientes y turnos a medida que se recorren los pares
+        (clave, valor) del archivo de configuración.
+        """
+        self.especialidades = []
+        self.obras_sociales_validas = []
+        self.tarifas = None
+        self.lista_pacientes = []
+        self._pacientes_por_id = {}
+        self._pacientes_por_dni = {}
+        self._busqueda.reiniciar()
+        self._reiniciar_turnos()
+        self._journal_seq = 0
+        max_id = 0  # Variable para almacenar el máximo ID encontrado
+        max_id_turno = -1
+        cubo_guardado = False
+        # Turnos que aparecen antes que los pacientes: se cargan al final para
+        # que los ingresos, las vistas y el cubo vean la obra social de cada uno
+        pacientes_leidos = False
+        turnos_demorados = []
+
+        for clave, valor in elementos:
+            if clave == 'lista_pacientes':
+                pacientes_leidos = True
+                paciente = self._cargar_paciente(valor)
+                if paciente.id > max_id:
+                    max_id = paciente.id  # Actualizar máximo ID encontrado
+            elif clave == 'lista_turnos':
+                if not pacientes_leidos:
+                    turnos_demorados.append(valor)
+                    continue
+                turno = self._cargar_turno(valor)
+                if turno.id > max_id_turno:
+                    max_id_turno = turno.id
+            elif clave == 'especialidades':
+                self.especialidades = valor
+            elif clave == 'obras_sociales':
+                self.obras_sociales_validas = valor
+            elif clave == 'tarifas':
+                self.tarifas = valor
+                Validaciones.configurar_tarifas(valor)
+            elif clave == 'journal_seq':
+                # Último evento del journal ya incluido en este snapshot
+                self._journal_seq = valor
+            elif clave == 'cubo_ingresos':
+                self._cubo.cargar_filas(valor)
+                cubo_guardado = True
+            elif clave == 'contador_turnos':
+                # Los turnos archivados ya no están en la lista pero sus IDs no se reusan
+                max_id_turno = max(max_id_turno, valor - 1)
+
+        for turno_data in turnos_demorados:
+            turno = self._cargar_turno(turno_data)
+            if turno.id > max_id_turno:
+                max_id_turno = turno.id
+
+        if not cubo_guardado:
+            # Archivo anterior al cubo: los pagados entran sin fecha de cobro
+            for turno in self._turnos_pagados:
+                self._registrar_en_cubo(turno, DIA_DESCONOCIDO)
+
+        # Actualizar el contador de ID en la clase Paciente
+        Paciente.id_counter = itertools.count(max_id + 1)
+        Turno.contador_id = max_id_turno + 1
+
+    def _cargar_paciente(self, paciente_data):
+        """
+        Crea un paciente a partir de su representación guardada y lo registra.
+        """
+        paciente = Paciente(paciente_data.get('nombre'),
+                            paciente_data.get('apellido'),
+                            paciente_data.get('dni'),
+                            paciente_data.get('edad'),
+                            paciente_data.get('obra_social'))
+        # Respetar el ID guardado para que los turnos sigan apuntando al paciente correcto
+        paciente.id = paciente_data.get('id', paciente.id)
+        if 'fecha_registro' in paciente_data:
+            paciente.fecha_registro = paciente_data['fecha_registro']
+        self.lista_pacientes.append(paciente)
+        self._indexar_paciente(paciente)
+        return paciente
+
+    def _cargar_turno(self, turno_data):
+        """
+        Crea un turno a partir de su representación guardada y lo registra.
+        """
+        turno = Turno(turno_data.get('id_paciente'),
+                      turno_data.get('especialidad'),
+                      turno_data.get('monto_a_pagar'),
+                      turno_data.get('estado'))
+        turno.id = turno_data.get('id', turno.id)
+        self._registrar_turno(turno)
+        return turno
+
+    @_sincronizado("_lock_pacientes", "_lock_turnos")
+    @metricas.medir("guardar_datos")
     def guardar_datos(self, archivo_config):
+        # Un guardado en segundo plano anterior no debe pisar a este
+        self._guardador.esperar()
+        captura = self._capturar()
+        with metricas.tramo("json_io_guardar"):
+            self._escribir_captura(captura, archivo_config)
+        metricas.contar("guardar_datos", len(captura["pacientes"]) + len(captura["turnos"]))
+
+    def _capturar(self):
+        """
+        Copia consistente y barata del estado a guardar: listas de referencias
+        y el estado de cada turno, que es lo único que cambia en un turno ya
+        creado. Se llama con los locks de pacientes y turnos tomados.
+        """
+        turnos = list(self.lista_turnos)
+        return {
+            "pacientes": list(self.lista_pacientes),
+            "turnos": turnos,
+            "estados": [t.estado for t in turnos],
+            "especialidades": list(self.especialidades),
+            "obras_sociales": list(self.obras_sociales_validas),
+            "tarifas": self.tarifas,
+            "journal_seq": self._journal_seq,
+            "cubo_ingresos": self._cubo.a_filas() if len(self._cubo) else None,
+            "contador_turnos": Turno.contador_id,
+        }
+
+    @staticmethod
+    def _escribir_captura(captura, archivo_config):
+        """
+        Serializa una copia tomada con _capturar. No usa el estado vivo de la
+        clínica, así que puede correr en otro hilo.
+        """
+        lista_turnos = []
+        for turno, estado in zip(captura["turnos"], captura["estados"]):
+            dato = turno.a_dict()
+            dato["estado"] = estado
+            lista_turnos.append(dato)
         datos = {
-            "lista_pacientes": [p.__dict__ for p in self.lista_pacientes],
-            "lista_turnos": [t.__dict__ for t in self.lista_turnos],
+            "lista_pacientes": [p.a_dict() for p in captura["pacientes"]],
+            "lista_turnos": lista_turnos,
+            "especialidades": captura["especialidades"],
+            "obras_sociales": captura["obras_sociales"]
+        }
+        if captura["tarifas"] is not None:
+            datos["tarifas"] = captura["tarifas"]
+        if captura["journal_seq"]:
+            datos["journal_seq"] = captura["journal_seq"]
+        if captura["cubo_ingresos"] is not None:
+            datos["cubo_ingresos"] = captura["cubo_ingresos"]
+        if captura["contador_turnos"] > max((t.id for t in captura["turnos"]), default=-1) + 1:
+            datos["contador_turnos"] = captura["contador_turnos"]
+        escribir_json_atomico(archivo_config, datos, indent=4)
+
+    @_sincronizado("_lock_pacientes", "_lock_turnos")
+    def guardar_en_segundo_plano(self, archivo_config, recaudacion=None):
+        """
+        Toma una copia del estado y la escribe en otro hilo con rename atómico,
+        así la operación que lo pide solo paga la copia.
+
+        Con el journal abierto, el archivo actual se rota a un segmento que se
+        borra cuando el snapshot termina de escribirse; si el proceso se corta
+        antes, el segmento se reproduce al abrir el journal. Mientras haya un
+        guardado fallido sin informar (ver tomar_error_de_guardado) los
+        segmentos no se borran.
+
+        Con un almacenamiento o un snapshot binario abiertos el guardado se hace
+        en el momento, porque sus colecciones leen del respaldo.
+
+        Args:
+            archivo_config (str): Ruta del snapshot JSON.
+            recaudacion (float): Valor a informar en el handle.
+
+        Returns:
+            guardado.Guardado: Handle para esperar el final de la escritura.
+        """
+        guardado = Guardado(recaudacion)
+        if self._guarda_en_el_momento():
+            inicio = time.perf_counter()
+            self.compactar(archivo_config)
+            guardado._terminar(time.perf_counter() - inicio)
+            return guardado
+        with metricas.tramo("captura_guardado"):
+            captura = self._capturar()
+        self._version_guardada = self._version
+        ruta_journal = self._rotar_journal()
+
+        def escribir():
+            self._escribir_captura(captura, archivo_config)
+            if ruta_journal is not None and self._guardador.fallido is None:
+                Journal.descartar_segmentos(ruta_journal, captura["journal_seq"])
+
+        return self._guardador.encolar(escribir, guardado)
+
+    def _guarda_en_el_momento(self):
+        return self._almacenamiento is not None or self._snapshot is not None
+
+    @_sincronizado("_lock_journal")
+    def _rotar_journal(self):
+        """
+        Rota el journal si está abierto y devuelve su ruta.
+        """
+        if self._journal is None:
+            return None
+        self._journal.rotar(self._journal_seq)
+        if self.recaudacion:
+            # La recaudación de la caja abierta no forma parte del snapshot
+            self._journal_seq += 1
+            self._journal.registrar({"seq": self._journal_seq, "op": 'recaudacion', "total": self.recaudacion})
+        return self._journal.ruta
+
+    def esperar_guardados(self):
+        """
+        Espera a que terminen los guardados en segundo plano pendientes.
+        """
+        self._guardador.esperar()
+
+    def tomar_error_de_guardado(self):
+        """
+        Devuelve el error del último guardado en segundo plano que falló y lo
+        da por informado, o None si no hubo ninguno desde la última consulta.
+        """
+        guardado = self._guardador.tomar_fallo()
+        return None if guardado is None else guardado.error
+
+    def iniciar_autoguardado(self, archivo_config, intervalo=60.0):
+        """
+        Guarda en segundo plano, entre operaciones, cada `intervalo` segundos
+        si hubo cambios desde el último guardado.
+
+        Args:
+            archivo_config (str): Ruta del snapshot JSON.
+            intervalo (float): Segundos mínimos entre guardados.
+        """
+        def autoguardar():
+            if self._version == self._version_guardada:
+                return None
+            return self.guardar_en_segundo_plano(archivo_config)
+
+        self._autoguardado = Autoguardado(autoguardar, intervalo)
+
+    def detener_autoguardado(self):
+        self._autoguardado = None
+        self._guardador.esperar()
+
+    @metricas.medir("abrir_journal")
+    def abrir_journal(self, ruta_journal, lote=32):
+        """
+        Reproduce el journal sobre el snapshot ya cargado y lo deja abierto
+        para registrar las mutaciones siguientes.
+
+        Args:
+            ruta_journal (str): Ruta del archivo del journal.
+            lote (int): Cantidad de registros entre cada fsync.
+        """
+        max_id_paciente = max_id_turno = -1
+        for evento in Journal.leer(ruta_journal):
+            if evento['seq'] <= self._journal_seq:
+                continue
+            if self._almacenamiento is not None:
+                # Antes de aplicar: la base confirma al final de cada operación,
+                # así lo confirmado siempre lleva el seq que lo incluye
+                self._almacenamiento.marcar_journal(evento['seq'], self.recaudacion)
+            objeto = self._aplicar_evento(evento)
+            if evento['op'] == 'alta_paciente':
+                max_id_paciente = max(max_id_paciente, objeto.id)
+            elif evento['op'] == 'alta_turno':
+                max_id_turno = max(max_id_turno, objeto.id)
+            self._journal_seq = evento['seq']
+        if self._almacenamiento is not None:
+            self._almacenamiento.marcar_journal(self._journal_seq, self.recaudacion)
+
+        if max_id_paciente >= 0:
+            Paciente.id_counter = itertools.count(max(next(Paciente.id_counter), max_id_paciente + 1))
+        if max_id_turno >= 0:
+            Turno.contador_id = max(Turno.contador_id, max_id_turno + 1)
+        self._journal = Journal(ruta_journal, lote)
+
+    def _aplicar_evento(self, evento):
+        op = evento['op']
+        if op == 'alta_paciente':
+            return self._cargar_paciente(evento['paciente'])
+        if op == 'baja_paciente':
+            return self.eliminar_paciente(evento['id'])
+        if op == 'alta_turno':
+            return self._cargar_turno(evento['turno'])
+        if op == 'estado':
+            turno = self._turnos_por_id[evento['id']]
+            self.cambiar_estado_turno(turno, evento['estado'])
+            return turno
+        if op == 'cobro':
+            self.recaudacion += evento['monto']
+            turno = self._turnos_por_id.get(evento['id'])
+            if turno is not None:
+                self._registrar_en_cubo(turno, evento.get('dia', DIA_DESCONOCIDO))
+        elif op == 'recaudacion':
+            self.recaudacion = evento['total']
+        return None
+
+    @_sincronizado("_lock_journal")
+    def _registrar_evento(self, op, **datos):
+        """
+        Agrega la mutación al journal si está abierto y la pasa al almacenamiento.
+        """
+        self._version += 1
+        if self._journal is not None:
+            self._journal_seq += 1
+            self._journal.registrar({"seq": self._journal_seq, "op": op, **datos})
+        if self._almacenamiento is not None:
+            self._almacenamiento.registrar(op, datos, self._journal_seq if self._journal is not None else None)
+
+    @_sincronizado("_lock_pacientes", "_lock_turnos")
+    @metricas.medir("compactar")
+    def compactar(self, archivo_config):
+        """
+        Pliega el journal en un snapshot nuevo escrito con rename atómico y
+        luego vacía el journal. Si el proceso se corta entre ambos pasos, los
+        eventos ya incluidos se saltean al reproducir gracias a journal_seq.
+
+        Args:
+            archivo_config (str): Ruta del snapshot JSON.
+        """
+        if self._journal is None:
+            self._guardar(archivo_config)
+            return
+        self._journal.sincronizar()
+        self._guardar(archivo_config)
+        self._journal.truncar()
+        if self.recaudacion:
+            # La recaudación de la caja abierta no forma parte del snapshot
+            self._registrar_evento('recaudacion', total=self.recaudacion)
+
+    def cerrar_journal(self):
+        self._guardador.esperar()
+        if self._journal is not None:
+            self._journal.cerrar()
+            self._journal = None
+
+    def _guardar(self, archivo_config):
+        if self._almacenamiento is not None:
+            self._almacenamiento.guardar(self)
+        else:
+            self.guardar_datos(archivo_config)
+
+    @metricas.medir("abrir_almacenamiento")
+    def abrir_almacenamiento(self, almacenamiento):
+        """
+        Carga la clínica desde un almacenamiento de almacenamiento.py y lo deja
+        recibiendo las mutaciones. Desde ese momento compactar y cerrar_caja
+        guardan en él en lugar de en el archivo JSON que reciben.
+
+        Args:
+            almacenamiento: AlmacenamientoJSON o AlmacenamientoSQLite.
+        """
+        self.cerrar_almacenamiento()
+        almacenamiento.cargar(self)
+        self._almacenamiento = almacenamiento
+
+    def cerrar_almacenamiento(self):
+        if self._almacenamiento is not None:
+            self._almacenamiento.cerrar()
+            self._almacenamiento = None
+
+    @_sincronizado("_lock_pacientes", "_lock_turnos")
+    @metricas.medir("guardar_snapshot_binario")
+    def guardar_snapshot_binario(self, ruta):
+        """
+        Guarda el estado de la clínica en el formato binario de snapshot_binario,
+        incluidos los acumulados de ingresos para no recalcularlos al abrir.
+
+        Args:
+            ruta (str): Ruta del archivo binario.
+        """
+        metadatos = {
             "especialidades": self.especialidades,
-            "obras_sociales": self.obras_sociales_validas
+            "obras_sociales": self.obras_sociales_validas,
+            "tarifas": self.tarifas,
+            "journal_seq": self._journal_seq,
+            "ingresos_por_obra_social": list(self._ingresos_por_obra_social.items()),
+            "ingresos_por_especialidad": list(self._ingresos_por_especialidad.items()),
+            "max_id_paciente": max((p.id for p in self.lista_pacientes), default=0),
+            "max_id_turno": Turno.contador_id - 1,
+            "cubo_ingresos": self._cubo.a_filas(),
         }
-        with open(archivo_config, 'w') as file:
-            json.dump(datos, file, indent=4)
-
-    def agregar_paciente(self):
-        """
-        Función para dar de alta un paciente en la clínica.
-
-        Args:
-            clinica (Clinica): Instancia de la clínica.
-        """
-        nombre = input("Nombre: ")
-        apellido = input("Apellido: ")
-        while not Validaciones.validar_nombre_apellido(nombre, apellido):
-            nombre = input("Error: Nombre o apellido no válidos. Deben contener solo caracteres alfabéticos y no exceder los 30 caracteres.")
-            apellido = input("Error: Nombre o apellido no válidos. Deben contener solo caracteres alfabéticos y no exceder los 30 caracteres.")
-            pass
-        dni = input("DNI: ")
-        edad = input("Edad: ")
-        while not Validaciones.validar_edad(edad):
-            edad = input("Edad: ")
-            pass
-        obra_social = input("Obra social:(Swiss Medical, Apres, PAMI, Particular)")
-            
-        while not Validaciones.validar_obra_social(obra_social, edad, self.obras_sociales_validas):
-            obra_social = input("Error: Obra social no válida.")
-            pass
-        paciente = Paciente(nombre.strip(), apellido.strip(), dni.strip(), edad, obra_social.strip())    
-        for p in self.lista_pacientes:
-            if p.dni == paciente.dni:
-                print("Error: Ya existe un paciente con ese DNI.")
-                return
+        escribir_snapshot(ruta, self.lista_pacientes, list(self.lista_turnos), self._planificador,
+                          self._turnos_finalizados.values(), self._turnos_pagados, metadatos)
+
+    @metricas.medir("abrir_snapshot_binario")
+    def abrir_snapshot_binario(self, ruta):
+        """
+        Abre un snapshot binario en lugar de cargar configs.json. Solo se
+        decodifican de entrada los turnos activos y finalizados; pacientes y
+        turnos pagados se leen del archivo mapeado cuando se consultan.
+
+        Args:
+            ruta (str): Ruta del archivo binario.
+
+        Raises:
+            FileNotFoundError: Si el archivo no existe.
+            ValueError: Si el archivo no es un snapshot binario válido.
+        """
+        snapshot = SnapshotBinario(ruta)
+        pacientes = ListaRespaldada(snapshot.cantidad_pacientes, snapshot.paciente)
+        turnos = ListaRespaldada(snapshot.cantidad_turnos, snapshot.turno)
+
+        def paciente_en(posicion):
+            return None if posicion is None else pacientes.objeto(posicion)
+
+        def turno_en(posicion):
+            return None if posicion is None else turnos.objeto(posicion)
+
+        pagados = snapshot.posiciones("pagados")
+        self.montar_respaldo(
+            snapshot.metadatos, pacientes,
+            IndicePerezoso(lambda id_: paciente_en(snapshot.posicion_paciente_por_id(id_))),
+            IndicePerezoso(lambda dni: paciente_en(snapshot.posicion_paciente_por_dni(dni))),
+            turnos,
+            IndicePerezoso(lambda id_: turno_en(snapshot.posicion_turno_por_id(id_))),
+            # Los turnos abiertos son pocos y se recorren seguido: se decodifican ya
+            (turnos.objeto(posicion) for estado in ("activos", "finalizados")
+             for posicion in snapshot.posiciones(estado)),
+            ListaRespaldada(len(pagados), lambda k: turnos.objeto(pagados[k])))
+        self._snapshot = snapshot
+
+    def montar_respaldo(self, configuracion, pacientes, pacientes_por_id, pacientes_por_dni, turnos,
+                        turnos_por_id, abiertos, pagados):
+        """
+        Reemplaza el estado en memoria por colecciones que leen de un respaldo
+        (snapshot binario o base SQLite) a medida que se consultan.
+
+        Args:
+            configuracion (dict): especialidades, obras_sociales, tarifas, journal_seq,
+                ingresos_por_obra_social e ingresos_por_especialidad (como pares),
+                max_id_paciente / max_id_turno y opcionalmente cubo_ingresos.
+            pacientes, turnos: Colecciones con iteración, len, append y remove.
+            pacientes_por_id, pacientes_por_dni, turnos_por_id: Índices con get, in, [] y pop.
+            abiertos (iterable): Turnos activos y finalizados, que quedan en memoria.
+            pagados: Colección de turnos pagados.
+        """
+        self.especialidades = configuracion["especialidades"]
+        self.obras_sociales_validas = configuracion["obras_sociales"]
+        self.tarifas = configuracion["tarifas"]
+        if self.tarifas is not None:
+            Validaciones.configurar_tarifas(self.tarifas)
+        self._journal_seq = configuracion["journal_seq"]
+
+        self.lista_pacientes = pacientes
+        self._pacientes_por_id = pacientes_por_id
+        self._pacientes_por_dni = pacientes_por_dni
+        # El índice de búsqueda se arma recién en la primera consulta para no decodificar todo al abrir
+        self._busqueda.reiniciar(pacientes)
+        self._reiniciar_turnos()
+        self.lista_turnos = turnos
+        self._turnos_por_id = turnos_por_id
+        for turno in abiertos:
+            self._ubicar_por_estado(turno)
+        self._turnos_pagados = pagados
+
+        self._ingresos_por_obra_social = dict(configuracion["ingresos_por_obra_social"])
+        self._ingresos_por_especialidad = dict(configuracion["ingresos_por_especialidad"])
+        self._orden_obra_social = {os_: orden for orden, os_ in enumerate(self._ingresos_por_obra_social)}
+        self._heap_ingresos = [(total, self._orden_obra_social[os_], os_)
+                               for os_, total in self._ingresos_por_obra_social.items()]
+        heapq.heapify(self._heap_ingresos)
+
+        self._cubo.cargar_filas(configuracion.get("cubo_ingresos", []))
+        Paciente.id_counter = itertools.count(configuracion["max_id_paciente"] + 1)
+        Turno.contador_id = configuracion["max_id_turno"] + 1
+
+    @_sincronizado("_lock_pacientes")
+    @metricas.medir("agregar_paciente")
+    def agregar_paciente(self, paciente):
+        """
+        Da de alta un paciente en la clínica.
+
+        Args:
+            paciente (Paciente): Paciente ya validado.
+
+        Raises:
+            PacienteDuplicado: Si ya existe un paciente con ese DNI.
+
+        Returns:
+            Paciente: El paciente agregado.
+        """
+        if self.obtener_paciente_por_dni(paciente.dni):
+            raise PacienteDuplicado("Ya existe un paciente con ese DNI.")
         self.lista_pacientes.append(paciente)
-        print(f"Paciente {paciente.nombre} {paciente.apellido} agregado con éxito.")
+        self._indexar_paciente(paciente)
+        self._registrar_evento('alta_paciente', paciente=paciente.a_dict())
+        return paciente
 
+    @_sincronizado("_lock_pacientes", "_lock_turnos")
+    @metricas.medir("agregar_turno")
     def agregar_turno(self, turno):
         """
         Asigna un turno a un paciente existente.
 
         Args:
-            id_paciente (int): ID del paciente.
-            especialidad (str): Especialidad del turno.
-            ValueError: Si el paciente o la especialidad no son válidos.
+            turno (Turno): Turno con el ID del paciente, la especialidad y el monto.
+
+        Raises:
+            PacienteNoEncontrado: Si no existe un paciente con ese ID.
 
         Returns:
             Turno: El turno asignado.
         """
-        if any(p.id == turno.id_paciente for p in self.lista_pacientes):
-            self.lista_turnos.append(turno)
-            print(f"Turno para paciente con ID {turno.id_paciente} agregado con éxito.")
-        else:
-            print("Error: No existe un paciente con ese ID.")
+        if turno.id_paciente not in self._pacientes_por_id:
+            raise PacienteNoEncontrado("No existe un paciente con ese ID.")
+        self._registrar_turno(turno)
+        self._registrar_evento('alta_turno', turno=turno.a_dict())
+        return turno
+
+    def _reiniciar_turnos(self):
+        """
+        Vacía la lista de turnos junto con las estructuras por estado y los
+        acumulados de ingresos que dependen de ella.
+        """
+        self.lista_turnos = []
+        self._turnos_por_id = {}
+        self._planificador = PlanificadorAtencion(*self._politica_atencion,
+                                                  obtener_paciente=self.obtener_paciente_por_id)
+        self._turnos_finalizados = {}
+        self._turnos_pagados = []
+        self._ingresos_por_obra_social = {}
+        self._ingresos_por_especialidad = {}
+        # Heap (total, orden de aparición, obra social) con entradas viejas que se descartan al consultar
+        self._heap_ingresos = []
+        self._orden_obra_social = {}
+        # Vistas ordenadas {criterio: (claves, turnos)}, se construyen al primer pedido
+        self._vistas_ordenadas = {}
+        # Ingresos por obra social × especialidad × día × franja etaria, alimentado por los cobros
+        self._cubo = CuboIngresos()
+        # Bitmaps por estado, especialidad y obra social y montos ordenados, se arman en la primera consulta
+        self._consultas = IndiceTurnos(lambda: self.lista_turnos, self.obtener_turno_por_id,
+                                       self.obtener_obra_social_paciente)
+
+    def _registrar_turno(self, turno):
+        self.lista_turnos.append(turno)
+        self._turnos_por_id[turno.id] = turno
+        self._ubicar_por_estado(turno)
+        self._insertar_en_vistas(turno)
+        self._consultas.agregar(turno)
+
+    def obtener_turno_por_id(self, id_turno):
+        return self._turnos_por_id.get(id_turno)
+
+    def _ubicar_por_estado(self, turno):
+        """
+        Coloca el turno en la estructura que corresponde a su estado:
+        planificador de activos, conjunto ordenado de finalizados o lista de pagados.
+        """
+        if turno.estado == Turno.ACTIVO:
+            self._planificador.encolar(turno)
+        elif turno.estado == Turno.FINALIZADO:
+            self._turnos_finalizados[turno.id] = turno
+        elif turno.estado == Turno.PAGADO:
+            self._turnos_pagados.append(turno)
+            self._acumular_ingreso(turno, turno.monto_a_pagar)
+
+    def _quitar_de_estado(self, turno):
+        if turno.estado == Turno.ACTIVO:
+            self._planificador.quitar(turno)
+        elif turno.estado == Turno.FINALIZADO:
+            del self._turnos_finalizados[turno.id]
+        elif turno.estado == Turno.PAGADO:
+            self._turnos_pagados.remove(turno)
+            self._acumular_ingreso(turno, -turno.monto_a_pagar)
+
+    def _acumular_ingreso(self, turno, monto):
+        """
+        Suma el monto a los totales por obra social y por especialidad y
+        actualiza el heap que sigue a la obra social con menos ingresos.
+        """
+        obra_social = self.obtener_obra_social_paciente(turno.id_paciente)
+        total = self._ingresos_por_obra_social.get(obra_social, 0) + monto
+        self._ingresos_por_obra_social[obra_social] = total
+        orden = self._orden_obra_social.setdefault(obra_social, len(self._orden_obra_social))
+        heapq.heappush(self._heap_ingresos, (total, orden, obra_social))
+        if len(self._heap_ingresos) > 2 * len(self._ingresos_por_obra_social) + 16:
+            self._heap_ingresos = [(t, self._orden_obra_social[os_], os_)
+                                   for os_, t in self._ingresos_por_obra_social.items()]
+            heapq.heapify(self._heap_ingresos)
+
+        especialidad = turno.especialidad
+        self._ingresos_por_especialidad[especialidad] = self._ingresos_por_especialidad.get(especialidad, 0) + monto
+
+    @_sincronizado("_lock_turnos")
+    def obra_social_menos_ingresos(self):
+        """
+        Devuelve la obra social con menos ingresos y su total, o None si no hay cobros.
+
+        Returns:
+            tuple: (obra_social, total) o None.
+        """
+        heap = self._heap_ingresos
+        while heap and self._ingresos_por_obra_social.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+        return (heap[0][2], heap[0][0]) if heap else None
+
+    @_sincronizado("_lock_turnos")
+    def ingresos_por_obra_social(self):
+        return dict(self._ingresos_por_obra_social)
+
+    @_sincronizado("_lock_turnos")
+    def ingresos_por_especialidad(self):
+        return dict(self._ingresos_por_especialidad)
+
+    def _registrar_en_cubo(self, turno, dia):
+        paciente = self._pacientes_por_id.get(turno.id_paciente)
+        if paciente is not None:
+            self._cubo.registrar(paciente.obra_social.lower(), turno.especialidad, dia, paciente.edad,
+                                 turno.monto_a_pagar)
+
+    @_sincronizado("_lock_turnos")
+    def consultar_ingresos(self, dimensiones=("obra_social",), **filtros):
+        """
+        Ingresos y cantidad de turnos cobrados agrupados por las dimensiones
+        pedidas de cubo.DIMENSIONES, con filtros opcionales (obra_social,
+        especialidad, franja, desde y hasta en días ISO).
+
+        Returns:
+            dict: {tupla de valores de las dimensiones: (monto, cantidad)}.
+        """
+        return self._cubo.consultar(dimensiones, **filtros)
+
+    @_sincronizado("_lock_turnos")
+    def exportar_ingresos_csv(self, ruta, dimensiones=DIMENSIONES, **filtros):
+        self._cubo.exportar_csv(ruta, dimensiones, **filtros)
+
+    @_sincronizado("_lock_turnos")
+    @metricas.medir("cambiar_estado_turno")
+    def cambiar_estado_turno(self, turno, nuevo_estado):
+        """
+        Único punto de cambio de estado de un turno. Mantiene sincronizadas
+        las estructuras por estado.
+
+        Args:
+            turno (Turno): Turno registrado en la clínica.
+            nuevo_estado (str): Uno de Turno.ESTADOS.
+
+        Raises:
+            ValueError: Si el estado no es válido.
+        """
+        if nuevo_estado not in Turno.ESTADOS:
+            raise ValueError(f"Estado de turno no válido: {nuevo_estado}")
+        self._quitar_de_estado(turno)
+        turno.estado = sys.intern(nuevo_estado)
+        self._ubicar_por_estado(turno)
+        self._consultas.cambiar_estado(turno)
+        self._registrar_evento('estado', id=turno.id, estado=nuevo_estado)
+
+    def _indexar_paciente(self, paciente):
+        """
+        Registra al paciente en los índices por ID y por DNI y en el de búsqueda.
+
+        Args:
+            paciente (Paciente): Paciente ya agregado a lista_pacientes.
+        """
+        self._pacientes_por_id[paciente.id] = paciente
+        self._pacientes_por_dni[paciente.dni] = paciente
+        self._busqueda.agregar(paciente)
+
+    @_sincronizado("_lock_pacientes")
+    def eliminar_paciente(self, id_paciente):
+        """
+        Da de baja un paciente de la clínica y de sus índices.
+
+        Args:
+            id_paciente (int): ID del paciente.
+
+        Returns:
+            Paciente: El paciente eliminado, o None si no existía.
+        """
+        paciente = self._pacientes_por_id.pop(id_paciente, None)
+        if paciente:
+            if self._pacientes_por_dni.get(paciente.dni) is paciente:
+                del self._pacientes_por_dni[paciente.dni]
+            self.lista_pacientes.remove(paciente)
+            self._registrar_evento('baja_paciente', id=id_paciente)
+        return paciente
 
     def obtener_obra_social_paciente(self, id_paciente):
-        paciente = next((p for p in self.lista_pacientes if p.id == id_paciente), None)
+        paciente = self._pacientes_por_id.get(id_paciente)
         return paciente.obra_social.lower() if paciente else ""
 
+    def _clave_orden(self, criterio, turno):
+        if criterio == 1:
+            return self.obtener_obra_social_paciente(turno.id_paciente)
+        return -turno.monto_a_pagar
+
+    def _insertar_en_vistas(self, turno):
+        """
+        Inserta el turno con bisect en cada vista ordenada ya construida.
+        Insertar a la derecha de las claves iguales mantiene el orden de llegada,
+        igual que el sort estable.
+        """
+        for criterio, (claves, turnos) in self._vistas_ordenadas.items():
+            clave = self._clave_orden(criterio, turno)
+            posicion = bisect.bisect_right(claves, clave)
+            claves.insert(posicion, clave)
+            turnos.insert(posicion, turno)
+
+    @_sincronizado("_lock_turnos")
+    @metricas.medir("ordenar_turnos")
     def ordenar_turnos(self, criterio):
         """
-        Función para ordenar los turnos según la opción seleccionada.
+        Devuelve los turnos ordenados según la opción seleccionada sin modificar
+        lista_turnos ni el orden de atención.
+
         Args:
-            clinica (Clinica): Instancia de la clínica.
+            criterio (int): 1 ordena por obra social ascendente, 2 por monto descendente.
+
+        Returns:
+            iterator: Iterador de solo lectura sobre los turnos ordenados.
         """
-        if criterio == 1:
-            self.lista_turnos.sort(key=lambda t: self.obtener_obra_social_paciente(t.id_paciente))
-        elif criterio == 2:
-            self.lista_turnos.sort(key=lambda x: x.monto_a_pagar, reverse=True) 
+        if criterio not in (1, 2):
+            raise ValueError(f"Criterio de orden no válido: {criterio}")
+        if criterio not in self._vistas_ordenadas:
+            turnos = sorted(self.lista_turnos, key=lambda t: self._clave_orden(criterio, t))
+            claves = [self._clave_orden(criterio, t) for t in turnos]
+            self._vistas_ordenadas[criterio] = (claves, turnos)
+        turnos = self._vistas_ordenadas[criterio][1]
+        # En modo concurrente se devuelve una copia para que otro hilo no la cambie durante el recorrido
+        return iter(list(turnos) if self._concurrente else turnos)
+
+    @_sincronizado("_lock_pacientes", "_lock_turnos")
+    @metricas.medir("consultar_turnos")
+    def consultar_turnos(self, estado=None, especialidad=None, obra_social=None, monto_desde=None,
+                         monto_hasta=None):
+        """
+        Turnos que cumplen todos los filtros indicados, por ejemplo
+        consultar_turnos(estado=Turno.ACTIVO, especialidad="traumatologia", monto_desde=3000).
+
+        El filtro se resuelve con la intersección de los bitmaps de consultas.py;
+        los turnos se obtienen recién al recorrer el generador.
+
+        Args:
+            estado, especialidad, obra_social (str): Valor buscado o lista de
+                valores alternativos. La obra social es la del paciente.
+            monto_desde, monto_hasta (float): Rango de monto_a_pagar, inclusivo.
+
+        Returns:
+            generator: Turnos en orden de alta.
+        """
+        return self._consultas.turnos(monto_desde, monto_hasta, estado=estado, especialidad=especialidad,
+                                      obra_social=obra_social)
+
+    @_sincronizado("_lock_pacientes", "_lock_turnos")
+    @metricas.medir("contar_turnos")
+    def contar_turnos(self, estado=None, especialidad=None, obra_social=None, monto_desde=None,
+                      monto_hasta=None):
+        """
+        Cantidad de turnos de consultar_turnos con los mismos filtros, sin recorrerlos.
+        """
+        return self._consultas.contar(monto_desde, monto_hasta, estado=estado, especialidad=especialidad,
+                                      obra_social=obra_social)
     
     def obtener_paciente_por_id(self, id_paciente):
-        return next((p for p in self.lista_pacientes if p.id == id_paciente), None)
-
-    def mostrar_pacientes_en_espera(self):
-        pacientes_en_espera = [t for t in self.lista_turnos if t.estado == "Activo"]
-        if pacientes_en_espera:
-            print("\n=== Pacientes en Espera ===\n")
-            print("\n╔══════╦══════════════════════╦══════════════════════╦══════════════════════╦═══════════════════════╦══════════════════════╗")
-            print("║ ID   ║ Paciente             ║ Obra Social          ║ Especialidad         ║ Monto a Pagar         ║ Estado               ║")
-            print("╠══════╬══════════════════════╬══════════════════════╬══════════════════════╬═══════════════════════╬══════════════════════╣")
-            for turno in pacientes_en_espera:
-                paciente = self.obtener_paciente_por_id(turno.id_paciente)
-                print(f"║ {turno.id:<4} ║ {paciente.nombre:<20} ║ {paciente.obra_social:<20} ║ {turno.especialidad:<20} ║ ${turno.monto_a_pagar:<20.2f} ║ {turno.estado:<20} ║")
-            print("╚══════╩══════════════════════╩══════════════════════╩══════════════════════╩═══════════════════════╩══════════════════════╝")
+        return self._pacientes_por_id.get(id_paciente)
 
-        else:
-            print("No hay pacientes en espera.")
+    def obtener_paciente_por_dni(self, dni):
+        return self._pacientes_por_dni.get(Paciente.codificar_dni(dni))
 
-    def atender_pacientes(self):
+    @_sincronizado("_lock_pacientes")
+    @metricas.medir("buscar_pacientes")
+    def buscar_pacientes(self, texto, limite=20):
         """
-        Cambia el estado a 'Finalizado' de los primeros dos turnos en estado 'Activo'.
+        Busca pacientes por prefijos de nombre y apellido, sin importar
+        mayúsculas ni acentos (ver busqueda.IndiceBusqueda.buscar).
+
+        Args:
+            texto (str): Una o más palabras; cada una debe ser prefijo del nombre o del apellido.
+            limite (int): Cantidad máxima de pacientes a devolver.
+
+        Returns:
+            list: Pacientes encontrados.
+        """
+        return self._busqueda.buscar(texto, limite)
+
+    @_sincronizado("_lock_pacientes")
+    @metricas.medir("pacientes_similares")
+    def pacientes_similares(self, texto, umbral=0.5, limite=20):
         """
-        pacientes_en_espera = [t for t in self.lista_turnos if t.estado == "Activo"]
-        if len(pacientes_en_espera) == 0:
+        Busca pacientes con nombre y apellido parecidos al texto, tolerando errores de tipeo.
+
+        Returns:
+            list: Tuplas (paciente, puntaje entre umbral y 1), de mayor a menor puntaje.
+        """
+        return self._busqueda.similares(texto, umbral, limite)
+
+    @_sincronizado("_lock_pacientes")
+    def candidatos_duplicados(self, umbral=0.7):
+        """
+        Reporte de pacientes con nombres iguales o parecidos y distinto DNI.
+
+        Returns:
+            list: busqueda.GrupoDuplicados de mayor a menor similitud.
+        """
+        return candidatos_duplicados(self.lista_pacientes, umbral)
+
+    def mostrar_turnos(self, turnos, titulo):
+        """
+        Imprime una tabla con los turnos recibidos.
+
+        Args:
+            turnos (iterable): Turnos a mostrar.
+            titulo (str): Título de la tabla.
+        """
+        sys.stdout.write(f"\n=== {titulo} ===\n\n\n")
+        TABLA_TURNOS.escribir(self._fila_turno(turno) for turno in turnos)
+
+    def _fila_turno(self, turno):
+        paciente = self.obtener_paciente_por_id(turno.id_paciente)
+        nombre, obra_social = (paciente.nombre, paciente.obra_social) if paciente else ("", "")
+        return turno.id, nombre, obra_social, turno.especialidad, f"${turno.monto_a_pagar:.2f}", turno.estado
+
+    @_sincronizado("_lock_turnos")
+    def turnos_en_espera(self):
+        """
+        Devuelve un iterador sobre los turnos activos en orden de llegada.
+        """
+        return iter(self._planificador)
+
+    @_sincronizado("_lock_turnos")
+    def turnos_por_cobrar(self):
+        """
+        Devuelve un iterador sobre los turnos finalizados pendientes de cobro.
+        """
+        return iter(list(self._turnos_finalizados.values()))
+
+    @_sincronizado("_lock_turnos")
+    def pagina_en_espera(self, inicio, cantidad):
+        return self._planificador.pagina(inicio, cantidad)
+
+    @_sincronizado("_lock_turnos")
+    def cantidad_en_espera(self):
+        return len(self._planificador)
+
+    def paginar_en_espera(self, tamanio=20):
+        """
+        Devuelve un cursor de páginas sobre la cola de espera, en orden de llegada.
+        Cada página se pide a la cola al mostrarla.
+        """
+        return Paginador(self.pagina_en_espera, self.cantidad_en_espera, tamanio)
+
+    @metricas.medir("mostrar_pacientes_en_espera")
+    def mostrar_pacientes_en_espera(self, paginador=None):
+        """
+        Muestra una página de la cola de espera con un único write.
+
+        Args:
+            paginador (tablas.Paginador): Cursor devuelto por una llamada anterior;
+                sin él se muestra la primera página.
+
+        Returns:
+            tablas.Paginador: El cursor, para pedir la página siguiente o la
+                anterior, o None si no hay pacientes en espera.
+        """
+        paginador = paginador or self.paginar_en_espera()
+        turnos = paginador.pagina()
+        metricas.contar("mostrar_pacientes_en_espera", len(turnos))
+        if not turnos:
             print("No hay pacientes en espera.")
-        else:
-            to_atender = pacientes_en_espera[:2]
-            for t in to_atender:
-                t.estado = "Finalizado"
-                print(f"Paciente con turno ID: {t.id} ha sido atendido.")
+            return None
+        sys.stdout.write("\n=== Pacientes en Espera ===\n\n\n"
+                         + TABLA_TURNOS.renderizar(self._fila_turno(turno) for turno in turnos)
+                         + f"Página {paginador.numero()} de {paginador.cantidad_paginas()}"
+                           f" ({self.cantidad_en_espera()} en espera)\n")
+        return paginador
+
+    @metricas.medir("exportar_en_espera")
+    def exportar_en_espera(self, ruta):
+        """
+        Escribe la cola de espera completa en un archivo de texto con el mismo
+        formato de tabla. La cola se lee de a una página, sin copiarla entera
+        ni tener tomado el lock durante la escritura.
+        """
+        turnos = self.paginar_en_espera(LINEAS_POR_BLOQUE).recorrer()
+        TABLA_TURNOS.exportar((self._fila_turno(turno) for turno in turnos), ruta)
+
+    @_sincronizado("_lock_turnos")
+    @metricas.medir("atender_pacientes")
+    def atender_pacientes(self, cantidad=2):
+        """
+        Atiende un ciclo del planificador: cambia a 'Finalizado' los turnos
+        activos que elige según la política y el cupo por especialidad.
 
+        Args:
+            cantidad (int): Cantidad máxima de turnos a atender; None atiende el ciclo completo.
+
+        Returns:
+            list: Turnos atendidos, vacía si no había pacientes en espera.
+        """
+        atendidos = self._planificador.extraer(cantidad)
+        for t in atendidos:
+            self.cambiar_estado_turno(t, Turno.FINALIZADO)
+        metricas.contar("atender_pacientes", len(atendidos))
+        return atendidos
+
+    @_sincronizado("_lock_turnos")
+    def configurar_atencion(self, politica=LLEGADA, cupo_por_especialidad=None):
+        """
+        Cambia la política y el cupo del planificador; se mantienen al recargar la clínica.
+
+        Args:
+            politica (str | callable): planificador.LLEGADA, planificador.EDAD o
+                función (turno, paciente) -> clave, donde menor se atiende antes.
+            cupo_por_especialidad (int): Turnos por especialidad en cada ciclo; None sin límite.
+        """
+        self._planificador.configurar(politica, cupo_por_especialidad)
+        self._politica_atencion = (politica, cupo_por_especialidad)
+
+    def profundidad_por_especialidad(self):
+        return self._planificador.profundidad()
+
+    def espera_promedio_por_especialidad(self):
+        return self._planificador.espera_promedio()
+
+    @_sincronizado("_lock_turnos")
+    @metricas.medir("cobrar_atenciones")
     def cobrar_atenciones(self):
         """
         Cambia el estado a 'Pagado' de los turnos en estado 'Finalizado' y suma el monto al tributo recaudación.
+
+        Returns:
+            list: Turnos cobrados, vacía si no había turnos para cobrar.
         """
-        turnos_finalizados = [t for t in self.lista_turnos if t.estado == "Finalizado"]
-        if len(turnos_finalizados) == 0:
-            print("No hay turnos para cobrar.")
-        else:
-            for t in turnos_finalizados:
-                t.estado = "Pagado"
-                self.recaudacion += t.monto_a_pagar
-                print(f"Se ha cobrado el turno ID: {t.id} por un monto de {t.monto_a_pagar}")
+        cobrados = list(self._turnos_finalizados.values())
+        hoy = date.today().isoformat()
+        for t in cobrados:
+            self.cambiar_estado_turno(t, Turno.PAGADO)
+            self.recaudacion += t.monto_a_pagar
+            self._registrar_en_cubo(t, hoy)
+            self._registrar_evento('cobro', id=t.id, monto=t.monto_a_pagar, dia=hoy)
+        metricas.contar("cobrar_atenciones", len(cobrados))
+        return cobrados
+
+    def hay_turnos_pendientes(self):
+        """
+        Indica en O(1) si quedan turnos activos o finalizados sin cobrar.
+        """
+        return bool(self._planificador or self._turnos_finalizados)
 
-    def cerrar_caja(self, archivo_config):
+    @_sincronizado("_lock_pacientes", "_lock_turnos")
+    def instantanea(self):
+        """
+        Devuelve los totales de la clínica leídos todos en el mismo momento,
+        sin que otro hilo pueda modificarlos en el medio.
+
+        Returns:
+            dict: pacientes, turnos, en_espera, por_cobrar, pagados, recaudacion,
+                ingresos_por_obra_social, ingresos_por_especialidad y
+                obra_social_menos_ingresos ((obra_social, total) o None).
+        """
+        return {
+            "pacientes": len(self.lista_pacientes),
+            "turnos": len(self.lista_turnos),
+            "en_espera": len(self._planificador),
+            "por_cobrar": len(self._turnos_finalizados),
+            "pagados": len(self._turnos_pagados),
+            "recaudacion": self.recaudacion,
+            "ingresos_por_obra_social": dict(self._ingresos_por_obra_social),
+            "ingresos_por_especialidad": dict(self._ingresos_por_especialidad),
+            "obra_social_menos_ingresos": self.obra_social_menos_ingresos(),
+        }
+
+    @_sincronizado("_lock_pacientes", "_lock_turnos")
+    @metricas.medir("cerrar_caja")
+    def cerrar_caja(self, archivo_config, carpeta_historico=None):
         """
         Cierra la caja y actualiza los archivos de pacientes y turnos si no hay pacientes por atender.
+        El histórico se escribe antes de volver; el snapshot, en segundo plano.
+
+        Args:
+            archivo_config (str): Ruta del snapshot JSON.
+            carpeta_historico (str): Si se indica, los turnos pagados pasan a la
+                partición del día en esa carpeta (ver historico.py) y el archivo
+                vivo queda solo con los pacientes.
+
+        Raises:
+            CajaConPendientes: Si quedan turnos activos o finalizados.
+            OSError: Si no se pudo escribir el histórico; los pagados siguen en memoria.
+
+        Returns:
+            guardado.Guardado: Handle con el total recaudado en `recaudacion`
+                y esperar() para bloquear hasta que los archivos estén escritos.
+        """
+        if self.hay_turnos_pendientes():
+            raise CajaConPendientes("Aún hay pacientes por atender o turnos por cobrar.")
+        if carpeta_historico is not None:
+            self._separar_pagados(carpeta_historico)
+        # Con la caja cerrada la recaudación vuelve a cero antes de guardar,
+        # así ni el snapshot ni el journal nuevo la arrastran al día siguiente.
+        recaudacion, self.recaudacion = self.recaudacion, 0.0
+        return self.guardar_en_segundo_plano(archivo_config, recaudacion)
+
+    def _separar_pagados(self, carpeta_historico):
         """
-        turnos_pendientes = [t for t in self.lista_turnos if t.estado in ["Activo", "Finalizado"]]
-        if len(turnos_pendientes) > 0:
-            print("Aún hay pacientes por atender o turnos por cobrar.")
+        Escribe los turnos pagados en el histórico y recién entonces los saca
+        del estado vivo: si la escritura falla siguen en memoria y en el
+        journal. Va antes que el snapshot: si el proceso se corta en el medio,
+        el próximo cierre del mismo día no los duplica.
+        """
+        pagados = list(self._turnos_pagados)
+        if not pagados:
+            return
+        obras_sociales = {t.id_paciente: self.obtener_obra_social_paciente(t.id_paciente) for t in pagados}
+        historico.archivar(carpeta_historico, date.today(), pagados, obras_sociales.get)
+        ids = {t.id for t in pagados}
+        if isinstance(self.lista_turnos, list):
+            self.lista_turnos[:] = [t for t in self.lista_turnos if t.id not in ids]
+            self._turnos_pagados = []
         else:
-            print(f"Total recaudado: {self.recaudacion}")
-            self.guardar_datos(archivo_config)
-            print("Datos guardados y caja cerrada.")
+            # Snapshot binario o SQLite: cada colección quita sus elementos
+            for t in pagados:
+                self.lista_turnos.remove(t)
+                self._turnos_pagados.remove(t)
+        for id_turno in ids:
+            self._turnos_por_id.pop(id_turno, None)
+        self._ingresos_por_obra_social = {}
+        self._ingresos_por_especialidad = {}
+        self._heap_ingresos = []
+        self._orden_obra_social = {}
+        self._vistas_ordenadas = {}
+        self._consultas.reiniciar()
 
+    @_sincronizado("_lock_turnos")
+    @metricas.medir("mostrar_informe")
     def mostrar_informe(self):
         """
         Informa la obra social con menos ingresos.
+        Usa los acumulados que se actualizan en cada cobro, por lo que su costo
+        depende solo de la cantidad de obras sociales.
         """
-    # Filtramos los turnos pagados
-        turnos_pagados = filter(lambda t: t.estado == "Pagado", self.lista_turnos)
-
-    # Extraemos el monto a pagar y la obra social de cada turno pagado
-        ingresos_por_obra_social = {}
-        for turno in turnos_pagados:
-            paciente = self.obtener_paciente_por_id(turno.id_paciente)
-            obra_social = paciente.obra_social.lower()
-            monto_a_pagar = turno.monto_a_pagar
-            if obra_social in ingresos_por_obra_social:
-                ingresos_por_obra_social[obra_social] += monto_a_pagar
-            else:
-                ingresos_por_obra_social[obra_social] = monto_a_pagar
+        ingresos_por_obra_social = self._ingresos_por_obra_social
     
     # Imprimimos el monto de cada ingreso por obra social
         if ingresos_por_obra_social:
@@ -238,8 +1214,9 @@ class Clinica:
             print(f"Monto Total: ${monto:.2f}\n")
     
     # Encontramos la obra social con menos ingresos
-        if ingresos_por_obra_social:
-            obra_social_menos_ingresos = min(ingresos_por_obra_social, key=ingresos_por_obra_social.get)
-            print(f"La obra social con menos ingresos es: {obra_social_menos_ingresos.capitalize()} con un total de ${ingresos_por_obra_social[obra_social_menos_ingresos]:.2f}")
+        menos_ingresos = self.obra_social_menos_ingresos()
+        if menos_ingresos:
+            obra_social_menos_ingresos, total = menos_ingresos
+            print(f"La obra social con menos ingresos es: {obra_social_menos_ingresos.capitalize()} con un total de ${total:.2f}")
         else:
             print("No hay ingresos registrados.")
\ No newline at end of file
@@ -0,0 +1,284 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Índices para consultas ad hoc sobre los turnos.
+
+Cada turno ocupa una posición fija y cada valor de estado, especialidad, obra
+social del paciente y monto tiene un bitmap (un int de Python) con un bit por
+posición, así que combinar predicados es un AND entre ints en C. Los montos
+salen de la tabla del tarifario y son pocos valores distintos: se guardan
+ordenados y un rango es el OR de los bitmaps de los montos que caen en él,
+con sus extremos ubicados con bisect. Los resultados se recorren bit a bit a
+medida que se piden y contar no materializa ningún turno.
+
+El índice se arma recién en la primera consulta; desde ahí las altas y los
+cambios de estado se acumulan y se fusionan en la consulta siguiente, como en
+el índice de búsqueda de pacientes.
+"""
+
+import bisect
+import re
+from array import array
+
+DIMENSIONES = ("estado", "especialidad", "obra_social", "monto")
+_NO_CERO = re.compile(rb"[^\x00]+")
+# Posiciones de los bits prendidos de cada byte
+_BITS = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+
+def bitmap_de(posiciones, base=0):
+    """
+    Arma el bitmap con las posiciones dadas, todas mayores o iguales a `base`.
+    """
+    if not posiciones:
+        return 0
+    bytes_ = bytearray(((max(posiciones) - base) >> 3) + 1)
+    for posicion in posiciones:
+        posicion -= base
+        bytes_[posicion >> 3] |= 1 << (posicion & 7)
+    return int.from_bytes(bytes_, "little") << base
+
+
+def posiciones_de(bitmap):
+    """
+    Recorre las posiciones de los bits prendidos en orden creciente. Los bytes
+    en cero se saltean con una regex, que los recorre en C.
+    """
+    datos = bitmap.to_bytes((bitmap.bit_length() + 7) >> 3, "little")
+    for corrida in _NO_CERO.finditer(datos):
+        for indice in range(corrida.start(), corrida.end()):
+            base = indice << 3
+            for bit in _BITS[datos[indice]]:
+                yield base + bit
+
+
+class IndiceTurnos:
+    def __init__(self, turnos, obtener_turno, obtener_obra_social):
+        """
+        Args:
+            turnos (callable): Devuelve la colección actual de turnos, que se
+                recorre al armar el índice.
+            obtener_turno (callable): Devuelve el turno de un id, o None si ya no está.
+            obtener_obra_social (callable): Devuelve la obra social, en
+                minúsculas, del paciente de un id.
+        """
+        self._fuente = turnos
+        self._obtener_turno = obtener_turno
+        self._obtener_obra_social = obtener_obra_social
+        self.reiniciar()
+
+    def reiniciar(self):
+        """
+        Descarta el índice; se vuelve a armar en la próxima consulta.
+        """
+        self._armado = False
+        # Posición -> id del turno y estado con el que está en los bitmaps
+        self._ids = array('q')
+        self._estados = []
+        # Mientras los ids lleguen crecientes la posición se busca con bisect en
+        # _ids; si aparece uno fuera de orden se pasa a un dict
+        self._posicion_por_id = None
+        # {dimensión: {valor: bitmap}}
+        self._bitmaps = {dimension: {} for dimension in DIMENSIONES}
+        # Montos distintos en orden, para resolver los rangos con bisect
+        self._montos = []
+        self._pendientes = []
+        self._cambios = set()
+
+    def agregar(self, turno):
+        if self._armado:
+            self._pendientes.append(turno)
+
+    def cambiar_estado(self, turno):
+        if self._armado:
+            self._cambios.add(turno.id)
+
+    def _fusionar(self):
+        if not self._armado:
+            self._armado = True
+            self._indexar(self._fuente())
+            self._pendientes = []
+            self._cambios = set()
+            return
+        if self._pendientes:
+            pendientes, self._pendientes = self._pendientes, []
+            self._indexar(pendientes)
+        if self._cambios:
+            self._aplicar_cambios()
+
+    def _posicion(self, id_turno):
+        if self._posicion_por_id is not None:
+            return self._posicion_por_id.get(id_turno)
+        posicion = bisect.bisect_left(self._ids, id_turno)
+        if posicion < len(self._ids) and self._ids[posicion] == id_turno:
+            return posicion
+        return None
+
+    def _indexar(self, turnos):
+        """
+        Agrega turnos nuevos al final. Las posiciones se agrupan por la
+        combinación de valores, así que cada grupo arma un solo bitmap y se
+        suma con un OR al de cada uno de sus valores.
+        """
+        base = len(self._ids)
+        ultimo_id = self._ids[-1] if self._ids else -1
+        obras_sociales = {}
+        grupos = {}
+        posicion = base
+        for turno in turnos:
+            if turno.id > ultimo_id:
+                ultimo_id = turno.id
+            elif self._posicion(turno.id) is not None:
+                continue
+            elif self._posicion_por_id is None:
+                self._posicion_por_id = {id_turno: indice for indice, id_turno in enumerate(self._ids)}
+            if self._posicion_por_id is not None:
+                self._posicion_por_id[turno.id] = posicion
+            obra_social = obras_sociales.get(turno.id_paciente)
+            if obra_social is None:
+                obra_social = obras_sociales[turno.id_paciente] = self._obtener_obra_social(turno.id_paciente)
+            clave = (turno.estado, turno.especialidad.lower(), obra_social, turno.monto_a_pagar)
+            grupo = grupos.get(clave)
+            if grupo is None:
+                grupo = grupos[clave] = []
+            grupo.append(posicion)
+            self._ids.append(turno.id)
+            self._estados.append(turno.estado)
+            posicion += 1
+        for clave, posiciones in grupos.items():
+            bitmap = bitmap_de(posiciones, base)
+            for dimension, valor in zip(DIMENSIONES, clave):
+                bitmaps = self._bitmaps[dimension]
+                bitmaps[valor] = bitmaps.get(valor, 0) | bitmap
+        if len(self._montos) != len(self._bitmaps["monto"]):
+            self._montos = sorted(self._bitmaps["monto"])
+
+    def _aplicar_cambios(self):
+        """
+        Mueve las posiciones de los turnos que cambiaron de estado entre los
+        bitmaps de estado: un AND NOT y un OR por valor afectado.
+        """
+        quitar, agregar = {}, {}
+        for id_turno in self._cambios:
+            posicion = self._posicion(id_turno)
+            turno = self._obtener_turno(id_turno)
+            if posicion is None or turno is None or turno.estado == self._estados[posicion]:
+                continue
+            quitar.setdefault(self._estados[posicion], []).append(posicion)
+            agregar.setdefault(turno.estado, []).append(posicion)
+            self._estados[posicion] = turno.estado
+        self._cambios = set()
+        bitmaps = self._bitmaps["estado"]
+        for estado, posiciones in quitar.items():
+            bitmaps[estado] &= ~bitmap_de(posiciones)
+        for estado, posiciones in agregar.items():
+            bitmaps[estado] = bitmaps.get(estado, 0) | bitmap_de(posiciones)
+
+    def _bitmap_igualdad(self, dimension, valor):
+        """
+        Bitmap de un valor o, si es una lista o un conjunto, el OR de sus valores.
+        """
+        bitmaps = self._bitmaps[dimension]
+        valores = (valor,) if isinstance(valor, str) else valor
+        resultado = 0
+        for valor in valores:
+            if dimension != "estado":
+                valor = valor.lower()
+            resultado |= bitmaps.get(valor, 0)
+        return resultado
+
+    def _bitmaps_monto(self, monto_desde, monto_hasta):
+        """
+        Bitmaps de los montos distintos dentro del rango, inclusivo.
+        """
+        inicio = 0 if monto_desde is None else bisect.bisect_left(self._montos, monto_desde)
+        fin = len(self._montos) if monto_hasta is None else bisect.bisect_right(self._montos, monto_hasta)
+        bitmaps = self._bitmaps["monto"]
+        return [bitmaps[monto] for monto in self._montos[inicio:fin]]
+
+    def _bitmap(self, filtros, monto_desde, monto_hasta):
+        """
+        AND de los predicados indicados, o None si no hay ninguno.
+        """
+        self._fusionar()
+        bitmap = None
+        for dimension, valor in filtros.items():
+            if dimension not in self._bitmaps or dimension == "monto":
+                raise ValueError(f"Filtro no válido: {dimension}")
+            if valor is None:
+                continue
+            propio = self._bitmap_igualdad(dimension, valor)
+            bitmap = propio if bitmap is None else bitmap & propio
+            if not bitmap:
+                return 0
+        if monto_desde is not None or monto_hasta is not None:
+            rango = 0
+            for propio in self._bitmaps_monto(monto_desde, monto_hasta):
+                rango |= propio
+            bitmap = rango if bitmap is None else bitmap & rango
+        return bitmap
+
+    def turnos(self, monto_desde=None, monto_hasta=None, **filtros):
+        """
+        Arma el bitmap de la consulta y devuelve un generador de los turnos
+        que cumplen todos los predicados, en orden de alta.
+
+        Args:
+            monto_desde, monto_hasta (float): Rango de monto_a_pagar, inclusivo.
+            **filtros: estado, especialidad y obra_social; cada uno un valor o
+                una lista de valores alternativos.
+
+        Returns:
+            generator: Turnos que cumplen la consulta.
+        """
+        bitmap = self._bitmap(filtros, monto_desde, monto_hasta)
+        if bitmap is None:
+            bitmap = (1 << len(self._ids)) - 1
+        return self._recorrer(bitmap, self._ids)
+
+    def _recorrer(self, bitmap, ids):
+        for posicion in posiciones_de(bitmap):
+            turno = self._obtener_turno(ids[posicion])
+            if turno is not None:
+                yield turno
+
+    def contar(self, monto_desde=None, monto_hasta=None, **filtros):
+        """
+        Cantidad de turnos que cumplen la consulta: el popcount del bitmap, sin
+        tocar ningún turno.
+        """
+        if all(valor is None for valor in filtros.values()) and set(filtros) <= set(DIMENSIONES[:-1]):
+            # Solo rango de monto: los bitmaps de cada monto son disjuntos y se cuentan por separado
+            self._fusionar()
+            if monto_desde is None and monto_hasta is None:
+                return len(self._ids)
+            return sum(bitmap.bit_count() for bitmap in self._bitmaps_monto(monto_desde, monto_hasta))
+        bitmap = self._bitmap(filtros, monto_desde, monto_hasta)
+        return bitmap.bit_count()
+
+    def valores(self, dimension):
+        """
+        Valores indexados de una dimensión con su cantidad de turnos.
+        """
+        self._fusionar()
+        return {valor: bitmap.bit_count() for valor, bitmap in self._bitmaps[dimension].items() if bitmap}
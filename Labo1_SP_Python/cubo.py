@@ -0,0 +1,131 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Cubo de ingresos precalculado: monto y cantidad de turnos cobrados por
+obra social × especialidad × día × franja etaria.
+
+Se actualiza en cada cobro, así que las consultas recorren solo las celdas
+del cubo (como mucho obras sociales × especialidades × días × franjas) y su
+costo no depende de la cantidad de turnos.
+"""
+
+import csv
+
+DIMENSIONES = ("obra_social", "especialidad", "dia", "franja")
+# Límites superiores de cada franja etaria; la edad válida va de 18 a 90
+_FRANJAS = ((29, "18-29"), (44, "30-44"), (59, "45-59"), (74, "60-74"))
+_ULTIMA_FRANJA = "75+"
+# Día de los turnos cobrados antes de que existiera el cubo
+DIA_DESCONOCIDO = ""
+
+
+def franja_etaria(edad):
+    edad = int(edad)
+    for limite, nombre in _FRANJAS:
+        if edad <= limite:
+            return nombre
+    return _ULTIMA_FRANJA
+
+
+class CuboIngresos:
+    def __init__(self):
+        # {(obra_social, especialidad, dia, franja): [monto, cantidad]}
+        self._celdas = {}
+
+    def __len__(self):
+        return len(self._celdas)
+
+    def registrar(self, obra_social, especialidad, dia, edad, monto):
+        """
+        Suma un cobro a su celda.
+
+        Args:
+            obra_social (str): Obra social del paciente, en minúsculas.
+            especialidad (str): Especialidad del turno.
+            dia (str): Fecha del cobro en formato ISO (AAAA-MM-DD).
+            edad (int): Edad del paciente al cobrar.
+            monto (float): Monto cobrado.
+        """
+        clave = (obra_social, especialidad, dia, franja_etaria(edad))
+        celda = self._celdas.get(clave)
+        if celda is None:
+            self._celdas[clave] = [monto, 1]
+        else:
+            celda[0] += monto
+            celda[1] += 1
+
+    def consultar(self, dimensiones=("obra_social",), obra_social=None, especialidad=None, desde=None, hasta=None,
+                  franja=None):
+        """
+        Agrupa el cubo por las dimensiones pedidas (roll-up) después de filtrar
+        por las demás (slice).
+
+        Args:
+            dimensiones (tuple): Subconjunto de DIMENSIONES; vacío da el total general.
+            obra_social, especialidad, franja (str): Si se indican, solo esas celdas.
+            desde, hasta (str): Rango de días ISO, inclusivo.
+
+        Returns:
+            dict: {tupla con los valores de las dimensiones: (monto, cantidad)}, ordenado por clave.
+        """
+        indices = [DIMENSIONES.index(dimension) for dimension in dimensiones]
+        resultado = {}
+        for clave, (monto, cantidad) in self._celdas.items():
+            os_, esp, dia, fr = clave
+            if ((obra_social is not None and os_ != obra_social) or
+                    (especialidad is not None and esp != especialidad) or
+                    (franja is not None and fr != franja) or
+                    (desde is not None and dia < desde) or
+                    (hasta is not None and dia > hasta)):
+                continue
+            grupo = tuple(clave[i] for i in indices)
+            acumulado = resultado.get(grupo)
+            if acumulado is None:
+                resultado[grupo] = [monto, cantidad]
+            else:
+                acumulado[0] += monto
+                acumulado[1] += cantidad
+        return {grupo: tuple(valores) for grupo, valores in sorted(resultado.items())}
+
+    def exportar_csv(self, ruta, dimensiones=DIMENSIONES, **filtros):
+        """
+        Escribe el resultado de consultar en un CSV con una columna por dimensión,
+        más monto y cantidad.
+        """
+        with open(ruta, 'w', newline='', encoding='utf-8') as file:
+            escritor = csv.writer(file)
+            escritor.writerow((*dimensiones, "monto", "cantidad"))
+            for grupo, (monto, cantidad) in self.consultar(dimensiones, **filtros).items():
+                escritor.writerow((*grupo, monto, cantidad))
+
+    def a_filas(self):
+        """
+        Devuelve las celdas como listas serializables a JSON.
+        """
+        return [[*clave, monto, cantidad] for clave, (monto, cantidad) in self._celdas.items()]
+
+    def cargar_filas(self, filas):
+        """
+        Reemplaza el contenido por las celdas guardadas con a_filas.
+        """
+        self._celdas = {tuple(fila[:4]): [fila[4], fila[5]] for fila in filas}
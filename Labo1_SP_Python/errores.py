@@ -0,0 +1,49 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+class ErrorClinica(Exception):
+    """Error base de las operaciones de la clínica."""
+
+
+class DatosInvalidos(ErrorClinica, ValueError):
+    """Los datos recibidos no cumplen las reglas de Validaciones."""
+
+
+class EspecialidadInvalida(DatosInvalidos):
+    """La especialidad no está entre las de la clínica."""
+
+
+class PacienteDuplicado(ErrorClinica):
+    """Ya existe un paciente con el mismo DNI."""
+
+
+class PacienteNoEncontrado(ErrorClinica, LookupError):
+    """No existe un paciente con el ID pedido."""
+
+
+class CajaConPendientes(ErrorClinica):
+    """Hay turnos activos o finalizados sin cobrar al cerrar la caja."""
+
+
+class ConfiguracionInvalida(ErrorClinica):
+    """El archivo de configuración no se pudo decodificar."""
@@ -0,0 +1,178 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Guardado en segundo plano de la clínica.
+
+La clínica toma bajo sus locks una copia barata del estado (listas de
+referencias y el estado de cada turno) y la serialización y escritura corren
+en un hilo aparte. Cada guardado usa su propio hilo, que espera al anterior
+para que los archivos se escriban en el mismo orden en que se tomaron las
+copias; los hilos no son daemon, así que el intérprete no termina con un
+guardado a medias.
+"""
+
+import threading
+import time
+
+import metricas
+
+
+class Guardado:
+    """
+    Handle de un guardado en curso, devuelto por Clinica.cerrar_caja y
+    Clinica.guardar_en_segundo_plano.
+
+    Attributes:
+        recaudacion (float): Total recaudado al momento de la copia (None fuera de cerrar_caja).
+        segundos (float): Duración de la escritura, cuando terminó.
+        error (Exception): Error de la escritura, o None.
+    """
+
+    def __init__(self, recaudacion=None):
+        self.recaudacion = recaudacion
+        self.segundos = None
+        self.error = None
+        self._listo = threading.Event()
+
+    def terminado(self):
+        return self._listo.is_set()
+
+    def esperar(self, timeout=None):
+        """
+        Espera a que el archivo quede escrito.
+
+        Returns:
+            bool: False si se venció el timeout.
+
+        Raises:
+            Exception: El error con el que falló la escritura.
+        """
+        if not self._listo.wait(timeout):
+            return False
+        if self.error is not None:
+            raise self.error
+        return True
+
+    def _terminar(self, segundos, error=None):
+        self.segundos = segundos
+        self.error = error
+        self._listo.set()
+
+
+class GuardadorSegundoPlano:
+    """
+    Corre las escrituras de a una en hilos aparte.
+
+    Attributes:
+        fallido (Guardado): Último guardado que falló y todavía no se informó, o None.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ultimo_hilo = None
+        self.fallido = None
+
+    def encolar(self, tarea, guardado):
+        """
+        Corre `tarea` en un hilo nuevo, después de que terminen las anteriores.
+
+        Args:
+            tarea (callable): Escritura a realizar, sin argumentos.
+            guardado (Guardado): Handle que se completa al terminar.
+
+        Returns:
+            Guardado: El mismo handle.
+        """
+        with self._lock:
+            hilo = threading.Thread(target=self._correr, args=(self._ultimo_hilo, tarea, guardado),
+                                    name="guardado-clinica")
+            self._ultimo_hilo = hilo
+            hilo.start()
+        return guardado
+
+    def _correr(self, anterior, tarea, guardado):
+        if anterior is not None:
+            anterior.join()
+        inicio = time.perf_counter()
+        try:
+            tarea()
+        except Exception as error:
+            # Antes de avisar, así quien espera el handle ya lo encuentra en fallido
+            self.fallido = guardado
+            guardado._terminar(time.perf_counter() - inicio, error)
+        else:
+            segundos = time.perf_counter() - inicio
+            metricas.registrar_latencia("guardado_segundo_plano", segundos)
+            guardado._terminar(segundos)
+
+    def esperar(self):
+        """
+        Espera a que terminen todos los guardados encolados hasta ahora.
+        """
+        with self._lock:
+            hilo = self._ultimo_hilo
+        if hilo is not None and hilo is not threading.current_thread():
+            hilo.join()
+
+    def tomar_fallo(self):
+        """
+        Devuelve el guardado fallido pendiente de informar y lo olvida.
+        """
+        with self._lock:
+            guardado, self.fallido = self.fallido, None
+        return guardado
+
+
+class Autoguardado:
+    """
+    Dispara un guardado cuando pasaron `intervalo` segundos desde el anterior.
+    La clínica llama a revisar() al terminar cada operación, así la copia se
+    toma siempre entre operaciones y nunca a mitad de una.
+    """
+
+    def __init__(self, guardar, intervalo, reloj=time.monotonic):
+        """
+        Args:
+            guardar (callable): Toma la copia y encola la escritura; devuelve el
+                Guardado, o None si no hubo cambios desde el último.
+            intervalo (float): Segundos mínimos entre guardados.
+            reloj (callable): Fuente de tiempo en segundos.
+        """
+        self._guardar = guardar
+        self.intervalo = intervalo
+        self._reloj = reloj
+        self._ultima_vez = reloj()
+        self._lock = threading.Lock()
+        self.ultimo = None
+
+    def revisar(self):
+        ahora = self._reloj()
+        if ahora - self._ultima_vez < self.intervalo or not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._ultima_vez = ahora
+            guardado = self._guardar()
+            if guardado is not None:
+                self.ultimo = guardado
+        finally:
+            self._lock.release()
@@ -0,0 +1,185 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Archivo histórico de turnos cobrados, particionado por fecha de cierre.
+
+Cada partición es carpeta/turnos_AAAA-MM-DD.jsonl: la primera línea es un
+resumen con los totales del día por obra social y por especialidad y cada
+línea siguiente es un turno con la obra social que tenía su paciente. Los
+informes de un rango de fechas leen solo la primera línea de cada partición;
+el detalle se recorre solo en las particiones del rango.
+"""
+
+import argparse
+import json
+import os
+from datetime import date
+
+_PREFIJO = "turnos_"
+_EXTENSION = ".jsonl"
+
+
+def ruta_particion(carpeta, fecha):
+    return os.path.join(carpeta, f"{_PREFIJO}{fecha.isoformat()}{_EXTENSION}")
+
+
+def particiones(carpeta, desde=None, hasta=None):
+    """
+    Devuelve las particiones del rango [desde, hasta] ordenadas por fecha,
+    eligiéndolas por el nombre sin abrirlas.
+
+    Returns:
+        list: Pares (fecha, ruta).
+    """
+    if not os.path.isdir(carpeta):
+        return []
+    encontradas = []
+    for nombre in os.listdir(carpeta):
+        if not (nombre.startswith(_PREFIJO) and nombre.endswith(_EXTENSION)):
+            continue
+        try:
+            fecha = date.fromisoformat(nombre[len(_PREFIJO):-len(_EXTENSION)])
+        except ValueError:
+            continue
+        if (desde is None or fecha >= desde) and (hasta is None or fecha <= hasta):
+            encontradas.append((fecha, os.path.join(carpeta, nombre)))
+    return sorted(encontradas)
+
+
+def leer_resumen(ruta):
+    with open(ruta, 'r', encoding='utf-8') as file:
+        return json.loads(file.readline())
+
+
+def _lineas_turnos(ruta):
+    with open(ruta, 'r', encoding='utf-8') as file:
+        file.readline()
+        for linea in file:
+            if linea.strip():
+                yield linea
+
+
+def archivar(carpeta, fecha, turnos, obra_social_de):
+    """
+    Agrega turnos cobrados a la partición de la fecha y recalcula su resumen.
+    Si la partición ya tiene un turno con el mismo ID no se repite, así que
+    volver a archivar después de un corte no duplica nada.
+
+    Args:
+        carpeta (str): Carpeta del histórico; se crea si no existe.
+        fecha (date): Fecha de cierre.
+        turnos (iterable): Turnos a archivar.
+        obra_social_de (callable): Devuelve la obra social de un id de paciente.
+
+    Returns:
+        dict: Resumen de la partición después de archivar.
+    """
+    os.makedirs(carpeta, exist_ok=True)
+    ruta = ruta_particion(carpeta, fecha)
+    existentes = os.path.exists(ruta)
+    resumen = leer_resumen(ruta) if existentes else {
+        "fecha": fecha.isoformat(), "turnos": 0, "total": 0,
+        "ingresos_por_obra_social": {}, "ingresos_por_especialidad": {},
+    }
+    ids = {json.loads(linea)["id"] for linea in _lineas_turnos(ruta)} if existentes else set()
+    nuevas = []
+    for turno in turnos:
+        if turno.id in ids:
+            continue
+        ids.add(turno.id)
+        registro = turno.a_dict()
+        registro["obra_social"] = obra_social_de(turno.id_paciente)
+        nuevas.append(json.dumps(registro) + "\n")
+        monto = turno.monto_a_pagar
+        resumen["turnos"] += 1
+        resumen["total"] += monto
+        por_obra_social = resumen["ingresos_por_obra_social"]
+        por_obra_social[registro["obra_social"]] = por_obra_social.get(registro["obra_social"], 0) + monto
+        por_especialidad = resumen["ingresos_por_especialidad"]
+        por_especialidad[turno.especialidad] = por_especialidad.get(turno.especialidad, 0) + monto
+    if not nuevas:
+        return resumen
+
+    temporal = f"{ruta}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as file:
+        file.write(json.dumps(resumen) + "\n")
+        if existentes:
+            file.writelines(_lineas_turnos(ruta))
+        file.writelines(nuevas)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporal, ruta)
+    return resumen
+
+
+def informe(carpeta, desde=None, hasta=None):
+    """
+    Suma los resúmenes de las particiones del rango sin leer los turnos.
+
+    Returns:
+        dict: dias, turnos, total, ingresos_por_obra_social e ingresos_por_especialidad.
+    """
+    combinado = {"dias": 0, "turnos": 0, "total": 0, "ingresos_por_obra_social": {}, "ingresos_por_especialidad": {}}
+    for _, ruta in particiones(carpeta, desde, hasta):
+        resumen = leer_resumen(ruta)
+        combinado["dias"] += 1
+        combinado["turnos"] += resumen["turnos"]
+        combinado["total"] += resumen["total"]
+        for clave in ("ingresos_por_obra_social", "ingresos_por_especialidad"):
+            for nombre, monto in resumen[clave].items():
+                combinado[clave][nombre] = combinado[clave].get(nombre, 0) + monto
+    return combinado
+
+
+def recorrer_turnos(carpeta, desde=None, hasta=None):
+    """
+    Recorre los turnos archivados del rango, una partición a la vez.
+
+    Yields:
+        dict: Turno con el formato de configs.json más obra_social y fecha.
+    """
+    for fecha, ruta in particiones(carpeta, desde, hasta):
+        for linea in _lineas_turnos(ruta):
+            registro = json.loads(linea)
+            registro["fecha"] = fecha.isoformat()
+            yield registro
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Informe de ingresos del histórico de turnos.")
+    parser.add_argument("carpeta")
+    parser.add_argument("--desde", type=date.fromisoformat)
+    parser.add_argument("--hasta", type=date.fromisoformat)
+    args = parser.parse_args()
+
+    resultado = informe(args.carpeta, args.desde, args.hasta)
+    print(f"{resultado['dias']} días, {resultado['turnos']} turnos, total ${resultado['total']:.2f}\n")
+    for obra_social, monto in resultado["ingresos_por_obra_social"].items():
+        print(f"Obra Social: {obra_social.capitalize()}")
+        print(f"Monto Total: ${monto:.2f}\n")
+    for especialidad, monto in resultado["ingresos_por_especialidad"].items():
+        print(f"Especialidad: {especialidad.capitalize()} ${monto:.2f}")
+
+
+if __name__ == "__main__":
+    main()
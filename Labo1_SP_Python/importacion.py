@@ -0,0 +1,260 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Importación masiva de pacientes y turnos desde archivos CSV o JSONL.
+
+Las filas se leen en lotes y las reglas que no dependen de la clínica (nombre,
+edad, obra social y regla de PAMI, especialidad) se validan en un pool de
+procesos. El proceso principal aplica los resultados en el orden del archivo:
+rechaza DNIs ya registrados, calcula los montos de los turnos por lote y da
+de alta. Nunca hay más de unos pocos lotes en vuelo, así que la memoria no
+depende del tamaño del archivo. Las filas rechazadas se escriben en un
+reporte CSV a medida que aparecen.
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+
+from errores import DatosInvalidos, EspecialidadInvalida, ErrorClinica, PacienteDuplicado
+from paciente import Paciente
+from servicio import ServicioClinica, validar_datos_paciente
+from turno import Turno
+from validaciones import Validaciones
+
+PACIENTES = "pacientes"
+TURNOS = "turnos"
+
+# Configuración de cada proceso del pool, fijada por _iniciar_validador
+_obras_sociales_validas = []
+_especialidades = []
+
+
+@dataclass(frozen=True)
+class ResultadoImportacion:
+    filas: int
+    importadas: int
+    rechazadas: int
+    segundos: float
+
+    @property
+    def filas_por_segundo(self) -> float:
+        return self.filas / self.segundos if self.segundos else 0.0
+
+
+def leer_filas(archivo):
+    """
+    Recorre un CSV con encabezado o un JSONL (según la extensión) sin cargarlo entero.
+
+    Yields:
+        tuple: (número de fila, dict con los campos).
+    """
+    with open(archivo, 'r', newline='', encoding='utf-8') as file:
+        if archivo.lower().endswith(('.jsonl', '.ndjson')):
+            for numero, linea in enumerate(file, start=1):
+                if linea.strip():
+                    try:
+                        yield numero, json.loads(linea)
+                    except json.JSONDecodeError:
+                        yield numero, None
+        else:
+            # La fila 1 es el encabezado
+            yield from enumerate(csv.DictReader(file), start=2)
+
+
+def _iniciar_validador(obras_sociales_validas, especialidades):
+    global _obras_sociales_validas, _especialidades
+    _obras_sociales_validas = obras_sociales_validas
+    _especialidades = especialidades
+
+
+def _validar_fila(tipo, datos):
+    """
+    Devuelve los datos normalizados de la fila o lanza DatosInvalidos.
+    """
+    if not isinstance(datos, dict):
+        raise DatosInvalidos("La fila no es un objeto válido.")
+    if tipo == PACIENTES:
+        try:
+            return validar_datos_paciente(datos["nombre"], datos["apellido"], datos["dni"], datos["edad"],
+                                          datos["obra_social"], _obras_sociales_validas)
+        except (KeyError, AttributeError) as error:
+            raise DatosInvalidos(f"Falta o no es texto el campo {error}.") from error
+    especialidad = str(datos.get("especialidad") or "").strip()
+    if not Validaciones.validar_especialidad(especialidad, _especialidades):
+        raise EspecialidadInvalida("Especialidad no válida.")
+    if datos.get("dni"):
+        return "dni", str(datos["dni"]).strip(), especialidad
+    try:
+        return "id", int(datos["id_paciente"]), especialidad
+    except (KeyError, TypeError, ValueError) as error:
+        raise DatosInvalidos("El turno debe indicar el DNI o el id_paciente.") from error
+
+
+def _validar_lote(tipo, lote):
+    """
+    Valida un lote de filas en un proceso del pool.
+
+    Returns:
+        list: (número de fila, datos originales, datos normalizados o None, error o None).
+    """
+    resultados = []
+    for numero, datos in lote:
+        try:
+            resultados.append((numero, datos, _validar_fila(tipo, datos), None))
+        except DatosInvalidos as error:
+            resultados.append((numero, datos, None, str(error)))
+    return resultados
+
+
+def _lotes_validados(tipo, filas, obras_sociales_validas, especialidades, procesos, tamanio_lote):
+    """
+    Valida los lotes en el pool con a lo sumo 2 lotes por proceso en vuelo,
+    devolviéndolos en el orden del archivo.
+    """
+    lotes = iter(lambda: list(islice(filas, tamanio_lote)), [])
+    if procesos <= 1:
+        _iniciar_validador(obras_sociales_validas, especialidades)
+        for lote in lotes:
+            yield _validar_lote(tipo, lote)
+        return
+    with ProcessPoolExecutor(procesos, initializer=_iniciar_validador,
+                             initargs=(obras_sociales_validas, especialidades)) as pool:
+        en_vuelo = deque()
+        for lote in lotes:
+            en_vuelo.append(pool.submit(_validar_lote, tipo, lote))
+            if len(en_vuelo) >= 2 * procesos:
+                yield en_vuelo.popleft().result()
+        while en_vuelo:
+            yield en_vuelo.popleft().result()
+
+
+def importar(servicio, archivo, tipo, archivo_errores=None, procesos=None, tamanio_lote=500):
+    """
+    Importa pacientes o turnos desde un archivo CSV o JSONL.
+
+    Los pacientes necesitan las columnas nombre, apellido, dni, edad y
+    obra_social. Los turnos necesitan especialidad y dni o id_paciente, y se
+    dan de alta como 'Activo' con el monto que calcula el tarifario.
+
+    Args:
+        servicio (ServicioClinica): Servicio sobre la clínica destino.
+        archivo (str): Ruta del CSV (con encabezado) o JSONL.
+        tipo (str): PACIENTES o TURNOS.
+        archivo_errores (str): Ruta del reporte CSV de filas rechazadas (fila, error, datos).
+        procesos (int): Procesos del pool de validación; 1 valida en este proceso.
+        tamanio_lote (int): Filas por lote enviado al pool.
+
+    Returns:
+        ResultadoImportacion: Totales y tiempo de la importación.
+    """
+    if tipo not in (PACIENTES, TURNOS):
+        raise ValueError(f"Tipo de importación no válido: {tipo}")
+    clinica = servicio.clinica
+    procesos = procesos or os.cpu_count() or 1
+    filas = importadas = rechazadas = 0
+    inicio = time.perf_counter()
+
+    reporte = open(archivo_errores, 'w', newline='', encoding='utf-8') if archivo_errores else None
+    escritor = csv.writer(reporte) if reporte else None
+    if escritor:
+        escritor.writerow(("fila", "error", "datos"))
+    try:
+        for lote in _lotes_validados(tipo, leer_filas(archivo), clinica.obras_sociales_validas,
+                                     clinica.especialidades, procesos, tamanio_lote):
+            filas += len(lote)
+            for numero, datos, error in (_aplicar_pacientes(clinica, lote) if tipo == PACIENTES
+                                         else _aplicar_turnos(clinica, lote)):
+                if error is None:
+                    importadas += 1
+                else:
+                    rechazadas += 1
+                    if escritor:
+                        escritor.writerow((numero, error, json.dumps(datos, ensure_ascii=False)))
+    finally:
+        if reporte:
+            reporte.close()
+    return ResultadoImportacion(filas, importadas, rechazadas, time.perf_counter() - inicio)
+
+
+def _aplicar_pacientes(clinica, lote):
+    for numero, datos, validos, error in lote:
+        if error is None:
+            try:
+                # Cubre tanto el registro existente como los DNIs repetidos dentro del archivo
+                if clinica.obtener_paciente_por_dni(validos[2]):
+                    raise PacienteDuplicado("Ya existe un paciente con ese DNI.")
+                clinica.agregar_paciente(Paciente(*validos))
+            except ErrorClinica as excepcion:
+                error = str(excepcion)
+        yield numero, datos, error
+
+
+def _aplicar_turnos(clinica, lote):
+    pendientes = []
+    for numero, datos, validos, error in lote:
+        paciente = especialidad = None
+        if error is None:
+            clave, valor, especialidad = validos
+            paciente = (clinica.obtener_paciente_por_dni(valor) if clave == "dni"
+                        else clinica.obtener_paciente_por_id(valor))
+            if paciente is None:
+                error = "Paciente no encontrado."
+        pendientes.append((numero, datos, paciente, especialidad, error))
+
+    montos = iter(Validaciones.calcular_montos_a_pagar(
+        [(paciente.edad, paciente.obra_social) for _, _, paciente, _, error in pendientes if error is None]))
+    for numero, datos, paciente, especialidad, error in pendientes:
+        if error is None:
+            clinica.agregar_turno(Turno(paciente.id, especialidad, next(montos), Turno.ACTIVO))
+        yield numero, datos, error
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa pacientes o turnos desde CSV o JSONL.")
+    parser.add_argument("tipo", choices=(PACIENTES, TURNOS))
+    parser.add_argument("archivo")
+    parser.add_argument("--config", default="configs.json", help="Clínica destino; se guarda al terminar.")
+    parser.add_argument("--errores", default="errores_importacion.csv", help="Reporte de filas rechazadas.")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--lote", type=int, default=500)
+    args = parser.parse_args()
+
+    servicio = ServicioClinica()
+    servicio.cargar(args.config)
+    resultado = importar(servicio, args.archivo, args.tipo, args.errores, args.procesos, args.lote)
+    servicio.guardar(args.config)
+    print(f"{resultado.filas} filas: {resultado.importadas} importadas, {resultado.rechazadas} rechazadas "
+          f"en {resultado.segundos:.2f} s ({resultado.filas_por_segundo:,.0f} filas/s).")
+    if resultado.rechazadas:
+        print(f"Detalle de los rechazos en {args.errores}.")
+
+
+if __name__ == "__main__":
+    main()
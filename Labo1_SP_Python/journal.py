@@ -0,0 +1,193 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import os
+
+
+class Journal:
+    """
+    Registro de escritura anticipada (write-ahead) de la clínica.
+
+    Cada mutación se agrega como una línea JSON compacta. Las escrituras se
+    sincronizan a disco (fsync) por lotes para no pagar un fsync por operación.
+    """
+
+    def __init__(self, ruta, lote=32):
+        """
+        Abre el journal para agregar registros al final.
+
+        Args:
+            ruta (str): Ruta del archivo del journal.
+            lote (int): Cantidad de registros entre cada fsync.
+        """
+        self.ruta = ruta
+        self.lote = lote
+        self._descartar_linea_incompleta()
+        self._archivo = open(ruta, 'a', encoding='utf-8')
+        self._pendientes = 0
+
+    def _descartar_linea_incompleta(self):
+        """
+        Recorta una última línea sin terminar para que los registros nuevos
+        no queden pegados a ella.
+        """
+        if not os.path.exists(self.ruta):
+            return
+        with open(self.ruta, 'rb+') as file:
+            fin = file.seek(0, os.SEEK_END)
+            posicion = fin
+            while posicion > 0:
+                inicio = max(0, posicion - 4096)
+                file.seek(inicio)
+                bloque = file.read(posicion - inicio)
+                salto = bloque.rfind(b'\n')
+                if salto != -1:
+                    posicion = inicio + salto + 1
+                    break
+                posicion = inicio
+            if posicion != fin:
+                file.truncate(posicion)
+
+    def registrar(self, evento):
+        """
+        Agrega un evento al journal.
+
+        Args:
+            evento (dict): Registro serializable a JSON.
+        """
+        self._archivo.write(json.dumps(evento, separators=(',', ':')) + '\n')
+        self._pendientes += 1
+        if self._pendientes >= self.lote:
+            self.sincronizar()
+
+    def sincronizar(self):
+        """
+        Fuerza la escritura a disco de los registros pendientes.
+        """
+        self._archivo.flush()
+        os.fsync(self._archivo.fileno())
+        self._pendientes = 0
+
+    def truncar(self):
+        """
+        Vacía el journal y borra los segmentos rotados. Se usa después de
+        plegarlo en un snapshot nuevo.
+        """
+        self._archivo.flush()
+        self._archivo.truncate(0)
+        self.sincronizar()
+        Journal.descartar_segmentos(self.ruta)
+
+    def rotar(self, seq):
+        """
+        Cierra el archivo actual como segmento `ruta.seq` y sigue en uno vacío.
+        Lo usa el guardado en segundo plano: los eventos hasta `seq` quedan en
+        el segmento hasta que el snapshot que los incluye termina de escribirse.
+
+        Args:
+            seq (int): Último evento registrado en el archivo actual.
+        """
+        self._archivo.flush()
+        segmento = f"{self.ruta}.{seq}"
+        if os.fstat(self._archivo.fileno()).st_size == 0 or os.path.exists(segmento):
+            # Sin eventos no hay nada que rotar, y un segmento existente no se
+            # pisa: los eventos quedan en el archivo actual y el snapshot que
+            # los incluye hace que se salteen al reproducir.
+            return
+        self.cerrar()
+        os.replace(self.ruta, segmento)
+        self._archivo = open(self.ruta, 'a', encoding='utf-8')
+        self._pendientes = 0
+
+    @staticmethod
+    def segmentos(ruta):
+        """
+        Devuelve [(seq, ruta del segmento)] de los segmentos rotados, en orden.
+        """
+        carpeta, nombre = os.path.split(os.path.abspath(ruta))
+        encontrados = []
+        for archivo in os.listdir(carpeta):
+            sufijo = archivo[len(nombre) + 1:]
+            if archivo.startswith(nombre + ".") and sufijo.isdigit():
+                encontrados.append((int(sufijo), os.path.join(carpeta, archivo)))
+        return sorted(encontrados)
+
+    @staticmethod
+    def descartar_segmentos(ruta, hasta_seq=None):
+        """
+        Borra los segmentos rotados con seq <= hasta_seq (todos si es None).
+        """
+        for seq, segmento in Journal.segmentos(ruta):
+            if hasta_seq is None or seq <= hasta_seq:
+                os.remove(segmento)
+
+    def cerrar(self):
+        if not self._archivo.closed:
+            self.sincronizar()
+            self._archivo.close()
+
+    @staticmethod
+    def leer(ruta):
+        """
+        Recorre los eventos guardados en un journal: primero los de los
+        segmentos rotados que todavía no se borraron y después los del archivo.
+
+        Una última línea incompleta (corte a mitad de escritura) se descarta.
+
+        Args:
+            ruta (str): Ruta del archivo del journal.
+
+        Yields:
+            dict: Cada evento en el orden en que se registró.
+        """
+        for _, segmento in Journal.segmentos(ruta):
+            yield from Journal._leer_archivo(segmento)
+        if os.path.exists(ruta):
+            yield from Journal._leer_archivo(ruta)
+
+    @staticmethod
+    def _leer_archivo(ruta):
+        with open(ruta, 'r', encoding='utf-8') as file:
+            for linea in file:
+                try:
+                    yield json.loads(linea)
+                except json.JSONDecodeError:
+                    return
+
+
+def escribir_json_atomico(ruta, datos, **opciones):
+    """
+    Escribe un archivo JSON en un temporal y lo reemplaza con un rename atómico,
+    de modo que un corte nunca deja el archivo a medio escribir.
+
+    Args:
+        ruta (str): Ruta final del archivo.
+        datos: Objeto serializable a JSON.
+        **opciones: Argumentos adicionales para json.dump.
+    """
+    temporal = f"{ruta}.tmp"
+    with open(temporal, 'w') as file:
+        json.dump(datos, file, **opciones)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporal, ruta)
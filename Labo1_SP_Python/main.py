@@ -20,8 +20,12 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import sys
 from app import main_app
+import metricas
 
 
 if __name__ == "__main__":
+    if "--metricas" in sys.argv:
+        metricas.activar()
     main_app()
\ No newline at end of file
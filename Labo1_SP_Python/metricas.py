@@ -0,0 +1,265 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Instrumentación opcional de las operaciones de la clínica.
+
+Se activa con la variable de entorno CLINICA_METRICAS=1, con main.py --metricas
+o llamando a activar(). Desactivada, cada operación instrumentada solo paga
+la consulta de una variable global.
+"""
+
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+
+_activo = os.environ.get("CLINICA_METRICAS", "") not in ("", "0")
+# Clinica(concurrente=True) mide desde varios hilos; solo se toma con las métricas activas
+_lock = threading.Lock()
+
+# Límites de los buckets del histograma: de 1 µs a ~100 s, cada uno 2^(1/4) veces el anterior
+_LIMITES = [1e-6 * 2 ** (i / 4) for i in range(108)]
+
+
+class Histograma:
+    """
+    Histograma de latencias con buckets logarítmicos. Los percentiles se
+    informan con el límite superior del bucket (error relativo menor al 19%).
+    """
+
+    def __init__(self):
+        self.cuentas = [0] * (len(_LIMITES) + 1)
+        self.cantidad = 0
+        self.suma = 0.0
+        self.maximo = 0.0
+
+    def registrar(self, segundos):
+        self.cuentas[bisect.bisect_left(_LIMITES, segundos)] += 1
+        self.cantidad += 1
+        self.suma += segundos
+        if segundos > self.maximo:
+            self.maximo = segundos
+
+    def percentil(self, q):
+        """
+        Args:
+            q (float): Percentil entre 0 y 1.
+
+        Returns:
+            float: Segundos, o 0.0 si no hay muestras.
+        """
+        if not self.cantidad:
+            return 0.0
+        objetivo = q * self.cantidad
+        acumulado = 0
+        for indice, cuenta in enumerate(self.cuentas):
+            acumulado += cuenta
+            if acumulado >= objetivo and cuenta:
+                return min(_LIMITES[indice] if indice < len(_LIMITES) else self.maximo, self.maximo)
+        return self.maximo
+
+
+class _Operacion:
+    __slots__ = ('llamadas', 'registros', 'latencias')
+
+    def __init__(self):
+        self.llamadas = 0
+        self.registros = 0
+        self.latencias = Histograma()
+
+
+_operaciones = {}
+
+
+def _operacion(nombre):
+    # Se llama con _lock tomado
+    operacion = _operaciones.get(nombre)
+    if operacion is None:
+        operacion = _operaciones[nombre] = _Operacion()
+    return operacion
+
+
+def activar():
+    global _activo
+    _activo = True
+
+
+def desactivar():
+    global _activo
+    _activo = False
+
+
+def esta_activo():
+    return _activo
+
+
+def reiniciar():
+    with _lock:
+        _operaciones.clear()
+
+
+def registrar_latencia(nombre, segundos):
+    if not _activo:
+        return
+    with _lock:
+        operacion = _operacion(nombre)
+        operacion.llamadas += 1
+        operacion.latencias.registrar(segundos)
+
+
+def contar(nombre, registros):
+    """
+    Suma la cantidad de registros (pacientes o turnos) que tocó una operación.
+    """
+    if _activo:
+        with _lock:
+            _operacion(nombre).registros += registros
+
+
+def medir(nombre):
+    """
+    Decorador que registra llamadas y latencia de la función con el nombre dado.
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _activo:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                registrar_latencia(nombre, time.perf_counter() - inicio)
+        return envoltura
+    return decorador
+
+
+class _Tramo:
+    __slots__ = ('nombre', 'inicio')
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excepcion):
+        registrar_latencia(self.nombre, time.perf_counter() - self.inicio)
+        return False
+
+
+class _TramoInactivo:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        return False
+
+
+_TRAMO_INACTIVO = _TramoInactivo()
+
+
+def tramo(nombre):
+    """
+    Context manager que mide un bloque, por ejemplo la E/S JSON de guardar_datos.
+    """
+    return _Tramo(nombre) if _activo else _TRAMO_INACTIVO
+
+
+def medir_iterador(nombre, iterable):
+    """
+    Mide el tiempo total que se pasa produciendo los elementos de un iterable,
+    sin contar lo que hace el consumidor con cada uno. Se usa para la lectura
+    incremental de configs.json.
+    """
+    if not _activo:
+        yield from iterable
+        return
+    iterador = iter(iterable)
+    total = 0.0
+    try:
+        while True:
+            inicio = time.perf_counter()
+            try:
+                elemento = next(iterador)
+            except StopIteration:
+                return
+            finally:
+                total += time.perf_counter() - inicio
+            yield elemento
+    finally:
+        registrar_latencia(nombre, total)
+
+
+def resumen():
+    """
+    Returns:
+        dict: {operacion: {llamadas, registros, p50, p99, maximo, total}} con tiempos en segundos.
+    """
+    with _lock:
+        return {nombre: {"llamadas": operacion.llamadas,
+                         "registros": operacion.registros,
+                         "p50": operacion.latencias.percentil(0.50),
+                         "p99": operacion.latencias.percentil(0.99),
+                         "maximo": operacion.latencias.maximo,
+                         "total": operacion.latencias.suma}
+                for nombre, operacion in sorted(_operaciones.items())}
+
+
+def a_prometheus():
+    """
+    Devuelve las métricas en el formato de texto de Prometheus.
+    """
+    lineas = ["# HELP clinica_operacion_segundos Latencia de las operaciones de la clínica.",
+              "# TYPE clinica_operacion_segundos summary"]
+    for nombre, datos in resumen().items():
+        etiqueta = f'operacion="{nombre}"'
+        lineas.append(f'clinica_operacion_segundos{{{etiqueta},quantile="0.5"}} {datos["p50"]:.9f}')
+        lineas.append(f'clinica_operacion_segundos{{{etiqueta},quantile="0.99"}} {datos["p99"]:.9f}')
+        lineas.append(f'clinica_operacion_segundos_sum{{{etiqueta}}} {datos["total"]:.9f}')
+        lineas.append(f'clinica_operacion_segundos_count{{{etiqueta}}} {datos["llamadas"]}')
+    lineas.append("# HELP clinica_operacion_registros_total Registros tocados por las operaciones de la clínica.")
+    lineas.append("# TYPE clinica_operacion_registros_total counter")
+    for nombre, datos in resumen().items():
+        lineas.append(f'clinica_operacion_registros_total{{operacion="{nombre}"}} {datos["registros"]}')
+    return "\n".join(lineas) + "\n"
+
+
+def exportar(ruta, formato="json"):
+    """
+    Guarda las métricas en un archivo local.
+
+    Args:
+        ruta (str): Ruta del archivo.
+        formato (str): 'json' o 'prometheus'.
+    """
+    with open(ruta, 'w') as file:
+        if formato == "prometheus":
+            file.write(a_prometheus())
+        else:
+            json.dump(resumen(), file, indent=4)
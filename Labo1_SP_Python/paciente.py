@@ -20,9 +20,18 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 import itertools
-from datetime import datetime
+import sys
+from datetime import datetime, timedelta
+
+# Origen para guardar fecha_registro como segundos desde 1970 en hora local,
+# lo que permite volver exactamente al mismo texto al serializar.
+_EPOCA = datetime(1970, 1, 1)
+_FORMATO_FECHA = "%Y-%m-%d %H:%M:%S"
 
 class Paciente():
+    __slots__ = ('id', 'nombre', 'apellido', 'dni', 'edad', 'obra_social', 'registro_ts')
+
+    # next() sobre itertools.count es atómico en CPython, así que no hace falta un lock
     id_counter = itertools.count(1)
 
     def __init__(self, nombre, apellido, dni, edad, obra_social):
@@ -32,14 +41,66 @@ class Paciente():
         Args:
             nombre (str): Nombre del paciente.
             apellido (str): Apellido del paciente.
-            dni (str): DNI del paciente.
+            dni (str): DNI del paciente. Se guarda como entero si es numérico.
             edad (int): Edad del paciente.
             obra_social (str): Obra social del paciente.
         """
         self.id = next(Paciente.id_counter)
         self.nombre = nombre
         self.apellido = apellido
-        self.dni = dni
-        self.edad = edad
-        self.obra_social = obra_social
-        self.fecha_registro = datetime.now(tz=None).strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
+        self.dni = Paciente.codificar_dni(dni)
+        try:
+            self.edad = int(edad)
+        except (TypeError, ValueError):
+            self.edad = edad
+        self.obra_social = sys.intern(obra_social) if isinstance(obra_social, str) else obra_social
+        self.registro_ts = int((datetime.now(tz=None) - _EPOCA).total_seconds())
+
+    @classmethod
+    def restaurar(cls, id_paciente, nombre, apellido, dni, edad, obra_social, registro_ts):
+        """
+        Reconstruye un paciente guardado sin consumir un ID del contador ni
+        consultar la hora actual.
+        """
+        paciente = cls.__new__(cls)
+        paciente.id = id_paciente
+        paciente.nombre = nombre
+        paciente.apellido = apellido
+        paciente.dni = cls.codificar_dni(dni)
+        paciente.edad = edad
+        paciente.obra_social = sys.intern(obra_social)
+        paciente.registro_ts = registro_ts
+        return paciente
+
+    @staticmethod
+    def codificar_dni(dni):
+        """
+        Convierte el DNI a entero cuando se puede hacer sin perder información
+        (solo dígitos y sin ceros a la izquierda). Se usa también para buscar por DNI.
+        """
+        texto = str(dni).strip()
+        if texto.isascii() and texto.isdigit() and (texto == "0" or texto[0] != "0"):
+            return int(texto)
+        return texto
+
+    @property
+    def fecha_registro(self):
+        return (_EPOCA + timedelta(seconds=self.registro_ts)).strftime(_FORMATO_FECHA)
+
+    @fecha_registro.setter
+    def fecha_registro(self, fecha):
+        self.registro_ts = int((datetime.fromisoformat(fecha) - _EPOCA).total_seconds())
+
+    def a_dict(self):
+        """
+        Devuelve el paciente con el formato de configs.json.
+        """
+        return {
+            "id": self.id,
+            "nombre": self.nombre,
+            "apellido": self.apellido,
+            "dni": str(self.dni),
+            "edad": str(self.edad),
+            "obra_social": self.obra_social,
+            "fecha_registro": self.fecha_registro
+        }
\ No newline at end of file
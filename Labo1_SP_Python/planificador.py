@@ -0,0 +1,201 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Planificador de atención: una cola de prioridad por especialidad.
+"""
+
+import heapq
+import itertools
+import time
+
+LLEGADA = "llegada"
+EDAD = "edad"
+
+
+class PlanificadorAtencion:
+    """
+    Mantiene los turnos activos en un heap por especialidad y decide a quién
+    atender en cada ciclo. Quitar un turno es O(1): su entrada queda en el
+    heap marcada como vencida y se descarta al llegar al tope.
+
+    La prioridad es una clave que se calcula al encolar (menor se atiende
+    antes) y los empates se resuelven por orden de llegada. Políticas:
+    LLEGADA (orden de llegada), EDAD (mayor edad primero) o una función
+    (turno, paciente) -> clave.
+    """
+
+    def __init__(self, politica=LLEGADA, cupo_por_especialidad=None, obtener_paciente=None, reloj=time.monotonic):
+        """
+        Args:
+            politica (str | callable): LLEGADA, EDAD o función (turno, paciente) -> clave.
+            cupo_por_especialidad (int): Máximo de turnos por especialidad en cada ciclo; None sin límite.
+            obtener_paciente (callable): Devuelve el paciente de un id, para las políticas que lo usan.
+            reloj (callable): Fuente de tiempo en segundos para medir la espera.
+        """
+        self._obtener_paciente = obtener_paciente or (lambda id_paciente: None)
+        self._reloj = reloj
+        self._secuencia = itertools.count()
+        # {especialidad: heap de entradas [prioridad, secuencia, llegada, turno]}
+        self._colas = {}
+        # Entradas vigentes por id de turno, en orden de llegada
+        self._entradas = {}
+        # Cambios en _entradas y último recorrido de pagina(): (cambios, próxima posición, iterador)
+        self._cambios = 0
+        self._cursor = None
+        self._profundidad = {}
+        # {especialidad: [suma de esperas, turnos atendidos]}
+        self._esperas = {}
+        self.configurar(politica, cupo_por_especialidad)
+
+    def configurar(self, politica=LLEGADA, cupo_por_especialidad=None):
+        """
+        Cambia la política y el cupo. Los turnos en espera conservan su orden
+        de llegada y su hora de ingreso; solo se recalcula la prioridad.
+        """
+        if politica == LLEGADA:
+            self._prioridad = None
+        elif politica == EDAD:
+            self._prioridad = lambda turno, paciente: -int(paciente.edad) if paciente else 0
+        elif callable(politica):
+            self._prioridad = politica
+        else:
+            raise ValueError(f"Política de atención no válida: {politica}")
+        if cupo_por_especialidad is not None and cupo_por_especialidad < 1:
+            raise ValueError("El cupo por especialidad debe ser al menos 1.")
+        self.politica = politica
+        self.cupo_por_especialidad = cupo_por_especialidad
+        for cola in self._colas.values():
+            cola[:] = [entrada for entrada in cola if self._entradas.get(entrada[3].id) is entrada]
+            for entrada in cola:
+                entrada[0] = self._calcular_prioridad(entrada[3])
+            heapq.heapify(cola)
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __bool__(self):
+        return bool(self._entradas)
+
+    def __iter__(self):
+        """
+        Recorre los turnos en espera en orden de llegada.
+        """
+        return (entrada[3] for entrada in list(self._entradas.values()))
+
+    def pagina(self, inicio, cantidad):
+        """
+        Devuelve `cantidad` turnos en espera desde la posición `inicio`, en orden
+        de llegada. islice saltea las entradas anteriores en C, sin copiarlas;
+        si la página empieza donde terminó la anterior y la espera no cambió,
+        se sigue con el mismo iterador, así recorrer la cola de a páginas es lineal.
+        """
+        cursor = self._cursor
+        if cursor is not None and cursor[0] == self._cambios and cursor[1] == inicio:
+            entradas = cursor[2]
+        else:
+            entradas = itertools.islice(self._entradas.values(), inicio, None)
+        turnos = [entrada[3] for entrada in itertools.islice(entradas, cantidad)]
+        self._cursor = (self._cambios, inicio + len(turnos), entradas)
+        return turnos
+
+    def _calcular_prioridad(self, turno):
+        if self._prioridad is None:
+            return 0  # Por orden de llegada no hace falta buscar al paciente
+        return self._prioridad(turno, self._obtener_paciente(turno.id_paciente))
+
+    def encolar(self, turno):
+        entrada = [self._calcular_prioridad(turno), next(self._secuencia), self._reloj(), turno]
+        self.quitar(turno)
+        self._entradas[turno.id] = entrada
+        self._cambios += 1
+        heapq.heappush(self._colas.setdefault(turno.especialidad, []), entrada)
+        self._profundidad[turno.especialidad] = self._profundidad.get(turno.especialidad, 0) + 1
+
+    def quitar(self, turno):
+        """
+        Saca el turno de la espera si estaba; su entrada en el heap queda vencida.
+        """
+        entrada = self._entradas.pop(turno.id, None)
+        if entrada is None:
+            return
+        self._cambios += 1
+        especialidad = entrada[3].especialidad
+        self._profundidad[especialidad] -= 1
+        cola = self._colas[especialidad]
+        if len(cola) > 2 * self._profundidad[especialidad] + 16:
+            cola[:] = [e for e in cola if self._entradas.get(e[3].id) is e]
+            heapq.heapify(cola)
+
+    def _tope(self, especialidad):
+        cola = self._colas[especialidad]
+        while cola and self._entradas.get(cola[0][3].id) is not cola[0]:
+            heapq.heappop(cola)
+        return cola[0] if cola else None
+
+    def extraer(self, cantidad=None):
+        """
+        Saca los turnos a atender en un ciclo: en cada paso el de mejor prioridad
+        entre los topes de las especialidades que no agotaron su cupo.
+
+        Args:
+            cantidad (int): Máximo total de turnos del ciclo; None sin límite.
+
+        Returns:
+            list: Turnos en el orden en que se atienden.
+        """
+        atendidos = []
+        usados = dict.fromkeys(self._colas, 0)
+        ahora = self._reloj()
+        while cantidad is None or len(atendidos) < cantidad:
+            mejor = None
+            for especialidad in self._colas:
+                if self.cupo_por_especialidad is not None and usados[especialidad] >= self.cupo_por_especialidad:
+                    continue
+                tope = self._tope(especialidad)
+                if tope is not None and (mejor is None or tope[:2] < mejor[:2]):
+                    mejor = tope
+            if mejor is None:
+                break
+            turno = mejor[3]
+            heapq.heappop(self._colas[turno.especialidad])
+            del self._entradas[turno.id]
+            self._cambios += 1
+            self._profundidad[turno.especialidad] -= 1
+            usados[turno.especialidad] += 1
+            espera = self._esperas.setdefault(turno.especialidad, [0.0, 0])
+            espera[0] += ahora - mejor[2]
+            espera[1] += 1
+            atendidos.append(turno)
+        return atendidos
+
+    def profundidad(self):
+        """
+        Devuelve {especialidad: turnos en espera}.
+        """
+        return {especialidad: n for especialidad, n in self._profundidad.items() if n}
+
+    def espera_promedio(self):
+        """
+        Devuelve {especialidad: segundos promedio de espera de los turnos ya atendidos}.
+        """
+        return {especialidad: suma / n for especialidad, (suma, n) in self._esperas.items() if n}
@@ -0,0 +1,318 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from clinica import Clinica
+from errores import ConfiguracionInvalida, DatosInvalidos, EspecialidadInvalida, PacienteDuplicado, PacienteNoEncontrado
+from guardado import Guardado
+from paciente import Paciente
+from turno import Turno
+from validaciones import Validaciones
+
+
+def validar_datos_paciente(nombre: str, apellido: str, dni: str, edad, obra_social: str,
+                           obras_sociales_validas: list) -> tuple:
+    """
+    Aplica las reglas de Validaciones a los datos de un paciente sin consultar
+    la clínica, por lo que también puede correr en otro proceso.
+
+    Returns:
+        tuple: (nombre, apellido, dni, edad, obra_social) sin espacios sobrantes.
+
+    Raises:
+        DatosInvalidos: Si algún dato no cumple las reglas.
+    """
+    nombre, apellido, dni, obra_social = nombre.strip(), apellido.strip(), str(dni).strip(), obra_social.strip()
+    if not Validaciones.validar_nombre_apellido(nombre, apellido):
+        raise DatosInvalidos("Nombre o apellido no válidos. Deben contener solo caracteres alfabéticos "
+                             "y no exceder los 30 caracteres.")
+    if not dni:
+        raise DatosInvalidos("El DNI es obligatorio.")
+    if not Validaciones.es_edad_valida(edad):
+        raise DatosInvalidos("La edad debe ser un número entero entre 18 y 90.")
+    if not Validaciones.validar_obra_social(obra_social, edad, obras_sociales_validas):
+        raise DatosInvalidos("Obra social no válida.")
+    return nombre, apellido, dni, edad, obra_social
+
+
+@dataclass(frozen=True)
+class TurnoEnEspera:
+    turno: Turno
+    paciente: Paciente
+
+
+@dataclass(frozen=True)
+class ResultadoCobro:
+    turnos: tuple
+    monto_cobrado: float
+    recaudacion: float
+
+
+@dataclass(frozen=True)
+class Informe:
+    ingresos_por_obra_social: dict
+    ingresos_por_especialidad: dict
+    obra_social_menos_ingresos: Optional[str] = None
+    total_menos_ingresos: float = 0.0
+
+
+@dataclass(frozen=True)
+class CoincidenciaPaciente:
+    paciente: Paciente
+    similitud: float
+
+
+@dataclass(frozen=True)
+class EstadoCola:
+    especialidad: str
+    en_espera: int
+    espera_promedio: Optional[float] = None
+
+
+class ServicioClinica:
+    """
+    Capa de servicio sin entrada/salida por consola sobre una Clinica.
+
+    Recibe argumentos tipados, devuelve objetos de resultado y reporta los
+    problemas con las excepciones de errores.py. Es la API para scripts,
+    servicios y benchmarks; app.main_app es un adaptador de consola sobre ella.
+    """
+
+    def __init__(self, razon_social: str = "Clínica", clinica: Optional[Clinica] = None):
+        self.clinica = clinica if clinica is not None else Clinica(razon_social)
+
+    def cargar(self, archivo_config: str, incremental: bool = True) -> None:
+        """
+        Carga la clínica desde un archivo de configuración.
+
+        Raises:
+            FileNotFoundError: Si el archivo no existe.
+            ConfiguracionInvalida: Si el archivo no es JSON válido.
+        """
+        try:
+            self.clinica.leer_configuracion(archivo_config, incremental)
+        except json.JSONDecodeError as error:
+            raise ConfiguracionInvalida(f"Error al decodificar el archivo {archivo_config}.") from error
+
+    def abrir_journal(self, ruta_journal: str, lote: int = 32) -> None:
+        self.clinica.abrir_journal(ruta_journal, lote)
+
+    def cerrar_journal(self) -> None:
+        self.clinica.cerrar_journal()
+
+    def abrir_almacenamiento(self, almacenamiento) -> None:
+        """
+        Carga la clínica desde un almacenamiento (AlmacenamientoJSON o
+        AlmacenamientoSQLite) en lugar de cargar(); guardar y cerrar_caja
+        escriben en él.
+        """
+        self.clinica.abrir_almacenamiento(almacenamiento)
+
+    def cerrar_almacenamiento(self) -> None:
+        self.clinica.cerrar_almacenamiento()
+
+    def guardar(self, archivo_config: str) -> None:
+        self.clinica.compactar(archivo_config)
+
+    def alta_paciente(self, nombre: str, apellido: str, dni: str, edad: int, obra_social: str) -> Paciente:
+        """
+        Valida los datos y da de alta un paciente.
+
+        Raises:
+            DatosInvalidos: Si algún dato no cumple las reglas de Validaciones.
+            PacienteDuplicado: Si ya existe un paciente con ese DNI.
+        """
+        nombre, apellido, dni, edad, obra_social = validar_datos_paciente(
+            nombre, apellido, dni, edad, obra_social, self.clinica.obras_sociales_validas)
+        # Se verifica antes de crear el paciente para no consumir un ID
+        if self.clinica.obtener_paciente_por_dni(dni):
+            raise PacienteDuplicado("Ya existe un paciente con ese DNI.")
+        return self.clinica.agregar_paciente(Paciente(nombre, apellido, dni, edad, obra_social))
+
+    def alta_turno(self, id_paciente: int, especialidad: str) -> Turno:
+        """
+        Da de alta un turno 'Activo' con el monto calculado según el paciente.
+
+        Raises:
+            EspecialidadInvalida: Si la especialidad no es de la clínica.
+            PacienteNoEncontrado: Si no existe un paciente con ese ID.
+        """
+        if not Validaciones.validar_especialidad(especialidad, self.clinica.especialidades):
+            raise EspecialidadInvalida("Especialidad no válida.")
+        paciente = self.clinica.obtener_paciente_por_id(id_paciente)
+        if paciente is None:
+            raise PacienteNoEncontrado("Paciente no encontrado.")
+        monto_a_pagar = Validaciones.calcular_monto_a_pagar(paciente.edad, paciente.obra_social)
+        return self.clinica.agregar_turno(Turno(id_paciente, especialidad, monto_a_pagar, Turno.ACTIVO))
+
+    def obtener_paciente(self, id_paciente: int) -> Paciente:
+        """
+        Raises:
+            PacienteNoEncontrado: Si no existe un paciente con ese ID.
+        """
+        paciente = self.clinica.obtener_paciente_por_id(id_paciente)
+        if paciente is None:
+            raise PacienteNoEncontrado("Paciente no encontrado.")
+        return paciente
+
+    def buscar_pacientes(self, texto: str, limite: int = 20) -> list:
+        """
+        Busca pacientes por prefijos de nombre y apellido ('uri gui').
+        """
+        return self.clinica.buscar_pacientes(texto, limite)
+
+    def pacientes_similares(self, texto: str, umbral: float = 0.5, limite: int = 20) -> list:
+        """
+        Busca pacientes con nombres parecidos al texto y devuelve CoincidenciaPaciente
+        de mayor a menor similitud.
+        """
+        return [CoincidenciaPaciente(paciente, similitud)
+                for paciente, similitud in self.clinica.pacientes_similares(texto, umbral, limite)]
+
+    def candidatos_duplicados(self, umbral: float = 0.7) -> list:
+        """
+        Grupos de pacientes con nombres iguales o parecidos y distinto DNI (busqueda.GrupoDuplicados).
+        """
+        return self.clinica.candidatos_duplicados(umbral)
+
+    def turnos_ordenados(self, criterio: int) -> Iterator[Turno]:
+        """
+        Raises:
+            DatosInvalidos: Si el criterio no es 1 (obra social) ni 2 (monto).
+        """
+        try:
+            return self.clinica.ordenar_turnos(criterio)
+        except ValueError as error:
+            raise DatosInvalidos(str(error)) from error
+
+    def pacientes_en_espera(self) -> Iterator[TurnoEnEspera]:
+        """
+        Recorre los turnos activos en orden de atención junto con su paciente.
+        """
+        for turno in self.clinica.turnos_en_espera():
+            yield TurnoEnEspera(turno, self.clinica.obtener_paciente_por_id(turno.id_paciente))
+
+    def atender(self, cantidad: int = 2) -> list:
+        """
+        Atiende un ciclo de hasta `cantidad` turnos activos y devuelve los atendidos.
+        """
+        return self.clinica.atender_pacientes(cantidad)
+
+    def configurar_atencion(self, politica="llegada", cupo_por_especialidad: Optional[int] = None) -> None:
+        """
+        Elige la política de atención ('llegada', 'edad' o función (turno, paciente) -> clave)
+        y cuántos turnos por especialidad se atienden en cada ciclo.
+
+        Raises:
+            ValueError: Si la política o el cupo no son válidos.
+        """
+        self.clinica.configurar_atencion(politica, cupo_por_especialidad)
+
+    def colas(self) -> list:
+        """
+        Devuelve la profundidad de cada cola y la espera promedio de los turnos ya atendidos.
+        """
+        profundidad = self.clinica.profundidad_por_especialidad()
+        esperas = self.clinica.espera_promedio_por_especialidad()
+        return [EstadoCola(especialidad, profundidad.get(especialidad, 0), esperas.get(especialidad))
+                for especialidad in sorted(profundidad.keys() | esperas.keys())]
+
+    def cobrar(self) -> ResultadoCobro:
+        cobrados = self.clinica.cobrar_atenciones()
+        return ResultadoCobro(tuple(cobrados), sum(t.monto_a_pagar for t in cobrados), self.clinica.recaudacion)
+
+    def cerrar_caja(self, archivo_config: str, carpeta_historico: Optional[str] = None) -> Guardado:
+        """
+        Cierra la caja y guarda el estado en segundo plano. El handle devuelto
+        tiene el total recaudado en `recaudacion` y esperar() para bloquear
+        hasta que los archivos estén escritos. Con carpeta_historico los
+        turnos pagados se mueven al histórico particionado por fecha.
+
+        Raises:
+            CajaConPendientes: Si quedan turnos activos o finalizados.
+            OSError: Si no se pudo escribir el histórico.
+        """
+        return self.clinica.cerrar_caja(archivo_config, carpeta_historico)
+
+    def tomar_error_de_guardado(self) -> Optional[Exception]:
+        """
+        Error del último guardado en segundo plano que falló (cierre de caja o
+        autoguardado), o None. Cada error se devuelve una sola vez.
+        """
+        return self.clinica.tomar_error_de_guardado()
+
+    def iniciar_autoguardado(self, archivo_config: str, intervalo: float = 60.0) -> None:
+        """
+        Guarda en segundo plano cada `intervalo` segundos si hubo cambios.
+        """
+        self.clinica.iniciar_autoguardado(archivo_config, intervalo)
+
+    def detener_autoguardado(self) -> None:
+        self.clinica.detener_autoguardado()
+
+    def ingresos(self, dimensiones: tuple = ("obra_social",), **filtros) -> dict:
+        """
+        Consulta el cubo de ingresos: agrupa por dimensiones de cubo.DIMENSIONES
+        y filtra por obra_social, especialidad, franja, desde y hasta.
+
+        Raises:
+            DatosInvalidos: Si alguna dimensión o filtro no existe.
+        """
+        try:
+            return self.clinica.consultar_ingresos(tuple(dimensiones), **filtros)
+        except (TypeError, ValueError) as error:
+            raise DatosInvalidos(str(error)) from error
+
+    def consultar_turnos(self, **filtros) -> Iterator[Turno]:
+        """
+        Turnos filtrados por estado, especialidad, obra_social (valor o lista de
+        valores) y rango monto_desde / monto_hasta, en orden de alta.
+
+        Raises:
+            DatosInvalidos: Si algún filtro no existe.
+        """
+        try:
+            return self.clinica.consultar_turnos(**filtros)
+        except (TypeError, ValueError) as error:
+            raise DatosInvalidos(str(error)) from error
+
+    def contar_turnos(self, **filtros) -> int:
+        """
+        Cantidad de turnos que devolvería consultar_turnos con los mismos filtros.
+
+        Raises:
+            DatosInvalidos: Si algún filtro no existe.
+        """
+        try:
+            return self.clinica.contar_turnos(**filtros)
+        except (TypeError, ValueError) as error:
+            raise DatosInvalidos(str(error)) from error
+
+    def informe(self) -> Informe:
+        instantanea = self.clinica.instantanea()
+        menos_ingresos = instantanea["obra_social_menos_ingresos"]
+        obra_social, total = menos_ingresos if menos_ingresos else (None, 0.0)
+        return Informe(instantanea["ingresos_por_obra_social"], instantanea["ingresos_por_especialidad"],
+                       obra_social, total)
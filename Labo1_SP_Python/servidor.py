@@ -0,0 +1,254 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Servidor asyncio para que varios puestos de recepción usen la misma clínica.
+
+Protocolo: JSON por línea sobre TCP. Cada pedido es un objeto con "op", un
+"id" opcional que se devuelve en la respuesta y los argumentos de la
+operación; la respuesta es {"id", "ok": true, "resultado"} o
+{"id", "ok": false, "error": <clase de la excepción>, "mensaje"}.
+
+Las operaciones que modifican la clínica se encolan y las aplica de a una
+una única tarea escritora; las lecturas se responden en el momento. Como
+todo corre en el mismo hilo y cada mutación se aplica entera sin ceder el
+control, una lectura nunca ve una mutación a medias.
+
+    python servidor.py --config configs.json --journal configs.journal --puerto 8765
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import itertools
+import json
+import logging
+
+from errores import DatosInvalidos, ErrorClinica
+from guardado import Guardado
+from servicio import ServicioClinica
+
+_LIMITE_LINEA = 1 << 16
+_log = logging.getLogger(__name__)
+_FILTROS_TURNOS = ("estado", "especialidad", "obra_social", "monto_desde", "monto_hasta")
+
+
+def _a_json(valor):
+    """
+    Convierte pacientes, turnos y resultados del servicio a tipos de JSON.
+    """
+    if hasattr(valor, "a_dict"):
+        return valor.a_dict()
+    if dataclasses.is_dataclass(valor):
+        return {campo.name: _a_json(getattr(valor, campo.name)) for campo in dataclasses.fields(valor)}
+    if isinstance(valor, (list, tuple)):
+        return [_a_json(elemento) for elemento in valor]
+    if isinstance(valor, dict):
+        return {clave: _a_json(elemento) for clave, elemento in valor.items()}
+    return valor
+
+
+class ServidorClinica:
+    """
+    Expone un ServicioClinica por TCP.
+    """
+
+    def __init__(self, servicio, archivo_config):
+        """
+        Args:
+            servicio (ServicioClinica): Servicio ya cargado.
+            archivo_config (str): Archivo donde guarda cerrar_caja.
+        """
+        self.servicio = servicio
+        self.archivo_config = archivo_config
+        self._mutaciones = None
+        self._escritor = None
+        self._servidor = None
+        self.clientes = 0
+        self._lecturas = {
+            "en_espera": lambda pedido: list(self.servicio.pacientes_en_espera()),
+            "informe": lambda pedido: self.servicio.informe(),
+            "colas": lambda pedido: self.servicio.colas(),
+            "paciente": lambda pedido: self.servicio.obtener_paciente(int(pedido["id_paciente"])),
+            "buscar": lambda pedido: self.servicio.buscar_pacientes(pedido["texto"], pedido.get("limite", 20)),
+            "turnos": self._consultar_turnos,
+        }
+        self._escrituras = {
+            "alta_paciente": lambda pedido: self.servicio.alta_paciente(
+                pedido["nombre"], pedido["apellido"], pedido["dni"], pedido["edad"], pedido["obra_social"]),
+            "alta_turno": lambda pedido: self.servicio.alta_turno(int(pedido["id_paciente"]),
+                                                                  pedido["especialidad"]),
+            "atender": lambda pedido: self.servicio.atender(pedido.get("cantidad", 2)),
+            "cobrar": lambda pedido: self.servicio.cobrar(),
+            # Devuelve el Guardado: _responder espera la escritura sin frenar a la tarea escritora
+            "cerrar_caja": lambda pedido: self.servicio.cerrar_caja(self.archivo_config),
+        }
+
+    def _consultar_turnos(self, pedido):
+        """
+        Cantidad total de turnos que cumplen los filtros del pedido y los
+        primeros `limite` (100 por defecto).
+        """
+        filtros = {clave: pedido[clave] for clave in _FILTROS_TURNOS if clave in pedido}
+        turnos = self.servicio.consultar_turnos(**filtros)
+        return {"cantidad": self.servicio.contar_turnos(**filtros),
+                "turnos": list(itertools.islice(turnos, pedido.get("limite", 100)))}
+
+    async def iniciar(self, host="127.0.0.1", puerto=8765):
+        """
+        Empieza a escuchar y arranca la tarea escritora.
+
+        Returns:
+            int: Puerto en el que escucha (útil con puerto=0).
+        """
+        self._mutaciones = asyncio.Queue()
+        self._escritor = asyncio.create_task(self._aplicar_mutaciones())
+        self._servidor = await asyncio.start_server(self._atender_cliente, host, puerto, limit=_LIMITE_LINEA)
+        return self._servidor.sockets[0].getsockname()[1]
+
+    async def detener(self):
+        self._servidor.close()
+        await self._servidor.wait_closed()
+        await self._mutaciones.join()
+        self._escritor.cancel()
+
+    async def servir(self, host="127.0.0.1", puerto=8765):
+        await self.iniciar(host, puerto)
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    async def _aplicar_mutaciones(self):
+        """
+        Única tarea que modifica la clínica: aplica los pedidos en orden de llegada.
+        """
+        while True:
+            operacion, pedido, futuro = await self._mutaciones.get()
+            try:
+                resultado = operacion(pedido)
+            except Exception as error:
+                if not futuro.cancelled():
+                    futuro.set_exception(error)
+            else:
+                if not futuro.cancelled():
+                    futuro.set_result(resultado)
+            finally:
+                self._mutaciones.task_done()
+
+    async def _responder(self, pedido):
+        op = pedido.get("op")
+        if op in self._lecturas:
+            return self._lecturas[op](pedido)
+        if op in self._escrituras:
+            futuro = asyncio.get_running_loop().create_future()
+            await self._mutaciones.put((self._escrituras[op], pedido, futuro))
+            resultado = await futuro
+            if isinstance(resultado, Guardado):
+                try:
+                    await asyncio.to_thread(resultado.esperar)
+                except Exception:
+                    # Queda informado en esta respuesta
+                    self.servicio.tomar_error_de_guardado()
+                    raise
+                return {"recaudacion": resultado.recaudacion}
+            return resultado
+        raise DatosInvalidos(f"Operación desconocida: {op}")
+
+    async def _atender_cliente(self, lector, escritor):
+        self.clientes += 1
+        try:
+            while linea := await lector.readline():
+                id_pedido = None
+                try:
+                    pedido = json.loads(linea)
+                    if not isinstance(pedido, dict):
+                        raise DatosInvalidos("El pedido debe ser un objeto JSON.")
+                    id_pedido = pedido.get("id")
+                    respuesta = {"id": id_pedido, "ok": True, "resultado": _a_json(await self._responder(pedido))}
+                except json.JSONDecodeError:
+                    respuesta = {"id": None, "ok": False, "error": "JSONDecodeError", "mensaje": "Pedido mal formado."}
+                except (ErrorClinica, KeyError, TypeError, ValueError) as error:
+                    mensaje = f"Falta el campo {error}." if isinstance(error, KeyError) else str(error)
+                    respuesta = {"id": id_pedido, "ok": False, "error": type(error).__name__, "mensaje": mensaje}
+                except Exception as error:
+                    # Un error inesperado (por ejemplo de disco al escribir el journal) no corta la conexión
+                    _log.exception("Error al atender el pedido %r", id_pedido)
+                    respuesta = {"id": id_pedido, "ok": False, "error": type(error).__name__, "mensaje": str(error)}
+                escritor.write(json.dumps(respuesta).encode("utf-8") + b"\n")
+                await escritor.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self.clientes -= 1
+            escritor.close()
+
+
+class ClienteClinica:
+    """
+    Cliente asyncio del protocolo, un pedido a la vez por conexión.
+    """
+
+    def __init__(self, host="127.0.0.1", puerto=8765):
+        self.host = host
+        self.puerto = puerto
+        self._lector = self._escritor = None
+        self._siguiente_id = 0
+
+    async def conectar(self):
+        self._lector, self._escritor = await asyncio.open_connection(self.host, self.puerto, limit=_LIMITE_LINEA)
+
+    async def pedir(self, op, **argumentos):
+        """
+        Envía un pedido y devuelve la respuesta completa como dict.
+        """
+        self._siguiente_id += 1
+        pedido = {"id": self._siguiente_id, "op": op, **argumentos}
+        self._escritor.write(json.dumps(pedido).encode("utf-8") + b"\n")
+        await self._escritor.drain()
+        return json.loads(await self._lector.readline())
+
+    async def cerrar(self):
+        self._escritor.close()
+        await self._escritor.wait_closed()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor TCP de la clínica (JSON por línea).")
+    parser.add_argument("--config", default="configs.json")
+    parser.add_argument("--journal", default="configs.journal")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    args = parser.parse_args()
+
+    servicio = ServicioClinica()
+    servicio.cargar(args.config)
+    servicio.abrir_journal(args.journal)
+    print(f"Escuchando en {args.host}:{args.puerto}")
+    try:
+        asyncio.run(ServidorClinica(servicio, args.config).servir(args.host, args.puerto))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servicio.cerrar_journal()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Snapshot binario de la clínica para abrirla sin parsear JSON.
+
+El archivo tiene una cabecera con la tabla de secciones y luego cada sección
+alineada a 8 bytes: metadatos en JSON (configuración, acumulados de ingresos,
+contadores de ID), una tabla de cadenas, registros de ancho fijo de pacientes
+(ordenados por ID) y de turnos (en el orden de lista_turnos), y arreglos de
+posiciones para buscar por DNI, por ID de turno y por estado.
+
+Se abre con mmap y los pacientes y turnos se decodifican recién cuando se
+acceden. Los enteros se guardan en little-endian.
+"""
+
+import argparse
+import itertools
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from functools import lru_cache
+
+from paciente import Paciente
+from turno import Turno
+
+MAGICO = b"CLNB"
+VERSION = 1
+_SECCIONES = ("metadatos", "cadenas_indice", "cadenas_datos", "pacientes", "pacientes_por_dni",
+              "turnos", "turnos_por_id", "activos", "finalizados", "pagados")
+_CABECERA = struct.Struct("<4sHH" + "QQ" * len(_SECCIONES))
+# id, nombre, apellido, dni, edad, obra_social (índices de cadena salvo id y edad), registro_ts
+_PACIENTE = struct.Struct("<IIIIiIq")
+# id, id_paciente, especialidad, estado (índices de cadena), monto, si el monto era entero
+_TURNO = struct.Struct("<IIIId?3x")
+
+if sys.byteorder != "little":  # los arreglos se leen con memoryview.cast en el orden nativo
+    raise ImportError("snapshot_binario requiere una plataforma little-endian")
+
+
+def escribir_snapshot(ruta, pacientes, turnos, activos, finalizados, pagados, metadatos):
+    """
+    Escribe un snapshot binario con rename atómico.
+
+    Args:
+        ruta (str): Ruta del archivo a escribir.
+        pacientes (iterable): Pacientes de la clínica.
+        turnos (list): Turnos en el orden de lista_turnos.
+        activos, finalizados, pagados (iterable): Turnos de cada estado, en su orden.
+        metadatos (dict): Datos serializables a JSON que se devuelven al abrir.
+    """
+    cadenas = {}
+
+    def indice(texto):
+        posicion = cadenas.get(texto)
+        if posicion is None:
+            posicion = cadenas[texto] = len(cadenas)
+        return posicion
+
+    pacientes = sorted(pacientes, key=lambda p: p.id)
+    registros_pacientes = bytearray(_PACIENTE.size * len(pacientes))
+    for posicion, p in enumerate(pacientes):
+        _PACIENTE.pack_into(registros_pacientes, posicion * _PACIENTE.size, p.id, indice(p.nombre),
+                            indice(p.apellido), indice(str(p.dni)), int(p.edad), indice(p.obra_social),
+                            p.registro_ts)
+    pacientes_por_dni = array('I', sorted(range(len(pacientes)), key=lambda i: str(pacientes[i].dni)))
+
+    posicion_turno = {}
+    registros_turnos = bytearray(_TURNO.size * len(turnos))
+    for posicion, t in enumerate(turnos):
+        posicion_turno[id(t)] = posicion
+        _TURNO.pack_into(registros_turnos, posicion * _TURNO.size, t.id, t.id_paciente, indice(t.especialidad),
+                         indice(t.estado), float(t.monto_a_pagar), isinstance(t.monto_a_pagar, int))
+    turnos_por_id = array('I', sorted(range(len(turnos)), key=lambda i: turnos[i].id))
+    por_estado = [array('I', (posicion_turno[id(t)] for t in grupo)) for grupo in (activos, finalizados, pagados)]
+
+    textos = [texto.encode('utf-8') for texto in cadenas]
+    cadenas_indice = array('Q', itertools.accumulate((len(t) for t in textos), initial=0))
+
+    contenidos = [
+        (json.dumps(metadatos).encode('utf-8'), None),
+        (cadenas_indice.tobytes(), len(textos) + 1),
+        (b"".join(textos), None),
+        (bytes(registros_pacientes), len(pacientes)),
+        (pacientes_por_dni.tobytes(), len(pacientes_por_dni)),
+        (bytes(registros_turnos), len(turnos)),
+        (turnos_por_id.tobytes(), len(turnos_por_id)),
+        *((arreglo.tobytes(), len(arreglo)) for arreglo in por_estado),
+    ]
+
+    tabla = []
+    desplazamiento = _CABECERA.size
+    for datos, cantidad in contenidos:
+        desplazamiento += -desplazamiento % 8
+        tabla.extend((desplazamiento, len(datos) if cantidad is None else cantidad))
+        desplazamiento += len(datos)
+
+    temporal = f"{ruta}.tmp"
+    with open(temporal, 'wb') as file:
+        file.write(_CABECERA.pack(MAGICO, VERSION, 0, *tabla))
+        for (datos, _), inicio in zip(contenidos, tabla[::2]):
+            file.write(b"\0" * (inicio - file.tell()))
+            file.write(datos)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporal, ruta)
+
+
+class SnapshotBinario:
+    """
+    Snapshot abierto con mmap. Decodifica pacientes y turnos de a uno.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._archivo = open(ruta, 'rb')
+        self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        magico, version, _, *tabla = _CABECERA.unpack_from(self._mapa, 0)
+        if magico != MAGICO or version != VERSION:
+            raise ValueError(f"{ruta} no es un snapshot binario de la clínica (versión {VERSION}).")
+        self._secciones = {nombre: (tabla[2 * i], tabla[2 * i + 1]) for i, nombre in enumerate(_SECCIONES)}
+
+        self._vista = memoryview(self._mapa)
+        inicio, largo = self._secciones["metadatos"]
+        self.metadatos = json.loads(bytes(self._vista[inicio:inicio + largo]))
+        self._cadenas_indice = self._arreglo("cadenas_indice", 'Q', 8)
+        self._cadenas_inicio = self._secciones["cadenas_datos"][0]
+        self.cantidad_pacientes = self._secciones["pacientes"][1]
+        self.cantidad_turnos = self._secciones["turnos"][1]
+
+        enteros_pacientes = self._arreglo("pacientes", 'I', _PACIENTE.size)
+        self._ids_pacientes = enteros_pacientes[0::_PACIENTE.size // 4]
+        self._dnis_pacientes = enteros_pacientes[3::_PACIENTE.size // 4]
+        self._ids_turnos = self._arreglo("turnos", 'I', _TURNO.size)[0::_TURNO.size // 4]
+        self._pacientes_por_dni = self._arreglo("pacientes_por_dni", 'I', 4)
+        self._turnos_por_id = self._arreglo("turnos_por_id", 'I', 4)
+        self.cadena = lru_cache(maxsize=1 << 16)(self._cadena)
+
+    def _arreglo(self, seccion, formato, tamanio_elemento):
+        inicio, cantidad = self._secciones[seccion]
+        return self._vista[inicio:inicio + cantidad * tamanio_elemento].cast(formato)
+
+    def _cadena(self, indice):
+        inicio = self._cadenas_inicio + self._cadenas_indice[indice]
+        fin = self._cadenas_inicio + self._cadenas_indice[indice + 1]
+        return sys.intern(str(self._mapa[inicio:fin], 'utf-8'))
+
+    def posiciones(self, estado):
+        """
+        Devuelve una copia de las posiciones de los turnos 'activos', 'finalizados' o 'pagados'.
+        """
+        inicio, cantidad = self._secciones[estado]
+        posiciones = array('I')
+        posiciones.frombytes(self._mapa[inicio:inicio + 4 * cantidad])
+        return posiciones
+
+    def paciente(self, posicion):
+        id_paciente, nombre, apellido, dni, edad, obra_social, registro_ts = _PACIENTE.unpack_from(
+            self._mapa, self._secciones["pacientes"][0] + posicion * _PACIENTE.size)
+        return Paciente.restaurar(id_paciente, self.cadena(nombre), self.cadena(apellido), self.cadena(dni),
+                                  edad, self.cadena(obra_social), registro_ts)
+
+    def turno(self, posicion):
+        id_turno, id_paciente, especialidad, estado, monto, monto_entero = _TURNO.unpack_from(
+            self._mapa, self._secciones["turnos"][0] + posicion * _TURNO.size)
+        return Turno.restaurar(id_turno, id_paciente, self.cadena(especialidad),
+                               int(monto) if monto_entero else monto, self.cadena(estado))
+
+    @staticmethod
+    def _buscar(cantidad, clave_en, clave):
+        """
+        Búsqueda binaria sobre posiciones 0..cantidad-1 ordenadas por clave_en(posicion).
+        """
+        bajo, alto = 0, cantidad
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if clave_en(medio) < clave:
+                bajo = medio + 1
+            else:
+                alto = medio
+        return bajo if bajo < cantidad and clave_en(bajo) == clave else None
+
+    def posicion_paciente_por_id(self, id_paciente):
+        return self._buscar(self.cantidad_pacientes, self._ids_pacientes.__getitem__, id_paciente)
+
+    def posicion_paciente_por_dni(self, dni):
+        indice = self._buscar(self.cantidad_pacientes,
+                              lambda i: self.cadena(self._dnis_pacientes[self._pacientes_por_dni[i]]), str(dni))
+        return None if indice is None else self._pacientes_por_dni[indice]
+
+    def posicion_turno_por_id(self, id_turno):
+        indice = self._buscar(self.cantidad_turnos, lambda i: self._ids_turnos[self._turnos_por_id[i]], id_turno)
+        return None if indice is None else self._turnos_por_id[indice]
+
+    def cerrar(self):
+        for vista in (self._cadenas_indice, self._ids_pacientes, self._dnis_pacientes, self._ids_turnos,
+                      self._pacientes_por_dni, self._turnos_por_id, self._vista):
+            vista.release()
+        self._mapa.close()
+        self._archivo.close()
+
+
+class ListaRespaldada:
+    """
+    Lista de objetos guardados en un snapshot. Cada elemento se decodifica la
+    primera vez que se accede y desde ahí se devuelve siempre el mismo objeto.
+    Admite agregar al final y quitar elementos sin tocar el snapshot.
+    """
+
+    def __init__(self, cantidad, decodificar):
+        self._cantidad = cantidad
+        self._decodificar = decodificar
+        self._cache = {}
+        self._posiciones = {}
+        self._eliminados = set()
+        self._agregados = []
+
+    def objeto(self, posicion):
+        """
+        Devuelve el objeto en la posición del snapshot, decodificándolo si hace falta.
+        """
+        objeto = self._cache.get(posicion)
+        if objeto is None:
+            objeto = self._cache[posicion] = self._decodificar(posicion)
+            self._posiciones[id(objeto)] = posicion
+        return objeto
+
+    def __len__(self):
+        return self._cantidad - len(self._eliminados) + len(self._agregados)
+
+    def __iter__(self):
+        for posicion in range(self._cantidad):
+            if posicion not in self._eliminados:
+                yield self.objeto(posicion)
+        yield from list(self._agregados)
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("índice fuera de rango")
+        if not self._eliminados:
+            return self.objeto(indice) if indice < self._cantidad else self._agregados[indice - self._cantidad]
+        return next(itertools.islice(iter(self), indice, None))
+
+    def append(self, objeto):
+        self._agregados.append(objeto)
+
+    def remove(self, objeto):
+        posicion = self._posiciones.get(id(objeto))
+        if posicion is None:
+            # Puede haber sido decodificado por otra lista que comparte los objetos
+            posicion = next((p for p in range(self._cantidad)
+                             if p not in self._eliminados and self.objeto(p) is objeto), None)
+        if posicion is not None and posicion not in self._eliminados:
+            self._eliminados.add(posicion)
+        else:
+            self._agregados.remove(objeto)
+
+
+class IndicePerezoso:
+    """
+    Diccionario de solo las operaciones que usa Clinica (get, in, [], pop, del)
+    que busca en el snapshot las claves que no fueron agregadas ni quitadas.
+    """
+
+    def __init__(self, buscar):
+        """
+        Args:
+            buscar (callable): Recibe una clave y devuelve el objeto o None.
+        """
+        self._buscar = buscar
+        self._agregados = {}
+        self._eliminados = set()
+
+    def get(self, clave, defecto=None):
+        if clave in self._agregados:
+            return self._agregados[clave]
+        if clave in self._eliminados:
+            return defecto
+        objeto = self._buscar(clave)
+        return defecto if objeto is None else objeto
+
+    def __contains__(self, clave):
+        return self.get(clave) is not None
+
+    def __getitem__(self, clave):
+        objeto = self.get(clave)
+        if objeto is None:
+            raise KeyError(clave)
+        return objeto
+
+    def __setitem__(self, clave, objeto):
+        self._agregados[clave] = objeto
+        self._eliminados.discard(clave)
+
+    def pop(self, clave, *defecto):
+        objeto = self.get(clave)
+        if objeto is None:
+            if defecto:
+                return defecto[0]
+            raise KeyError(clave)
+        self._agregados.pop(clave, None)
+        self._eliminados.add(clave)
+        return objeto
+
+    def __delitem__(self, clave):
+        self.pop(clave)
+
+
+def json_a_binario(ruta_json, ruta_binaria):
+    """
+    Convierte un configs.json en un snapshot binario.
+    """
+    from clinica import Clinica
+    clinica = Clinica("Conversión")
+    clinica.leer_configuracion(ruta_json, incremental=True)
+    clinica.guardar_snapshot_binario(ruta_binaria)
+
+
+def binario_a_json(ruta_binaria, ruta_json):
+    """
+    Convierte un snapshot binario en un configs.json.
+    """
+    from clinica import Clinica
+    clinica = Clinica("Conversión")
+    clinica.abrir_snapshot_binario(ruta_binaria)
+    clinica.guardar_datos(ruta_json)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convierte entre configs.json y el snapshot binario.")
+    parser.add_argument("sentido", choices=("a-binario", "a-json"))
+    parser.add_argument("origen")
+    parser.add_argument("destino")
+    args = parser.parse_args()
+    if args.sentido == "a-binario":
+        json_a_binario(args.origen, args.destino)
+    else:
+        binario_a_json(args.origen, args.destino)
+
+
+if __name__ == "__main__":
+    main()
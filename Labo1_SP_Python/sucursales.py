@@ -0,0 +1,183 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Coordinador de varias sucursales, cada una con su propia Clinica y su
+configs.json (o snapshot binario / base SQLite).
+
+Cada sucursal se carga y se resume en un proceso del pool; el proceso
+principal solo recibe acumulados parciales chicos (ingresos por obra social
+y por especialidad, colas por especialidad) y los combina.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from clinica import Clinica
+from servicio import Informe
+
+
+@dataclass(frozen=True)
+class ResumenSucursal:
+    archivo: str
+    pacientes: int
+    turnos: int
+    ingresos_por_obra_social: dict
+    ingresos_por_especialidad: dict
+    en_espera_por_especialidad: dict
+    por_cobrar: int
+    segundos_carga: float = 0.0
+
+
+@dataclass(frozen=True)
+class ResumenGlobal:
+    sucursales: int
+    pacientes: int
+    turnos: int
+    informe: Informe
+    en_espera_por_especialidad: dict = field(default_factory=dict)
+    por_cobrar: int = 0
+
+
+def cargar_sucursal(archivo):
+    """
+    Abre una sucursal según la extensión: .clb (snapshot binario), .db
+    (SQLite) o JSON.
+    """
+    clinica = Clinica(os.path.splitext(os.path.basename(archivo))[0])
+    if archivo.endswith(".clb"):
+        clinica.abrir_snapshot_binario(archivo)
+    elif archivo.endswith(".db"):
+        from almacenamiento import AlmacenamientoSQLite
+        clinica.abrir_almacenamiento(AlmacenamientoSQLite(archivo))
+    else:
+        clinica.leer_configuracion(archivo, incremental=True)
+    return clinica
+
+
+def resumir_sucursal(archivo):
+    """
+    Carga la sucursal y devuelve sus acumulados. Corre en un proceso del pool.
+    """
+    inicio = time.perf_counter()
+    clinica = cargar_sucursal(archivo)
+    segundos = time.perf_counter() - inicio
+    return ResumenSucursal(archivo, len(clinica.lista_pacientes), len(clinica.lista_turnos),
+                           clinica.ingresos_por_obra_social(), clinica.ingresos_por_especialidad(),
+                           clinica.profundidad_por_especialidad(), sum(1 for _ in clinica.turnos_por_cobrar()), segundos)
+
+
+def _sumar(destino, origen):
+    for clave, valor in origen.items():
+        destino[clave] = destino.get(clave, 0) + valor
+
+
+def combinar(resumenes):
+    """
+    Combina los resúmenes de las sucursales en uno global.
+
+    La obra social con menos ingresos se busca sobre los totales combinados
+    (no es el mínimo de los mínimos); a igual total gana la que apareció primero.
+    """
+    ingresos_por_obra_social, ingresos_por_especialidad, en_espera = {}, {}, {}
+    pacientes = turnos = por_cobrar = 0
+    for resumen in resumenes:
+        pacientes += resumen.pacientes
+        turnos += resumen.turnos
+        por_cobrar += resumen.por_cobrar
+        _sumar(ingresos_por_obra_social, resumen.ingresos_por_obra_social)
+        _sumar(ingresos_por_especialidad, resumen.ingresos_por_especialidad)
+        _sumar(en_espera, resumen.en_espera_por_especialidad)
+    obra_social, total = min(ingresos_por_obra_social.items(), key=lambda par: par[1], default=(None, 0.0))
+    informe = Informe(ingresos_por_obra_social, ingresos_por_especialidad, obra_social, total)
+    return ResumenGlobal(len(resumenes), pacientes, turnos, informe, en_espera, por_cobrar)
+
+
+class CoordinadorSucursales:
+    """
+    Consulta varias sucursales en paralelo con un pool de procesos.
+    """
+
+    def __init__(self, archivos, procesos=None):
+        """
+        Args:
+            archivos (list): Rutas de las sucursales.
+            procesos (int): Procesos del pool; 1 trabaja en este proceso.
+        """
+        self.archivos = list(archivos)
+        self.procesos = procesos or os.cpu_count() or 1
+
+    def consultar(self, funcion):
+        """
+        Carga cada sucursal en un proceso y le aplica `funcion(archivo)`.
+        La función debe poder importarse desde el proceso hijo (no lambdas).
+
+        Returns:
+            list: Resultados en el orden de self.archivos.
+        """
+        if self.procesos <= 1 or len(self.archivos) <= 1:
+            return [funcion(archivo) for archivo in self.archivos]
+        with ProcessPoolExecutor(min(self.procesos, len(self.archivos))) as pool:
+            return list(pool.map(funcion, self.archivos))
+
+    def resumenes(self):
+        return self.consultar(resumir_sucursal)
+
+    def resumen_global(self):
+        return combinar(self.resumenes())
+
+    def mostrar_informe(self):
+        """
+        Imprime el informe de ingresos combinado con el formato de Clinica.mostrar_informe.
+        """
+        resumen = self.resumen_global()
+        informe = resumen.informe
+        print(f"\n=== Informe consolidado de {resumen.sucursales} sucursales ===")
+        if informe.ingresos_por_obra_social:
+            print("\n=== Informe de Ingresos por Obra Social ===\n")
+        for obra_social, monto in informe.ingresos_por_obra_social.items():
+            print(f"Obra Social: {obra_social.capitalize()}")
+            print(f"Monto Total: ${monto:.2f}\n")
+        if informe.obra_social_menos_ingresos is not None:
+            print(f"La obra social con menos ingresos es: {informe.obra_social_menos_ingresos.capitalize()} "
+                  f"con un total de ${informe.total_menos_ingresos:.2f}")
+        else:
+            print("No hay ingresos registrados.")
+        print("\n=== Pacientes en espera por especialidad ===\n")
+        for especialidad, cantidad in sorted(resumen.en_espera_por_especialidad.items()):
+            print(f"{especialidad.capitalize()}: {cantidad}")
+        print(f"Turnos por cobrar: {resumen.por_cobrar}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Informe consolidado de varias sucursales.")
+    parser.add_argument("archivos", nargs="+")
+    parser.add_argument("--procesos", type=int, default=None)
+    args = parser.parse_args()
+    CoordinadorSucursales(args.archivos, args.procesos).mostrar_informe()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Tablas de consola con los bordes de la aplicación.
+
+Una página se arma entera en un string y se escribe con un único write, en
+lugar de un print por fila. Las tablas largas se escriben de a bloques de
+líneas, así que exportar una tabla a un archivo nunca la arma completa en
+memoria. El Paginador pide las filas de a una página por vez a partir de un
+cursor, de modo que mostrar la primera página no recorre toda la cola.
+"""
+
+import sys
+from dataclasses import dataclass
+
+# Líneas por write al escribir una tabla larga
+LINEAS_POR_BLOQUE = 1000
+
+
+@dataclass(frozen=True)
+class Columna:
+    titulo: str
+    ancho: int
+
+
+class Tabla:
+    def __init__(self, columnas):
+        """
+        Args:
+            columnas (iterable): Columnas en orden. Los valores se alinean a la
+                izquierda en el ancho de su columna.
+        """
+        self.columnas = tuple(columnas)
+        rayas = ["═" * (columna.ancho + 2) for columna in self.columnas]
+        self._superior = "╔" + "╦".join(rayas) + "╗"
+        self._separador = "╠" + "╬".join(rayas) + "╣"
+        self._inferior = "╚" + "╩".join(rayas) + "╝"
+        self._formato_fila = "║" + "║".join(f" {{:<{columna.ancho}}} " for columna in self.columnas) + "║"
+
+    def fila(self, valores):
+        """
+        Arma la línea de una fila. Los valores son strings o números ya
+        formateados como se quieren ver (por ejemplo el monto con su signo).
+        """
+        return self._formato_fila.format(*valores)
+
+    def lineas(self, filas):
+        """
+        Recorre las líneas de la tabla: bordes, encabezado y una línea por fila.
+
+        Args:
+            filas (iterable): Secuencias de valores, una por fila; se consumen de a una.
+        """
+        yield self._superior
+        yield self.fila(columna.titulo for columna in self.columnas)
+        yield self._separador
+        for valores in filas:
+            yield self.fila(valores)
+        yield self._inferior
+
+    def renderizar(self, filas):
+        """
+        Devuelve la tabla completa como un string, para escribirla de una vez.
+        """
+        return "\n".join(self.lineas(filas)) + "\n"
+
+    def escribir(self, filas, destino=None):
+        """
+        Escribe la tabla en `destino` (por defecto la salida estándar) de a
+        LINEAS_POR_BLOQUE líneas por write.
+        """
+        destino = destino or sys.stdout
+        bloque = []
+        for linea in self.lineas(filas):
+            bloque.append(linea)
+            if len(bloque) == LINEAS_POR_BLOQUE:
+                bloque.append("")
+                destino.write("\n".join(bloque))
+                bloque = []
+        bloque.append("")
+        destino.write("\n".join(bloque))
+
+    def exportar(self, filas, ruta):
+        """
+        Escribe la tabla en un archivo a medida que se consumen las filas.
+        """
+        with open(ruta, 'w', encoding='utf-8') as file:
+            self.escribir(filas, file)
+
+
+class Paginador:
+    """
+    Cursor de páginas sobre una secuencia que cambia mientras se recorre,
+    como la cola de espera. Cada página se pide en el momento a `obtener`,
+    así que refleja las altas y atenciones ocurridas entre página y página;
+    como el cursor es una posición, un turno atendido en el medio corre las
+    filas siguientes.
+    """
+
+    def __init__(self, obtener, total, tamanio=20):
+        """
+        Args:
+            obtener (callable): (inicio, cantidad) -> lista de elementos.
+            total (callable): Cantidad actual de elementos.
+            tamanio (int): Elementos por página.
+        """
+        if tamanio < 1:
+            raise ValueError("El tamaño de página debe ser positivo.")
+        self._obtener = obtener
+        self._total = total
+        self.tamanio = tamanio
+        self.inicio = 0
+
+    def cantidad_paginas(self):
+        return max(1, -(-self._total() // self.tamanio))
+
+    def numero(self):
+        return self.inicio // self.tamanio + 1
+
+    def pagina(self):
+        """
+        Elementos de la página actual. Si la secuencia se achicó y el cursor
+        quedó afuera, vuelve a la última página.
+        """
+        ultima = (self.cantidad_paginas() - 1) * self.tamanio
+        self.inicio = min(self.inicio, ultima)
+        return self._obtener(self.inicio, self.tamanio)
+
+    def siguiente(self):
+        """
+        Avanza una página. Devuelve False si ya estaba en la última.
+        """
+        if self.inicio + self.tamanio >= self._total():
+            return False
+        self.inicio += self.tamanio
+        return True
+
+    def anterior(self):
+        """
+        Retrocede una página. Devuelve False si ya estaba en la primera.
+        """
+        if self.inicio == 0:
+            return False
+        self.inicio = max(0, self.inicio - self.tamanio)
+        return True
+
+    def recorrer(self):
+        """
+        Recorre todos los elementos desde el principio, pidiéndolos de a una
+        página, sin mover el cursor.
+        """
+        inicio = 0
+        while True:
+            elementos = self._obtener(inicio, self.tamanio)
+            yield from elementos
+            if len(elementos) < self.tamanio:
+                return
+            inicio += self.tamanio
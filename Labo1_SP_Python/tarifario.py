@@ -0,0 +1,123 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional, solo acelera calcular_lote
+    np = None
+
+# Reglas vigentes de precios. configs.json puede reemplazarlas con la clave "tarifas".
+TARIFAS_POR_DEFECTO = {
+    "precio_base": 4000,
+    "obras_sociales": {
+        "swiss medical": {"descuento": 0.40, "adicionales": [{"edad_desde": 18, "edad_hasta": 60, "valor": -0.10}]},
+        "apres": {"descuento": 0.25, "adicionales": [{"edad_desde": 26, "edad_hasta": 59, "valor": -0.03}]},
+        "pami": {"descuento": 0.60, "adicionales": [{"edad_desde": 80, "valor": -0.03}]},
+        "particular": {"descuento": -0.05, "adicionales": [{"edad_desde": 40, "edad_hasta": 60, "valor": +0.15}]}
+    }
+}
+
+EDAD_MAXIMA_TABLA = 150
+
+
+class Tarifario:
+    """
+    Reglas de precios compiladas en una tabla (obra social x edad) con el monto
+    ya redondeado, para que calcular un turno sea una búsqueda en la tabla.
+    """
+
+    def __init__(self, tarifas=None):
+        """
+        Args:
+            tarifas (dict): Reglas con el formato de TARIFAS_POR_DEFECTO.
+        """
+        tarifas = tarifas or TARIFAS_POR_DEFECTO
+        self._precio_base = tarifas.get("precio_base", 4000)
+        self._reglas = {obra_social.lower(): regla
+                        for obra_social, regla in tarifas.get("obras_sociales", {}).items()}
+        self._tabla = {obra_social: [self._calcular_regla(edad, obra_social) for edad in range(EDAD_MAXIMA_TABLA + 1)]
+                       for obra_social in self._reglas}
+        self._codigos = {obra_social: codigo for codigo, obra_social in enumerate(self._tabla)}
+        self._tabla_np = None
+
+    def _calcular_regla(self, edad, obra_social):
+        """
+        Aplica las reglas sin usar la tabla. Mantiene la misma fórmula y el mismo
+        orden de operaciones para que el redondeo sea idéntico.
+        """
+        regla = self._reglas.get(obra_social)
+        descuento_base = regla.get("descuento", 0) if regla else 0
+        adicional = 0
+        for rango in (regla.get("adicionales", []) if regla else []):
+            if rango.get("edad_desde", edad) <= edad <= rango.get("edad_hasta", edad):
+                adicional = rango["valor"]
+                break
+        monto = int(self._precio_base) * (1 - descuento_base) * (1 + adicional)
+        return round(monto, 2)
+
+    def calcular(self, edad, obra_social):
+        """
+        Calcula el monto a pagar por un turno.
+
+        Args:
+            edad (int): Edad del paciente.
+            obra_social (str): Obra social del paciente.
+
+        Returns:
+            float: Monto a pagar por el turno.
+        """
+        edad = int(edad)
+        obra_social = obra_social.lower()
+        fila = self._tabla.get(obra_social)
+        if fila is not None and 0 <= edad <= EDAD_MAXIMA_TABLA:
+            return fila[edad]
+        return self._calcular_regla(edad, obra_social)
+
+    def calcular_lote(self, pares):
+        """
+        Calcula los montos de varios turnos a la vez. Si NumPy está instalado
+        la búsqueda en la tabla se hace vectorizada.
+
+        Args:
+            pares (iterable): Pares (edad, obra_social).
+
+        Returns:
+            list: Montos en el mismo orden que los pares.
+        """
+        if np is None:
+            return [self.calcular(edad, obra_social) for edad, obra_social in pares]
+
+        pares = list(pares)
+        if self._tabla_np is None:
+            self._tabla_np = np.array(list(self._tabla.values()), dtype=np.float64).reshape(
+                len(self._tabla), EDAD_MAXIMA_TABLA + 1)
+        edades = np.fromiter((int(edad) for edad, _ in pares), dtype=np.int64, count=len(pares))
+        codigos = np.fromiter((self._codigos.get(obra_social.lower(), -1) for _, obra_social in pares),
+                              dtype=np.int64, count=len(pares))
+        en_tabla = (codigos >= 0) & (edades >= 0) & (edades <= EDAD_MAXIMA_TABLA)
+        montos = np.zeros(len(pares), dtype=np.float64)
+        montos[en_tabla] = self._tabla_np[codigos[en_tabla], edades[en_tabla]]
+        resultado = montos.tolist()
+        # Lo que queda fuera de la tabla se calcula con la regla, igual que calcular()
+        for i in np.flatnonzero(~en_tabla).tolist():
+            resultado[i] = self.calcular(*pares[i])
+        return resultado
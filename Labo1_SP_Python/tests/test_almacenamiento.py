@@ -0,0 +1,84 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Pruebas del almacenamiento SQLite con el journal abierto.
+
+    python -m unittest discover tests     # desde Labo1_SP_Python
+"""
+
+import os
+import tempfile
+import unittest
+
+from almacenamiento import AlmacenamientoSQLite
+from clinica import Clinica
+from servicio import ServicioClinica
+
+_CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "..", "configs.json")
+
+
+class TestSQLiteConJournal(unittest.TestCase):
+
+    def setUp(self):
+        self._carpeta = tempfile.TemporaryDirectory()
+        self.base = os.path.join(self._carpeta.name, "clinica.db")
+        self.journal = os.path.join(self._carpeta.name, "clinica.journal")
+        clinica = Clinica("Prueba")
+        clinica.leer_configuracion(_CONFIG)
+        almacenamiento = AlmacenamientoSQLite(self.base)
+        almacenamiento.importar(clinica)
+        almacenamiento.cerrar()
+
+    def tearDown(self):
+        self._carpeta.cleanup()
+
+    def _abrir(self):
+        servicio = ServicioClinica()
+        servicio.clinica.abrir_almacenamiento(AlmacenamientoSQLite(self.base))
+        servicio.clinica.abrir_journal(self.journal, lote=1)
+        return servicio
+
+    def _cerrar(self, servicio):
+        servicio.clinica.cerrar_journal()
+        servicio.clinica.cerrar_almacenamiento()
+
+    def test_reabrir_no_reproduce_lo_confirmado(self):
+        servicio = self._abrir()
+        paciente = servicio.alta_paciente("ana", "lopez", "99123", "30", "apres")
+        servicio.alta_turno(paciente.id, "odontologia")
+        servicio.atender(1)
+        servicio.cobrar()
+        pacientes = len(servicio.clinica.lista_pacientes)
+        turnos = len(servicio.clinica.lista_turnos)
+        recaudacion = servicio.clinica.recaudacion
+        self._cerrar(servicio)
+
+        servicio = self._abrir()
+        self.assertEqual(len(servicio.clinica.lista_pacientes), pacientes)
+        self.assertEqual(len(servicio.clinica.lista_turnos), turnos)
+        self.assertEqual(servicio.clinica.recaudacion, recaudacion)
+        self._cerrar(servicio)
+
+
+if __name__ == "__main__":
+    unittest.main()
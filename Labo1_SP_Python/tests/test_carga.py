@@ -0,0 +1,85 @@
+# MIT License
+#
+# Copyright (c) 2024 [UTN FRA](https://fra.utn.edu.ar/) All rights reserved.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Pruebas de carga de configs.json: el resultado no depende del orden de las
+claves en el archivo.
+
+    python -m unittest discover tests     # desde Labo1_SP_Python
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from clinica import Clinica
+from turno import Turno
+
+_CONFIG = {
+    "lista_pacientes": [
+        {"id": 1, "nombre": "uriel", "apellido": "guillen", "dni": "23412342", "edad": "25",
+         "obra_social": "particular"},
+        {"id": 2, "nombre": "ana", "apellido": "lopez", "dni": "30111222", "edad": "40",
+         "obra_social": "apres"},
+    ],
+    "lista_turnos": [
+        {"id": 0, "id_paciente": 1, "especialidad": "medico clinico", "monto_a_pagar": 4000, "estado": "Pagado"},
+        {"id": 1, "id_paciente": 1, "especialidad": "traumatologia", "monto_a_pagar": 4000, "estado": "Pagado"},
+        {"id": 2, "id_paciente": 2, "especialidad": "medico clinico", "monto_a_pagar": 4000, "estado": "Pagado"},
+        {"id": 3, "id_paciente": 2, "especialidad": "odontologia", "monto_a_pagar": 3000, "estado": "Activo"},
+    ],
+    "especialidades": ["medico clinico", "traumatologia", "odontologia"],
+    "obras_sociales": ["particular", "apres"],
+}
+
+
+class TestOrdenDeClaves(unittest.TestCase):
+
+    def _cargar(self, config, incremental):
+        with tempfile.TemporaryDirectory() as carpeta:
+            archivo = os.path.join(carpeta, "configs.json")
+            with open(archivo, "w") as file:
+                json.dump(config, file)
+            clinica = Clinica("Prueba")
+            clinica.leer_configuracion(archivo, incremental)
+        return clinica
+
+    def test_turnos_antes_que_pacientes(self):
+        invertido = {"lista_turnos": _CONFIG["lista_turnos"],
+                     **{clave: valor for clave, valor in _CONFIG.items() if clave != "lista_turnos"}}
+        for incremental in (False, True):
+            with self.subTest(incremental=incremental):
+                esperado = self._cargar(_CONFIG, incremental)
+                clinica = self._cargar(invertido, incremental)
+                self.assertEqual(clinica.ingresos_por_obra_social(), {"particular": 8000, "apres": 4000})
+                self.assertEqual(clinica.ingresos_por_especialidad(), esperado.ingresos_por_especialidad())
+                self.assertEqual(clinica.consultar_ingresos(), esperado.consultar_ingresos())
+                self.assertEqual(clinica.contar_turnos(obra_social="apres"), 2)
+                self.assertEqual(clinica.contar_turnos(estado=Turno.PAGADO, obra_social="particular"), 2)
+                self.assertEqual([t.id for t in clinica.ordenar_turnos(1)],
+                                 [t.id for t in esperado.ordenar_turnos(1)])
+                self.assertEqual(Turno.contador_id, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
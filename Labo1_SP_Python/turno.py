@@ -19,9 +19,20 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
+import sys
+import threading
 
 class Turno():
+    __slots__ = ('id', 'id_paciente', 'especialidad', 'monto_a_pagar', 'estado')
+
     contador_id = 0
+    # Asignar el ID es leer y sumar: sin el lock dos hilos pueden obtener el mismo
+    _lock_id = threading.Lock()
+
+    ACTIVO = "Activo"
+    FINALIZADO = "Finalizado"
+    PAGADO = "Pagado"
+    ESTADOS = (ACTIVO, FINALIZADO, PAGADO)
 
     def __init__(self, id_paciente, especialidad, monto_a_pagar, estado):
         """
@@ -34,11 +45,38 @@ class Turno():
             edad (int): Edad del paciente.
         """
         
-        self.id = Turno.contador_id
-        Turno.contador_id += 1
+        with Turno._lock_id:
+            self.id = Turno.contador_id
+            Turno.contador_id += 1
         self.id_paciente = id_paciente
-        self.especialidad = especialidad
+        # Especialidad y estado se repiten en millones de turnos: se comparte una sola copia de cada texto
+        self.especialidad = sys.intern(especialidad) if isinstance(especialidad, str) else especialidad
         self.monto_a_pagar = monto_a_pagar
-        self.estado = estado
+        self.estado = sys.intern(estado) if isinstance(estado, str) else estado
+
+    @classmethod
+    def restaurar(cls, id_turno, id_paciente, especialidad, monto_a_pagar, estado):
+        """
+        Reconstruye un turno guardado sin consumir un ID del contador.
+        """
+        turno = cls.__new__(cls)
+        turno.id = id_turno
+        turno.id_paciente = id_paciente
+        turno.especialidad = sys.intern(especialidad)
+        turno.monto_a_pagar = monto_a_pagar
+        turno.estado = sys.intern(estado)
+        return turno
+
+    def a_dict(self):
+        """
+        Devuelve el turno con el formato de configs.json.
+        """
+        return {
+            "id": self.id,
+            "id_paciente": self.id_paciente,
+            "especialidad": self.especialidad,
+            "monto_a_pagar": self.monto_a_pagar,
+            "estado": self.estado
+        }
         
         
\ No newline at end of file
@@ -20,7 +20,11 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from tarifario import Tarifario
+
 class Validaciones:
+    tarifario = Tarifario()
+
     @staticmethod
     def validar_nombre_apellido(nombre, apellido):
         if not nombre.isalpha() or not apellido.isalpha():
@@ -42,6 +46,16 @@ class Validaciones:
             print("Por favor, ingrese un número entero válido.")
             return False
 
+    @staticmethod
+    def es_edad_valida(edad):
+        """
+        Igual que validar_edad pero sin imprimir el motivo.
+        """
+        try:
+            return 18 <= int(edad) <= 90
+        except (TypeError, ValueError):
+            return False
+
     @staticmethod
     def validar_obra_social(obra_social, edad, obras_validas):
         """
@@ -79,30 +93,30 @@ class Validaciones:
         Returns:
             float: Monto a pagar por el turno.
         """
-        precio_base = 4000
-        
-        descuentos = {
-            "swiss medical": 0.40,
-            "apres": 0.25,
-            "pami": 0.60,
-            "particular": -0.05
-        }
-        adicionales = {
-            "swiss medical": (-0.10 if 18 <= int(edad) <= 60 else 0),
-            "apres": (-0.03 if 26 <= int(edad) <= 59 else 0),
-            "pami": (-0.03 if int(edad) >= 80 else 0),
-            "particular": (+0.15 if 40 <= int(edad) <= 60 else 0)
-        }
-        obra_social = obra_social.lower()
-        descuento_base = descuentos.get(obra_social, 0)
-        adicional = adicionales.get(obra_social, 0)
-        
-        print(f"Edad: {edad}, Obra Social: {obra_social}")
-        print(f"Descuento Base: {descuento_base}, Adicional: {adicional}")
-        
-        monto = int(precio_base) * (1 - descuento_base) * (1 + adicional)
-        print(f"Monto Calculado: {monto}")
-        return round(monto, 2)
+        return Validaciones.tarifario.calcular(edad, obra_social)
+
+    @staticmethod
+    def calcular_montos_a_pagar(pares):
+        """
+        Calcula el monto a pagar de varios turnos a la vez.
+
+        Args:
+            pares (iterable): Pares (edad, obra_social).
+
+        Returns:
+            list: Montos en el mismo orden que los pares.
+        """
+        return Validaciones.tarifario.calcular_lote(pares)
+
+    @staticmethod
+    def configurar_tarifas(tarifas):
+        """
+        Reemplaza las reglas de precios vigentes, por ejemplo con las de configs.json.
+
+        Args:
+            tarifas (dict): Reglas con el formato de tarifario.TARIFAS_POR_DEFECTO.
+        """
+        Validaciones.tarifario = Tarifario(tarifas)
     
     @staticmethod
     def ingresar_numero():